@@ -50,13 +50,14 @@ export default async function DailyBriefingPage({
   const threeDaysOut = new Date(today);
   threeDaysOut.setDate(threeDaysOut.getDate() + 3);
 
+  // Latest vintage per business date / shift (delta saves only rewrite days that moved)
   const { data: forecasts } = await supabase
-    .from('demand_forecasts')
+    .from('demand_forecasts_latest')
     .select('*')
     .eq('venue_id', venueId)
-    .gte('forecast_date', today.toISOString().split('T')[0])
-    .lte('forecast_date', threeDaysOut.toISOString().split('T')[0])
-    .order('forecast_date', { ascending: true })
+    .gte('business_date', today.toISOString().split('T')[0])
+    .lte('business_date', threeDaysOut.toISOString().split('T')[0])
+    .order('business_date', { ascending: true })
     .order('shift_type', { ascending: true });
 
   const dateDisplay = new Date().toLocaleDateString('en-US', {
@@ -96,10 +97,10 @@ export default async function DailyBriefingPage({
       .from('demand_forecasts')
       .select('*')
       .eq('venue_id', venueId)
-      .eq('forecast_date', forecast.forecast_date)
+      .eq('business_date', forecast.business_date)
       .eq('shift_type', forecast.shift_type)
       .lte('created_at', yesterday.toISOString())
-      .order('created_at', { ascending: false })
+      .order('forecast_date', { ascending: false })
       .limit(1);
 
     if (previousForecasts && previousForecasts.length > 0) {
@@ -109,14 +110,14 @@ export default async function DailyBriefingPage({
           prev.covers_predicted) *
         100;
       if (Math.abs(variancePercentage) >= 10) {
-        const forecastDate = new Date(forecast.forecast_date);
+        const forecastDate = new Date(forecast.business_date);
         changes.push({
           originalCovers: prev.covers_predicted,
           newCovers: forecast.covers_predicted,
           originalRevenue: prev.revenue_predicted || 0,
           newRevenue: forecast.revenue_predicted || 0,
           variancePercentage,
-          date: forecast.forecast_date,
+          date: forecast.business_date,
           dayOfWeek: forecastDate.toLocaleDateString('en-US', {
             weekday: 'long',
           }),
@@ -169,9 +170,9 @@ export default async function DailyBriefingPage({
     venueName,
     reviewDate: dateDisplay,
     upcomingForecasts: forecasts.map((f) => {
-      const forecastDate = new Date(f.forecast_date);
+      const forecastDate = new Date(f.business_date);
       return {
-        date: f.forecast_date,
+        date: f.business_date,
         dayOfWeek: forecastDate.toLocaleDateString('en-US', {
           weekday: 'long',
         }),
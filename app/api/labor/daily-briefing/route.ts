@@ -48,13 +48,14 @@ export async function GET(request: NextRequest) {
     const threeDaysOut = new Date(today);
     threeDaysOut.setDate(threeDaysOut.getDate() + 3);
 
+    // Latest vintage per business date / shift (delta saves only rewrite days that moved)
     const { data: forecasts } = await supabase
-      .from('demand_forecasts')
+      .from('demand_forecasts_latest')
       .select('*')
       .eq('venue_id', params.venue_id)
-      .gte('forecast_date', today.toISOString().split('T')[0])
-      .lte('forecast_date', threeDaysOut.toISOString().split('T')[0])
-      .order('forecast_date', { ascending: true })
+      .gte('business_date', today.toISOString().split('T')[0])
+      .lte('business_date', threeDaysOut.toISOString().split('T')[0])
+      .order('business_date', { ascending: true })
       .order('shift_type', { ascending: true });
 
     if (!forecasts || forecasts.length === 0) {
@@ -73,15 +74,15 @@ export async function GET(request: NextRequest) {
     const changes: ForecastChange[] = [];
 
     for (const forecast of forecasts) {
-      // Get previous forecast for same date/shift (created yesterday or earlier)
+      // Get previous forecast for same date/shift (latest vintage created yesterday or earlier)
       const { data: previousForecasts } = await supabase
         .from('demand_forecasts')
         .select('*')
         .eq('venue_id', params.venue_id)
-        .eq('forecast_date', forecast.forecast_date)
+        .eq('business_date', forecast.business_date)
         .eq('shift_type', forecast.shift_type)
         .lte('created_at', yesterday.toISOString())
-        .order('created_at', { ascending: false })
+        .order('forecast_date', { ascending: false })
         .limit(1);
 
       if (previousForecasts && previousForecasts.length > 0) {
@@ -93,7 +94,7 @@ export async function GET(request: NextRequest) {
 
         // Only include if variance > 10%
         if (Math.abs(variancePercentage) >= 10) {
-          const forecastDate = new Date(forecast.forecast_date);
+          const forecastDate = new Date(forecast.business_date);
           const dayOfWeek = forecastDate.toLocaleDateString('en-US', {
             weekday: 'long',
           });
@@ -104,7 +105,7 @@ export async function GET(request: NextRequest) {
             originalRevenue: prev.revenue_predicted || 0,
             newRevenue: forecast.revenue_predicted || 0,
             variancePercentage,
-            date: forecast.forecast_date,
+            date: forecast.business_date,
             dayOfWeek,
             factors: {
               // TODO: Pull actual weather/reservation/event data
@@ -180,9 +181,9 @@ export async function GET(request: NextRequest) {
         day: 'numeric',
       }),
       upcomingForecasts: forecasts.map((f) => {
-        const forecastDate = new Date(f.forecast_date);
+        const forecastDate = new Date(f.business_date);
         return {
-          date: f.forecast_date,
+          date: f.business_date,
           dayOfWeek: forecastDate.toLocaleDateString('en-US', {
             weekday: 'long',
           }),
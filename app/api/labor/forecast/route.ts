@@ -23,8 +23,9 @@ export async function GET(req: NextRequest) {
 
     const supabase = await createClient();
 
+    // Latest vintage per business date / shift (delta saves only rewrite days that moved)
     let query = supabase
-      .from('demand_forecasts')
+      .from('demand_forecasts_latest')
       .select('*')
       .eq('venue_id', params.venueId)
       .order('business_date', { ascending: true });
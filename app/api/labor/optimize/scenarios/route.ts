@@ -67,11 +67,11 @@ export async function POST(request: NextRequest) {
     week_end.setDate(week_end.getDate() + 6);
 
     const { data: forecasts } = await supabase
-      .from('demand_forecasts')
+      .from('demand_forecasts_latest')
       .select('*')
       .eq('venue_id', venue_id)
-      .gte('forecast_date', week_start_date)
-      .lte('forecast_date', week_end.toISOString().split('T')[0]);
+      .gte('business_date', week_start_date)
+      .lte('business_date', week_end.toISOString().split('T')[0]);
 
     if (!forecasts || forecasts.length === 0) {
       return NextResponse.json(
@@ -0,0 +1,251 @@
+"""
+Shared business calendar (date dimension) for the Python services.
+
+One row per day over a year range, held as NumPy arrays: a date's row is
+its day offset from the first day, so lookups and joins are index
+arithmetic instead of per-row Timestamp / set work.
+
+Columns:
+    ds          datetime64[D]
+    dow         0=Mon .. 6=Sun (Python weekday())
+    day_type    weekday | friday | saturday | sunday | holiday
+                (same rules as the SQL get_day_type() function)
+    holiday     US holiday name or None
+    is_peak     Friday / Saturday (PEAK_DOWS) or a holiday eve
+
+US holidays are generated by rule for any year, so they never run out:
+New Year's Day, MLK Day, Presidents' Day, Memorial Day, Independence Day,
+Labor Day, Thanksgiving, the day after Thanksgiving, Christmas and New
+Year's Eve, on the day itself (no observed-date shifts).
+
+seasonal_calendar events (covers_multiplier, event_name, hourly_multipliers,
+notes) are loaded once with set_events() / add_events() and resolved per venue: a venue-specific
+row beats the global (venue_id NULL) row on the same event_date. Events
+apply on their event_date only; is_recurring rows are not projected onto
+other years (floating holidays such as Thanksgiving would land on the
+wrong day).
+
+Closed days come from a venue's location_config.closed_weekdays (0=Mon ..
+6=Sun): closed() / is_closed() test dates against them. A holiday on a
+closed weekday is still closed, as the forecaster's dark-day filter and the
+auto-scheduler have always treated it.
+
+The calendar grows to cover any date it is asked about. Services share one
+instance through get_calendar() (demand forecaster, labor_optimizer seasonal
+factors, auto-scheduler, labor_analyzer requirements).
+
+Usage:
+    from business_calendar import get_calendar
+    cal = get_calendar()
+    cal.day_type("2026-11-26")                         # "holiday"
+    cal.join(df["business_date"])                      # dow, day_type, holiday, is_peak
+    cal.set_events(rows)                               # seasonal_calendar rows
+    cal.events(venue_id, dates)                        # covers_multiplier, event_name, ...
+    cal.is_closed("2026-11-23", closed_weekdays=[0])   # True (a Monday)
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+DAY_TYPES = ("weekday", "friday", "saturday", "sunday", "holiday")
+DOW_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+PEAK_DOWS = (4, 5)   # Fri, Sat
+DIMENSION_COLUMNS = ("dow", "day_type", "holiday", "is_peak")
+EVENT_COLUMNS = ("covers_multiplier", "event_name", "hourly_multipliers", "notes")
+SEASONAL_CALENDAR_SELECT = "venue_id,event_date,event_name,covers_multiplier,hourly_multipliers,notes"
+
+DateLike = Union[str, date, datetime, pd.Timestamp, np.datetime64]
+
+
+def _to_days(dates) -> np.ndarray:
+    """Any date-like scalar or sequence -> datetime64[D] array."""
+    if isinstance(dates, (str, date, np.datetime64)):
+        return np.array([np.datetime64(pd.Timestamp(dates).date(), "D")])
+    if isinstance(dates, pd.Series):
+        dates = dates.to_numpy()
+    try:
+        return np.asarray(dates, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        return pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]")
+
+
+def us_holidays(ds: np.ndarray) -> np.ndarray:
+    """US holiday name (or None) for each datetime64[D] day, by rule."""
+    ts = pd.DatetimeIndex(ds)
+    month, dom, dow = ts.month.to_numpy(), ts.day.to_numpy(), ts.dayofweek.to_numpy()
+    nth = (dom - 1) // 7 + 1   # nth occurrence of this weekday in the month
+    rules = [
+        ("New Year's Day", (month == 1) & (dom == 1)),
+        ("Martin Luther King Jr. Day", (month == 1) & (dow == 0) & (nth == 3)),
+        ("Presidents' Day", (month == 2) & (dow == 0) & (nth == 3)),
+        ("Memorial Day", (month == 5) & (dow == 0) & (dom > 24)),
+        ("Independence Day", (month == 7) & (dom == 4)),
+        ("Labor Day", (month == 9) & (dow == 0) & (nth == 1)),
+        ("Thanksgiving", (month == 11) & (dow == 3) & (nth == 4)),
+        ("Day after Thanksgiving", (month == 11) & (dow == 4) & (dom >= 23) & (dom <= 29)),
+        ("Christmas Day", (month == 12) & (dom == 25)),
+        ("New Year's Eve", (month == 12) & (dom == 31)),
+    ]
+    names = np.full(len(ds), None, dtype=object)
+    for name, mask in rules:
+        names[mask] = name
+    return names
+
+
+class BusinessCalendar:
+    """Date dimension over whole years, with per-venue seasonal events."""
+
+    def __init__(self, start_year: int, end_year: int):
+        self._event_rows: List[Dict] = []
+        self._build(start_year, end_year)
+
+    def _build(self, start_year: int, end_year: int):
+        self.start_year, self.end_year = start_year, end_year
+        self.start = np.datetime64(f"{start_year}-01-01", "D")
+        ds = np.arange(self.start, np.datetime64(f"{end_year + 1}-01-01", "D"))
+        dow = ((ds.astype(np.int64) + 3) % 7).astype(np.int8)   # 1970-01-01 was a Thursday
+        holiday = us_holidays(ds)
+        is_holiday = holiday != None  # noqa: E711 (elementwise)
+        day_type = np.where(is_holiday, "holiday", np.select(
+            [dow == 6, dow == 4, dow == 5], ["sunday", "friday", "saturday"], "weekday"))
+        holiday_eve = np.append(is_holiday[1:], False)
+        self.columns: Dict[str, np.ndarray] = {
+            "ds": ds, "dow": dow, "day_type": day_type, "holiday": holiday,
+            "is_peak": np.isin(dow, PEAK_DOWS) | holiday_eve,
+        }
+        self._venue_events: Dict[Optional[str], Dict[str, np.ndarray]] = {}
+
+    def _extend(self, days: np.ndarray):
+        years = days.astype("datetime64[Y]").astype(int) + 1970
+        lo, hi = min(self.start_year, int(years.min())), max(self.end_year, int(years.max()))
+        if (lo, hi) != (self.start_year, self.end_year):
+            self._build(lo, hi)
+
+    def positions(self, dates) -> np.ndarray:
+        """Row index of each date (the calendar grows to cover them). NaT is not allowed."""
+        days = _to_days(dates)
+        if len(days) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if np.isnat(days).any():
+            raise ValueError("Calendar lookup on a missing date")
+        pos = (days - self.start).astype(np.int64)
+        if pos.min() < 0 or pos.max() >= len(self.columns["ds"]):
+            self._extend(days)
+            pos = (days - self.start).astype(np.int64)
+        return pos
+
+    # ------------------------------------------------------------------------
+    # Date dimension
+    # ------------------------------------------------------------------------
+
+    def frame(self) -> pd.DataFrame:
+        """The whole dimension as a DataFrame (one row per day)."""
+        return pd.DataFrame(self.columns)
+
+    def join(self, dates, columns: Sequence[str] = DIMENSION_COLUMNS) -> pd.DataFrame:
+        """Dimension columns aligned row-for-row with dates."""
+        pos = self.positions(dates)
+        return pd.DataFrame({col: self.columns[col][pos] for col in columns})
+
+    def _lookup(self, column: str, dates) -> np.ndarray:
+        # positions() may rebuild the calendar, so index the arrays only after it runs
+        pos = self.positions(dates)
+        return self.columns[column][pos]
+
+    def day_types(self, dates) -> np.ndarray:
+        return self._lookup("day_type", dates)
+
+    def dows(self, dates) -> np.ndarray:
+        return self._lookup("dow", dates)
+
+    def day_type(self, d: DateLike) -> str:
+        return str(self.day_types(d)[0])
+
+    def dow(self, d: DateLike) -> int:
+        return int(self.dows(d)[0])
+
+    def closed(self, dates, closed_weekdays: Iterable[int]) -> np.ndarray:
+        """True where a date falls on one of the venue's closed weekdays."""
+        return np.isin(self.dows(dates), list(closed_weekdays or ()))
+
+    def is_closed(self, d: DateLike, closed_weekdays: Iterable[int]) -> bool:
+        return bool(self.closed(d, closed_weekdays)[0])
+
+    def holiday_name(self, d: DateLike) -> Optional[str]:
+        return self._lookup("holiday", d)[0]
+
+    def is_holiday(self, d: DateLike) -> bool:
+        return self.holiday_name(d) is not None
+
+    def holidays_between(self, start: DateLike, end: DateLike) -> Dict[str, str]:
+        """{YYYY-MM-DD: name} for holidays in [start, end]."""
+        lo, hi = self.positions([_to_days(start)[0], _to_days(end)[0]])
+        ds, holiday = self.columns["ds"], self.columns["holiday"]
+        return {str(ds[i]): holiday[i] for i in range(lo, hi + 1) if holiday[i] is not None}
+
+    # ------------------------------------------------------------------------
+    # Seasonal events (seasonal_calendar)
+    # ------------------------------------------------------------------------
+
+    def set_events(self, rows: Iterable[Dict]):
+        """Load seasonal_calendar rows (SEASONAL_CALENDAR_SELECT columns); replaces earlier ones."""
+        self._event_rows = []
+        self.add_events(rows)
+
+    def add_events(self, rows: Iterable[Dict]):
+        """Add seasonal_calendar rows to the ones already loaded."""
+        rows = [r for r in rows if r.get("event_date")]
+        if rows:
+            # Cover every event date now, so sizing the event arrays never triggers a rebuild
+            self.positions([r["event_date"] for r in rows])
+        self._event_rows.extend(rows)
+        self._venue_events = {}
+
+    def _event_arrays(self, venue_id: Optional[str]) -> Dict[str, np.ndarray]:
+        """EVENT_COLUMNS over the whole range: global rows, then the venue's on top."""
+        if venue_id in self._venue_events:
+            return self._venue_events[venue_id]
+        scopes = (None, venue_id) if venue_id is not None else (None,)
+        scoped = [[r for r in self._event_rows if r.get("venue_id") == scope] for scope in scopes]
+        positions = [self.positions([r["event_date"] for r in rows]) for rows in scoped]
+        n = len(self.columns["ds"])
+        cols = {col: np.full(n, None, dtype=object) for col in EVENT_COLUMNS}
+        cols["covers_multiplier"] = np.ones(n)
+        for rows, pos in zip(scoped, positions):
+            # First row wins for a date within the same scope
+            for p, r in reversed(list(zip(pos, rows))):
+                cols["covers_multiplier"][p] = float(r.get("covers_multiplier") or 1.0)
+                for col in EVENT_COLUMNS[1:]:
+                    cols[col][p] = r.get(col)
+        self._venue_events[venue_id] = cols
+        return cols
+
+    def events(self, venue_id: Optional[str], dates) -> pd.DataFrame:
+        """EVENT_COLUMNS aligned with dates (multiplier 1.0 / None where no event)."""
+        # positions() first: it may rebuild (dropping cached event arrays); _event_arrays
+        # never does, since add_events already covered every event date
+        pos = self.positions(dates)
+        cols = self._event_arrays(venue_id)
+        return pd.DataFrame({col: cols[col][pos] for col in EVENT_COLUMNS})
+
+    def event(self, venue_id: Optional[str], d: DateLike) -> Dict:
+        """Single-date EVENT_COLUMNS dict."""
+        p = self.positions(d)[0]
+        cols = self._event_arrays(venue_id)
+        event = {col: cols[col][p] for col in EVENT_COLUMNS}
+        event["covers_multiplier"] = float(event["covers_multiplier"])
+        return event
+
+
+_calendar: Optional[BusinessCalendar] = None
+
+
+def get_calendar() -> BusinessCalendar:
+    """Process-wide calendar, initially ten years back to two years ahead."""
+    global _calendar
+    if _calendar is None:
+        year = date.today().year
+        _calendar = BusinessCalendar(year - 10, year + 2)
+    return _calendar
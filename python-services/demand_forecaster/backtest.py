@@ -9,20 +9,48 @@ Tests three models:
   - V3: full Prophet + continuous weather + reso (on everything)
   - V4: tier-gated (model_router picks per venue)
 
+and benchmarks the pooled global model (one fit for all venues) against
+V4's per-venue Prophet on MAPE and total fit+predict runtime. V4 is
+predicted with both Prophet interval modes (exact sampling vs fast
+residual quantiles) to compare 80% interval coverage and predict time.
+
+Rolling-origin mode (--rolling K) scores the same three models at K cutoffs
+per venue instead of one split: cutoff k trains on ds <= max - k * horizon
+and predicts the next `horizon` days. History and weather are loaded once
+per venue; every (venue, cutoff, model) fit is one process-pool task. The
+per-day predictions are pooled into a single table of MAPE, bias and 80%
+interval coverage per model and horizon bucket (ROLLING_HORIZON_BUCKETS).
+The pooled global model is not part of the rolling mode.
+
+Every run (either mode) is also saved as a leaderboard entry for its model
+version; `python leaderboard.py compare` gates it against the previous version.
+
+Layout (rolling mode):
+    <cache>/backtests/<run_id>/predictions.parquet  venue_id, cutoff, model, ds, horizon,
+                                                    actual, yhat, yhat_lower, yhat_upper
+    <cache>/backtests/<run_id>/horizons.csv         model, horizon, n, venues, cutoffs, mape,
+                                                    within_10, within_20, bias, coverage, width
+
 Usage:
     python backtest.py                  # 90-day holdout, all venues
     python backtest.py --holdout 60     # 60-day holdout
     python backtest.py --venue-id UUID  # Single venue
+    python backtest.py --interval-mode exact   # Report V4 accuracy from exact intervals
+    python backtest.py --record-run     # Also store the run report in forecast_runs
+    python backtest.py --rolling 4 --horizon 28 --workers 8   # 4 cutoffs x 28 days per venue
+    python backtest.py --rolling 4 --shard 1/2                # Half the venues (shards.py)
 """
 
 import os
 import sys
+import time
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 import pandas as pd
 import numpy as np
-from prophet import Prophet
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,7 +60,7 @@ from forecaster import (
     get_supabase,
     get_venue_coords,
     get_venue_mappings,
-    get_historical_data,
+    load_venue_history,
     get_historical_weather,
     learn_reso_elasticity,
     clean_training_data,
@@ -47,7 +75,26 @@ from forecaster import (
     VENUE_CLASS_PROPHET_PARAMS,
     get_venue_anomaly_dates,
     filter_anomaly_days,
+    FORECAST_CACHE_DIR,
+    GLOBAL_MIN_DAYS,
+    INTERVAL_MODE,
+    INTERVAL_MODES,
+    predict_prophet,
 )
+from history_store import HistoryStore
+from weather_cache import WeatherCache
+from model_backends import load_backend
+from run_report import RunReport, StageTimer
+from tune import fold_cutoffs
+from shards import parse_shard, select_shard
+from leaderboard import build_entry, fit_seconds_by_venue, record_entry, version_label, write_entry
+
+BACKTEST_HORIZON = int(os.getenv("BACKTEST_HORIZON", "28"))
+ROLLING_MODELS = ("baseline", "v3", "v4")
+# Upper edges (days after the cutoff) of the per-horizon buckets
+ROLLING_HORIZON_BUCKETS = (1, 7, 14, 28, 56, 91)
+ROLLING_PREDICTION_COLUMNS = ["venue_id", "cutoff", "model", "ds", "horizon",
+                              "actual", "yhat", "yhat_lower", "yhat_upper"]
 
 
 def fit_prophet_holdout(
@@ -56,10 +103,16 @@ def fit_prophet_holdout(
     weather_mode: str = "off",
     historical_weather: Optional[pd.DataFrame] = None,
     prophet_params: Optional[Dict] = None,
-) -> pd.DataFrame:
+    interval_modes: Tuple[str, ...] = ("exact",),
+) -> Dict[str, pd.DataFrame]:
     """
     Fit Prophet on train_df, predict holdout_days beyond the training end.
     Supports continuous, binary, or no weather.
+
+    The fitted model is predicted once per interval mode ("exact" = history +
+    horizon with sampled intervals, "fast" = horizon only, residual-quantile
+    intervals). Returns {mode: forecast}; each frame's attrs["predict_seconds"]
+    holds its predict time.
     """
     prophet_df = train_df[["ds", "covers"]].rename(columns={"covers": "y"}).copy()
     prophet_df["ds"] = pd.to_datetime(prophet_df["ds"])
@@ -96,27 +149,38 @@ def fit_prophet_holdout(
     )
     model.fit(prophet_df)
 
-    future = model.make_future_dataframe(periods=holdout_days, freq="D")
-
-    # Add weather to future (use actual historical weather for backtest fairness)
-    if has_weather and hw is not None:
-        if weather_mode == "continuous":
-            cols = ["ds", "temp_high", "precip_inch"]
+    forecasts = {}
+    for mode in interval_modes:
+        if mode == "fast":
+            future = pd.DataFrame({"ds": pd.date_range(prophet_df["ds"].max() + pd.Timedelta(days=1),
+                                                       periods=holdout_days, freq="D")})
         else:
-            cols = ["ds", "is_rainy", "is_extreme_heat"]
-        future = future.merge(hw[cols], on="ds", how="left")
-        for c in cols[1:]:
-            if c == "temp_high":
-                future[c] = future[c].fillna(hw[c].median())
+            future = model.make_future_dataframe(periods=holdout_days, freq="D")
+
+        # Add weather to future (use actual historical weather for backtest fairness)
+        if has_weather and hw is not None:
+            if weather_mode == "continuous":
+                cols = ["ds", "temp_high", "precip_inch"]
             else:
-                future[c] = future[c].fillna(0)
+                cols = ["ds", "is_rainy", "is_extreme_heat"]
+            future = future.merge(hw[cols], on="ds", how="left")
+            for c in cols[1:]:
+                if c == "temp_high":
+                    future[c] = future[c].fillna(hw[c].median())
+                else:
+                    future[c] = future[c].fillna(0)
 
-    fc = model.predict(future)
+        t0 = time.perf_counter()
+        fc = predict_prophet(model, future, mode)
+        predict_seconds = time.perf_counter() - t0
 
-    for col in ["yhat", "yhat_lower", "yhat_upper"]:
-        fc[col] = fc[col].clip(lower=0).round(0)
+        for col in ["yhat", "yhat_lower", "yhat_upper"]:
+            fc[col] = fc[col].clip(lower=0).round(0)
 
-    return fc[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+        fc = fc[["ds", "yhat", "yhat_lower", "yhat_upper"]].copy()
+        fc.attrs["predict_seconds"] = predict_seconds
+        forecasts[mode] = fc
+    return forecasts
 
 
 def fit_baseline(train_df: pd.DataFrame, holdout_days: int) -> pd.DataFrame:
@@ -125,7 +189,7 @@ def fit_baseline(train_df: pd.DataFrame, holdout_days: int) -> pd.DataFrame:
     prophet_df["ds"] = pd.to_datetime(prophet_df["ds"])
     prophet_df["y"] = pd.to_numeric(prophet_df["y"], errors="coerce").fillna(0)
 
-    model = Prophet(
+    model = load_backend("prophet").Prophet(
         yearly_seasonality=True,
         weekly_seasonality=True,
         daily_seasonality=False,
@@ -146,12 +210,16 @@ def fit_baseline(train_df: pd.DataFrame, holdout_days: int) -> pd.DataFrame:
 
 
 def compute_metrics(actuals: pd.DataFrame, predictions: pd.DataFrame, label: str) -> Dict:
-    """Compute MAPE, within-10%, within-20%, bias for a forecast vs actuals."""
+    """
+    Compute MAPE, within-10%, within-20%, bias for a forecast vs actuals, plus
+    interval coverage (% of actuals inside yhat_lower..yhat_upper) and mean width.
+    """
     merged = actuals.merge(predictions, on="ds", how="inner")
     merged = merged[merged["actual"] > 0]
 
     if len(merged) == 0:
-        return {"label": label, "n": 0, "mape": None, "within_10": None, "within_20": None, "bias": None}
+        return {"label": label, "n": 0, "mape": None, "within_10": None, "within_20": None, "bias": None,
+                "coverage": None, "width": None}
 
     merged["pct_error"] = (abs(merged["yhat"] - merged["actual"]) / merged["actual"] * 100)
     merged["signed_error"] = merged["yhat"] - merged["actual"]
@@ -161,6 +229,12 @@ def compute_metrics(actuals: pd.DataFrame, predictions: pd.DataFrame, label: str
     within_20 = (merged["pct_error"] <= 20).mean() * 100
     bias = merged["signed_error"].mean()
 
+    coverage = width = None
+    if "yhat_lower" in merged and "yhat_upper" in merged:
+        inside = (merged["actual"] >= merged["yhat_lower"]) & (merged["actual"] <= merged["yhat_upper"])
+        coverage = round(inside.mean() * 100, 1)
+        width = round((merged["yhat_upper"] - merged["yhat_lower"]).mean(), 1)
+
     return {
         "label": label,
         "n": len(merged),
@@ -168,11 +242,66 @@ def compute_metrics(actuals: pd.DataFrame, predictions: pd.DataFrame, label: str
         "within_10": round(within_10, 1),
         "within_20": round(within_20, 1),
         "bias": round(bias, 1),
+        "coverage": coverage,
+        "width": width,
     }
 
 
-def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
-    """Run backtest comparing Baseline vs V3 (ungated) vs V4 (gated)."""
+def run_global_holdout(global_inputs: Dict[str, tuple]) -> Tuple[Dict, List[Dict]]:
+    """
+    Fit one GlobalModel on every venue's training window and predict all
+    holdouts in a single batch (actual weather, no reso - same information
+    as V4's holdout fit). Returns ({"metrics", "seconds"}, V4 metrics for the
+    same venues). Both models are scored on the days both forecast: V4
+    predicts len(holdout) days, which stops short of the calendar window when
+    dark / anomaly days were dropped from the holdout.
+    """
+    if not global_inputs:
+        return {"metrics": [], "seconds": 0.0}, []
+
+    print(f"{'-' * 50}")
+    print(f"[GLOBAL] Pooled model over {len(global_inputs)} venues...")
+    t0 = time.perf_counter()
+    gm = load_backend("global")
+    train = gm.stack_history({vid: v[1] for vid, v in global_inputs.items()},
+                             {vid: v[3] for vid, v in global_inputs.items()})
+    model = gm.GlobalModel().fit(train)
+    cutoffs = {vid: v[4] for vid, v in global_inputs.items()}
+    holdout_days = max((v[2]["ds"].max() - v[4]).days for v in global_inputs.values())
+    fc = model.predict(gm.future_frame(cutoffs, holdout_days, None,
+                                       {vid: v[3] for vid, v in global_inputs.items()}))
+    seconds = time.perf_counter() - t0
+    print(f"  Fit + predict: {seconds:.1f}s ({len(train)} training days)")
+
+    metrics, v4_paired = [], []
+    for vid, (name, _, actuals, _, _, v4_pred) in global_inputs.items():
+        venue_fc = fc[fc["venue_id"] == vid]
+        if venue_fc.empty:
+            continue
+        paired = actuals[actuals["ds"].isin(venue_fc["ds"]) & actuals["ds"].isin(v4_pred["ds"])]
+        m = compute_metrics(paired, venue_fc[["ds", "yhat", "yhat_lower", "yhat_upper"]], name)
+        v4_metrics = compute_metrics(paired, v4_pred, name)
+        metrics.append(m)
+        v4_paired.append(v4_metrics)
+        if m["mape"] is not None and v4_metrics["mape"] is not None:
+            print(f"  {name:<30} V4 {v4_metrics['mape']:>6.1f}%   Global {m['mape']:>6.1f}%")
+    return {"metrics": metrics, "seconds": seconds}, v4_paired
+
+
+def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90, use_cache: bool = True,
+                 interval_mode: str = INTERVAL_MODE, report_path: Optional[str] = None,
+                 record_run: bool = False, shard: Optional[Tuple[int, int]] = None):
+    """
+    Run backtest comparing Baseline vs V3 (ungated) vs V4 (gated).
+    V4 accuracy is reported from interval_mode; both modes' coverage is compared.
+    Per-venue, per-model timings go to a JSON run report (see run_report.py).
+    shard (i, n) backtests only shard i's venues (shards.py).
+    """
+    report = RunReport("backtest", params={
+        "venue_id": venue_id, "holdout_days": holdout_days,
+        "use_cache": use_cache, "interval_mode": interval_mode,
+        "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+    })
     print("\n" + "=" * 70)
     print(f"BACKTEST: Baseline vs V3 (ungated) vs V4 (gated)")
     print(f"Holdout: last {holdout_days} days")
@@ -180,27 +309,43 @@ def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
 
     supabase = get_supabase()
     tipsee_conn = get_tipsee_conn()
-    venue_coords = get_venue_coords(supabase)
-    mappings = get_venue_mappings(supabase, venue_id)
+    with report.stage("supabase_meta"):
+        venue_coords = get_venue_coords(supabase)
+        mappings = get_venue_mappings(supabase, venue_id)
+        if shard:
+            mappings, shard_params = select_shard(mappings, shard, supabase, report.kind)
+            report.params.update(shard_params)
 
     print(f"Venues to backtest: {len(mappings)}\n")
 
+    store = HistoryStore(FORECAST_CACHE_DIR) if use_cache else None
+    weather_cache = WeatherCache(FORECAST_CACHE_DIR) if use_cache else None
+    with report.stage("tipsee_history") as st:
+        venue_history = load_venue_history(tipsee_conn, mappings, store)
+        st["rows"] = sum(len(h) for h in venue_history.values())
+
     all_baseline = []
     all_v3 = []
     all_v4 = []
+    v4_seconds = 0.0
+    v4_intervals = {mode: [] for mode in INTERVAL_MODES}          # V4 metrics per interval mode
+    v4_predict_seconds = {mode: 0.0 for mode in INTERVAL_MODES}
+    global_inputs = {}  # venue_id -> (name, cleaned train, actuals, weather, cutoff date, v4 holdout predictions)
+    venue_v4 = {}       # venue_id -> V4 metrics + name, for the leaderboard entry
 
     for mapping in mappings:
         vid = mapping["venue_id"]
-        location_uuid = mapping["tipsee_location_uuid"]
         location_name = mapping["tipsee_location_name"]
         venue_class = mapping.get("venue_class")
         coords = venue_coords.get(vid)
+        timer = StageTimer()
+        tier, status = None, "skipped"
 
         print(f"{'-' * 50}")
         print(f"[VENUE] {location_name} ({venue_class or 'unknown'})")
 
         try:
-            df_all = get_historical_data(tipsee_conn, location_uuid)
+            df_all = venue_history[vid].copy()
             df_all["ds"] = pd.to_datetime(df_all["ds"])
             total_days = len(df_all)
 
@@ -221,63 +366,97 @@ def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
             if coords:
                 start_date = str(train_raw["ds"].min().date())
                 end_date = str(holdout["ds"].max().date())
-                hist_weather = get_historical_weather(
-                    coords["lat"], coords["lon"], coords["tz"], start_date, end_date
-                )
+                with timer.stage("weather"):
+                    hist_weather = get_historical_weather(
+                        coords["lat"], coords["lon"], coords["tz"], start_date, end_date,
+                        cache=weather_cache,
+                    )
                 if hist_weather is not None:
                     print(f"  Weather: {len(hist_weather)} days")
 
             # V4 routing decision
             config = model_router(len(train_raw), venue_class, has_coords=coords is not None)
             print(f"  V4 route -> {config}")
+            tier = config.tier
 
             # --- BASELINE ---
             if len(train_raw) >= TIER_C_MIN:
                 print("  Training BASELINE...")
-                baseline_fc = fit_baseline(train_raw, actual_holdout_days)
+                with timer.stage("baseline", rows=len(train_raw)):
+                    baseline_fc = fit_baseline(train_raw, actual_holdout_days)
                 baseline_holdout = baseline_fc[baseline_fc["ds"] > cutoff_date]
                 all_baseline.append(compute_metrics(actuals, baseline_holdout, location_name))
             else:
                 print("  BASELINE: skipped (too few days)")
                 all_baseline.append({"label": location_name, "n": 0, "mape": None,
-                                     "within_10": None, "within_20": None, "bias": None})
+                                     "within_10": None, "within_20": None, "bias": None,
+                                     "coverage": None, "width": None})
 
             # --- V3 (ungated - always uses continuous weather + reso) ---
             if len(train_raw) >= 60:  # v3 min was 60
-                train_clean_v3 = clean_training_data(train_raw)
-                reso_betas_v3 = learn_reso_elasticity(train_clean_v3)
                 print(f"  Training V3 (ungated, continuous weather)...")
-                v3_fc = fit_prophet_holdout(
-                    train_clean_v3, actual_holdout_days,
-                    weather_mode="continuous", historical_weather=hist_weather,
-                )
+                with timer.stage("v3", rows=len(train_raw)):
+                    train_clean_v3 = clean_training_data(train_raw)
+                    reso_betas_v3 = learn_reso_elasticity(train_clean_v3)
+                    v3_fc = fit_prophet_holdout(
+                        train_clean_v3, actual_holdout_days,
+                        weather_mode="continuous", historical_weather=hist_weather,
+                    )["exact"]
                 v3_holdout = v3_fc[v3_fc["ds"] > cutoff_date]
                 all_v3.append(compute_metrics(actuals, v3_holdout, location_name))
             else:
                 print(f"  V3: skipped (<60d)")
                 all_v3.append({"label": location_name, "n": 0, "mape": None,
-                               "within_10": None, "within_20": None, "bias": None})
+                               "within_10": None, "within_20": None, "bias": None,
+                               "coverage": None, "width": None})
 
             # --- V4 (gated + tuned params) ---
+            t_v4 = time.perf_counter()
             if config.use_prophet:
                 train_v4 = clean_training_data(train_raw) if config.use_outlier_removal else train_raw
                 pp = config.prophet_params
                 print(f"  Training V4 (weather={config.use_weather}, "
                       f"cps={pp['changepoint_prior_scale']}, sps={pp['seasonality_prior_scale']})...")
-                v4_fc = fit_prophet_holdout(
-                    train_v4, actual_holdout_days,
-                    weather_mode=config.use_weather, historical_weather=hist_weather,
-                    prophet_params=config.prophet_params,
-                )
-                v4_holdout = v4_fc[v4_fc["ds"] > cutoff_date]
-                all_v4.append(compute_metrics(actuals, v4_holdout, location_name))
+                with timer.stage("v4", rows=len(train_v4)):
+                    v4_fcs = fit_prophet_holdout(
+                        train_v4, actual_holdout_days,
+                        weather_mode=config.use_weather, historical_weather=hist_weather,
+                        prophet_params=config.prophet_params,
+                        interval_modes=INTERVAL_MODES,
+                    )
+                for mode, v4_fc in v4_fcs.items():
+                    v4_holdout = v4_fc[v4_fc["ds"] > cutoff_date]
+                    v4_intervals[mode].append(compute_metrics(actuals, v4_holdout, location_name))
+                    v4_predict_seconds[mode] += v4_fc.attrs["predict_seconds"]
+                all_v4.append(v4_intervals[interval_mode][-1])
+                v4_pred = v4_fcs[interval_mode][v4_fcs[interval_mode]["ds"] > cutoff_date]
+                # Runtime benchmark counts only the selected mode's predict
+                t_v4 += sum(fc.attrs["predict_seconds"] for mode, fc in v4_fcs.items() if mode != interval_mode)
             else:
                 # Tier D: naive
                 print(f"  Training V4 (naive DOW avg)...")
-                naive_fc = naive_dow_forecast(train_raw, actual_holdout_days)
+                with timer.stage("v4", rows=len(train_raw)):
+                    naive_fc = naive_dow_forecast(train_raw, actual_holdout_days)
                 naive_holdout = naive_fc.copy()
                 naive_holdout = naive_holdout.rename(columns={})  # already has yhat
                 all_v4.append(compute_metrics(actuals, naive_holdout, location_name))
+                v4_pred = naive_holdout
+                for mode in INTERVAL_MODES:
+                    v4_intervals[mode].append(all_v4[-1])
+            v4_seconds += time.perf_counter() - t_v4
+
+            # --- GLOBAL: collect inputs, pooled fit runs once after the loop ---
+            global_config = model_router(len(train_raw), venue_class, has_coords=coords is not None,
+                                         backend="global")
+            if global_config.backend == "global":
+                global_inputs[vid] = (
+                    location_name, clean_training_data(train_raw), actuals,
+                    hist_weather if global_config.use_weather != "off" else None,
+                    cutoff_date, v4_pred,
+                )
+
+            status = "ok"
+            venue_v4[vid] = {**all_v4[-1], "name": location_name}
 
             # Per-venue table
             b = all_baseline[-1]
@@ -310,8 +489,14 @@ def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
             traceback.print_exc()
             continue
 
+        finally:
+            report.add_venue(vid, location_name, tier, status, timer.summary())
+
     tipsee_conn.close()
 
+    with report.stage("global", rows=len(global_inputs)):
+        all_global, v4_paired = run_global_holdout(global_inputs)
+
     # --- AGGREGATE ---
     print("\n" + "=" * 70)
     print("AGGREGATE RESULTS")
@@ -326,9 +511,15 @@ def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
         w_10 = sum(m["within_10"] * m["n"] for m in valid) / total_n
         w_20 = sum(m["within_20"] * m["n"] for m in valid) / total_n
         w_bias = sum(m["bias"] * m["n"] for m in valid) / total_n
+        with_iv = [m for m in valid if m.get("coverage") is not None]
+        iv_n = sum(m["n"] for m in with_iv)
+        w_cov = sum(m["coverage"] * m["n"] for m in with_iv) / iv_n if iv_n else None
+        w_width = sum(m["width"] * m["n"] for m in with_iv) / iv_n if iv_n else None
         return {
             "mape": round(w_mape, 1), "within_10": round(w_10, 1),
             "within_20": round(w_20, 1), "bias": round(w_bias, 1),
+            "coverage": round(w_cov, 1) if w_cov is not None else None,
+            "width": round(w_width, 1) if w_width is not None else None,
             "n": total_n, "venues": len(valid),
         }
 
@@ -343,6 +534,8 @@ def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
         print(f"  {'Within 10%':<20} {agg_base['within_10']:>11.1f}% {agg_v3['within_10']:>11.1f}% {agg_v4['within_10']:>11.1f}%")
         print(f"  {'Within 20%':<20} {agg_base['within_20']:>11.1f}% {agg_v3['within_20']:>11.1f}% {agg_v4['within_20']:>11.1f}%")
         print(f"  {'Avg Bias':<20} {agg_base['bias']:>12.1f} {agg_v3['bias']:>12.1f} {agg_v4['bias']:>12.1f}")
+        if agg_base["coverage"] is not None and agg_v3["coverage"] is not None and agg_v4["coverage"] is not None:
+            print(f"  {'Coverage (80%)':<20} {agg_base['coverage']:>11.1f}% {agg_v3['coverage']:>11.1f}% {agg_v4['coverage']:>11.1f}%")
         print(f"  {'Sample days':<20} {agg_base['n']:>12} {agg_v3['n']:>12} {agg_v4['n']:>12}")
         print(f"  {'Venues':<20} {agg_base['venues']:>12} {agg_v3['venues']:>12} {agg_v4['venues']:>12}")
 
@@ -361,16 +554,379 @@ def run_backtest(venue_id: Optional[str] = None, holdout_days: int = 90):
     elif agg_v4:
         print(f"  V4 MAPE: {agg_v4['mape']:.1f}%")
 
+    # --- V4 interval modes: 80% coverage, width, predict time ---
+    agg_iv = {mode: aggregate(v4_intervals[mode]) for mode in INTERVAL_MODES}
+    if all(a and a["coverage"] is not None for a in agg_iv.values()):
+        print(f"\n  {'V4 intervals':<20} {'exact':>12} {'fast':>12}")
+        print(f"  {'-'*44}")
+        print(f"  {'Coverage (80% tgt)':<20} {agg_iv['exact']['coverage']:>11.1f}% {agg_iv['fast']['coverage']:>11.1f}%")
+        print(f"  {'Avg width':<20} {agg_iv['exact']['width']:>12.1f} {agg_iv['fast']['width']:>12.1f}")
+        print(f"  {'Predict time':<20} {v4_predict_seconds['exact']:>11.2f}s {v4_predict_seconds['fast']:>11.2f}s")
+        print(f"  (V4 accuracy above uses {interval_mode} intervals)")
+
+    # --- GLOBAL vs V4 (same venues) ---
+    agg_global = aggregate(all_global["metrics"])
+    agg_v4_paired = aggregate(v4_paired)
+    if agg_global and agg_v4_paired:
+        print(f"\n  {'Global vs V4':<20} {'V4':>12} {'Global':>12}")
+        print(f"  {'-'*44}")
+        print(f"  {'MAPE':<20} {agg_v4_paired['mape']:>11.1f}% {agg_global['mape']:>11.1f}%")
+        print(f"  {'Within 10%':<20} {agg_v4_paired['within_10']:>11.1f}% {agg_global['within_10']:>11.1f}%")
+        print(f"  {'Within 20%':<20} {agg_v4_paired['within_20']:>11.1f}% {agg_global['within_20']:>11.1f}%")
+        print(f"  {'Avg Bias':<20} {agg_v4_paired['bias']:>12.1f} {agg_global['bias']:>12.1f}")
+        if agg_v4_paired["coverage"] is not None and agg_global["coverage"] is not None:
+            print(f"  {'Coverage (80%)':<20} {agg_v4_paired['coverage']:>11.1f}% {agg_global['coverage']:>11.1f}%")
+        print(f"  {'Venues':<20} {agg_v4_paired['venues']:>12} {agg_global['venues']:>12}")
+        print(f"  {'Runtime (all venues)':<20} {v4_seconds:>11.1f}s {all_global['seconds']:>11.1f}s")
+        print(f"\n  Global vs V4: MAPE {agg_global['mape'] - agg_v4_paired['mape']:+.1f}pp, "
+              f"runtime {v4_seconds / max(all_global['seconds'], 1e-9):.0f}x faster")
+
+    report.finish(venues_ok=sum(v["status"] == "ok" for v in report.venues),
+                  venues_skipped=sum(v["status"] != "ok" for v in report.venues))
+    report.print_summary()
+    print(f"\n[INFO] Run report: {report.write(FORECAST_CACHE_DIR, report_path)}")
+    save_leaderboard_entry(report, "holdout", {"baseline": agg_base, "v3": agg_v3, "v4": agg_v4},
+                           venue_v4, supabase, record_run)
+    if record_run:
+        report.record(supabase)
+
     print("\n" + "=" * 70 + "\n")
 
 
+# ============================================================================
+# ROLLING-ORIGIN MODE
+# ============================================================================
+
+def rolling_forecast(model: str, train_raw: pd.DataFrame, horizon: int, venue_class: Optional[str],
+                     has_coords: bool, hist_weather: Optional[pd.DataFrame],
+                     interval_mode: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    Fit one backtest model on train_raw and predict `horizon` days past it, as
+    in run_backtest. Returns (forecast or None if the model is skipped for this
+    training length, V4 tier).
+    """
+    config = model_router(len(train_raw), venue_class, has_coords=has_coords)
+    if model == "baseline":
+        if len(train_raw) < TIER_C_MIN:
+            return None, config.tier
+        return fit_baseline(train_raw, horizon), config.tier
+    if model == "v3":
+        if len(train_raw) < 60:
+            return None, config.tier
+        return fit_prophet_holdout(clean_training_data(train_raw), horizon, weather_mode="continuous",
+                                   historical_weather=hist_weather)["exact"], config.tier
+    if not config.use_prophet:
+        return naive_dow_forecast(train_raw, horizon), config.tier
+    train_v4 = clean_training_data(train_raw) if config.use_outlier_removal else train_raw
+    return fit_prophet_holdout(train_v4, horizon, weather_mode=config.use_weather,
+                               historical_weather=hist_weather, prophet_params=config.prophet_params,
+                               interval_modes=(interval_mode,))[interval_mode], config.tier
+
+
+def _fit_rolling_task(task: Dict) -> Dict:
+    """
+    Pool task: fit one (venue, cutoff, model) and score it against the next
+    `horizon` days. Returns {"preds" (ROLLING_PREDICTION_COLUMNS), "tier", "timings"}.
+    """
+    import logging
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    timer = StageTimer()
+    history, cutoff, horizon = task["history"], pd.Timestamp(task["cutoff"]), task["horizon"]
+    train_raw = history[history["ds"] <= cutoff]
+    test = history[(history["ds"] > cutoff) & (history["ds"] <= cutoff + timedelta(days=horizon))]
+    actuals = test[["ds", "covers"]].rename(columns={"covers": "actual"})
+    actuals = actuals.assign(actual=pd.to_numeric(actuals["actual"], errors="coerce").fillna(0))
+
+    with timer.stage(task["model"], rows=len(train_raw)):
+        fc, tier = rolling_forecast(task["model"], train_raw, horizon, task["venue_class"],
+                                    task["has_coords"], task["weather"], task["interval_mode"])
+    if fc is None:
+        return {"preds": pd.DataFrame(columns=ROLLING_PREDICTION_COLUMNS), "tier": tier,
+                "timings": timer.summary()}
+
+    fc = fc[["ds", "yhat", "yhat_lower", "yhat_upper"]].assign(ds=lambda f: pd.to_datetime(f["ds"]))
+    preds = actuals.merge(fc[fc["ds"] > cutoff], on="ds", how="inner")
+    preds = preds.assign(venue_id=task["venue_id"], cutoff=cutoff, model=task["model"],
+                         horizon=(preds["ds"] - cutoff).dt.days)
+    return {"preds": preds[ROLLING_PREDICTION_COLUMNS], "tier": tier, "timings": timer.summary()}
+
+
+def horizon_bucket(horizon: pd.Series, max_horizon: int) -> pd.Series:
+    """Label days-after-cutoff with their ROLLING_HORIZON_BUCKETS bucket ("1", "2-7", ...)."""
+    edges = [e for e in ROLLING_HORIZON_BUCKETS if e < max_horizon] + [max_horizon]
+    lows = [1] + [e + 1 for e in edges[:-1]]
+    labels = [str(hi) if lo == hi else f"{lo}-{hi}" for lo, hi in zip(lows, edges)]
+    return pd.cut(horizon, bins=[0] + edges, labels=labels).astype(str)
+
+
+SCORE_COLUMNS = ["n", "venues", "cutoffs", "mape", "within_10", "within_20", "bias", "coverage", "width"]
+
+
+def score_predictions(preds: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """
+    Day-weighted accuracy of ROLLING_PREDICTION_COLUMNS rows grouped by `by`
+    (same definitions as compute_metrics; days with no covers are not scored).
+    """
+    scored = preds[preds["actual"] > 0]
+    if scored.empty:
+        return pd.DataFrame(columns=by + SCORE_COLUMNS)
+
+    actual = scored["actual"].astype(float)
+    pct_error = (scored["yhat"] - actual).abs() / actual * 100
+    scored = scored.assign(
+        pct_error=pct_error,
+        within_10=(pct_error <= 10) * 100.0,
+        within_20=(pct_error <= 20) * 100.0,
+        signed_error=scored["yhat"] - actual,
+        inside=((actual >= scored["yhat_lower"]) & (actual <= scored["yhat_upper"])) * 100.0,
+        width=scored["yhat_upper"] - scored["yhat_lower"],
+        venue_cutoff=scored["venue_id"].astype(str) + "|" + scored["cutoff"].astype(str),
+    )
+    table = scored.groupby(by, sort=False).agg(
+        n=("pct_error", "size"),
+        venues=("venue_id", "nunique"),
+        cutoffs=("venue_cutoff", "nunique"),
+        mape=("pct_error", "mean"),
+        within_10=("within_10", "mean"),
+        within_20=("within_20", "mean"),
+        bias=("signed_error", "mean"),
+        coverage=("inside", "mean"),
+        width=("width", "mean"),
+    ).reset_index()
+    return table[by + SCORE_COLUMNS].round(1)
+
+
+def horizon_table(preds: pd.DataFrame, max_horizon: int) -> pd.DataFrame:
+    """Accuracy per model x horizon bucket over every venue and cutoff, plus an "all" row per model."""
+    if preds.empty:
+        return pd.DataFrame(columns=["model", "horizon"] + SCORE_COLUMNS)
+    table = score_predictions(pd.concat([
+        preds.assign(horizon_bucket=horizon_bucket(preds["horizon"], max_horizon)),
+        preds.assign(horizon_bucket="all"),
+    ], ignore_index=True), ["model", "horizon_bucket"]).rename(columns={"horizon_bucket": "horizon"})
+
+    order = {m: i for i, m in enumerate(ROLLING_MODELS)}
+    buckets = list(dict.fromkeys(horizon_bucket(pd.Series(range(1, max_horizon + 1)), max_horizon))) + ["all"]
+    table = table.sort_values(["model", "horizon"], key=lambda c: c.map(order) if c.name == "model"
+                              else c.map({b: i for i, b in enumerate(buckets)}))
+    return table.reset_index(drop=True)
+
+
+def print_horizon_table(table: pd.DataFrame):
+    """Models side by side: MAPE / bias / coverage per horizon bucket."""
+    models = [m for m in ROLLING_MODELS if m in set(table["model"])]
+    if not models:
+        print("  No scored days")
+        return
+    wide = table.set_index(["horizon", "model"])
+    print(f"\n  {'Horizon':<9} {'Days':>7}" + "".join(f" {m + ' MAPE':>12} {'Bias':>7} {'Cov':>7}" for m in models))
+    print(f"  {'-' * (17 + 28 * len(models))}")
+    for bucket in dict.fromkeys(table["horizon"]):
+        n = int(wide.loc[bucket]["n"].max())
+        line = f"  {bucket:<9} {n:>7}"
+        for m in models:
+            if (bucket, m) not in wide.index:
+                line += f" {'N/A':>12} {'':>7} {'':>7}"
+                continue
+            r = wide.loc[(bucket, m)]
+            line += f" {r['mape']:>11.1f}% {r['bias']:>+7.1f} {r['coverage']:>6.1f}%"
+        print(line)
+    print(f"  (Bias in covers/day; Cov = actuals inside the 80% interval)")
+
+
+def run_rolling_backtest(venue_id: Optional[str] = None, folds: int = 4, horizon: int = BACKTEST_HORIZON,
+                         workers: int = 1, use_cache: bool = True, interval_mode: str = INTERVAL_MODE,
+                         report_path: Optional[str] = None, record_run: bool = False,
+                         shard: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+    """
+    Rolling-origin backtest of Baseline / V3 / V4: `folds` cutoffs per venue
+    (tune.fold_cutoffs), each scored over the next `horizon` days. History and
+    weather are loaded once per venue, then every (venue, cutoff, model) fit
+    runs as its own pool task (workers > 1) or in-process. Returns the
+    per-horizon result table, also written under <cache>/backtests/<run_id>/.
+    shard (i, n) backtests only shard i's venues (shards.py).
+    """
+    report = RunReport("backtest_rolling", params={
+        "venue_id": venue_id, "folds": folds, "horizon": horizon, "workers": workers,
+        "use_cache": use_cache, "interval_mode": interval_mode,
+        "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+    })
+    print("\n" + "=" * 70)
+    print(f"ROLLING BACKTEST: Baseline vs V3 vs V4 ({folds} cutoffs x {horizon}d)")
+    print("=" * 70 + "\n")
+
+    supabase = get_supabase()
+    with report.stage("supabase_meta"):
+        venue_coords = get_venue_coords(supabase)
+        mappings = get_venue_mappings(supabase, venue_id)
+        if shard:
+            mappings, shard_params = select_shard(mappings, shard, supabase, report.kind)
+            report.params.update(shard_params)
+    print(f"Venues to backtest: {len(mappings)}")
+
+    tipsee_conn = get_tipsee_conn()
+    try:
+        with report.stage("tipsee_history") as st:
+            store = HistoryStore(FORECAST_CACHE_DIR) if use_cache else None
+            venue_history = load_venue_history(tipsee_conn, mappings, store)
+            st["rows"] = sum(len(h) for h in venue_history.values())
+    finally:
+        tipsee_conn.close()
+
+    weather_cache = WeatherCache(FORECAST_CACHE_DIR) if use_cache else None
+    tasks, names = [], {}
+    with report.stage("weather") as st:
+        for mapping in mappings:
+            vid = mapping["venue_id"]
+            names[vid] = mapping["tipsee_location_name"]
+            history = venue_history.get(vid)
+            if history is None or history.empty:
+                continue
+            history = history.assign(ds=pd.to_datetime(history["ds"]))
+            cutoffs = fold_cutoffs(history["ds"], folds, horizon)
+            if not cutoffs:
+                print(f"  [SKIP] {names[vid]}: under {TIER_C_MIN} training days at every cutoff")
+                continue
+            coords = venue_coords.get(vid)
+            weather = None
+            if coords:
+                weather = get_historical_weather(
+                    coords["lat"], coords["lon"], coords["tz"],
+                    str(history["ds"].min().date()), str(history["ds"].max().date()),
+                    cache=weather_cache,
+                )
+            tasks += [{"venue_id": vid, "cutoff": cutoff, "model": model, "horizon": horizon,
+                       "history": history, "weather": weather, "venue_class": mapping.get("venue_class"),
+                       "has_coords": coords is not None, "interval_mode": interval_mode}
+                      for cutoff in cutoffs for model in ROLLING_MODELS]
+        st["rows"] = len(tasks)
+
+    print(f"[INFO] Fits: {len(tasks)} (venue x cutoff x model), {workers} workers")
+    results = []
+    with report.stage("fit", rows=len(tasks)):
+        if workers > 1:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_fit_rolling_task, t) for t in tasks]
+                for i, (task, future) in enumerate(zip(tasks, futures), 1):
+                    try:
+                        results.append((task, future.result()))
+                    except Exception as e:
+                        print(f"  [ERROR] {names[task['venue_id']]} {task['cutoff']} {task['model']}: {e}")
+                        results.append((task, None))
+                    if i % max(1, len(tasks) // 10) == 0:
+                        print(f"  {i}/{len(tasks)} fits")
+        else:
+            for task in tasks:
+                try:
+                    results.append((task, _fit_rolling_task(task)))
+                except Exception as e:
+                    print(f"  [ERROR] {names[task['venue_id']]} {task['cutoff']} {task['model']}: {e}")
+                    results.append((task, None))
+
+    # Per-venue timings: every fit of the venue, tier at its newest cutoff
+    by_venue: Dict[str, List] = {}
+    for task, result in results:
+        by_venue.setdefault(task["venue_id"], []).append(result)
+    for vid, venue_results in by_venue.items():
+        ok = [r for r in venue_results if r is not None]
+        stages = [s for r in ok for s in r["timings"]["stages"]]
+        rss = [r["timings"]["peak_rss_mb"] for r in ok if r["timings"]["peak_rss_mb"] is not None]
+        timings = {
+            "wall_s": round(sum(r["timings"]["wall_s"] for r in ok), 4),
+            "cpu_s": round(sum(r["timings"]["cpu_s"] for r in ok), 4),
+            "peak_rss_mb": max(rss) if rss else None,
+            "stages": stages,
+        } if ok else None
+        report.add_venue(vid, names[vid], ok[0]["tier"] if ok else None,
+                         "ok" if len(ok) == len(venue_results) else "skipped", timings)
+
+    with report.stage("aggregate") as st:
+        frames = [r["preds"] for _, r in results if r is not None and not r["preds"].empty]
+        preds = (pd.concat(frames, ignore_index=True) if frames
+                 else pd.DataFrame(columns=ROLLING_PREDICTION_COLUMNS))
+        table = horizon_table(preds, horizon)
+        st["rows"] = len(preds)
+
+    print("\n" + "=" * 70)
+    print("RESULTS BY HORIZON (all venues x cutoffs)")
+    print("=" * 70)
+    print_horizon_table(table)
+
+    out_dir = FORECAST_CACHE_DIR / "backtests" / report.run_id
+    out_dir.mkdir(parents=True, exist_ok=True)
+    preds.to_parquet(out_dir / "predictions.parquet", index=False)
+    table.to_csv(out_dir / "horizons.csv", index=False)
+    print(f"\n[INFO] Results: {out_dir}")
+
+    report.finish(venues_ok=sum(v["status"] == "ok" for v in report.venues),
+                  venues_skipped=len(mappings) - sum(v["status"] == "ok" for v in report.venues),
+                  fits=len(tasks), fits_failed=sum(r is None for _, r in results),
+                  scored_days=int((preds["actual"] > 0).sum()) if not preds.empty else 0)
+    report.print_summary()
+    print(f"\n[INFO] Run report: {report.write(FORECAST_CACHE_DIR, report_path)}")
+    venue_v4 = score_predictions(preds[preds["model"] == "v4"], ["venue_id"])
+    save_leaderboard_entry(
+        report, "rolling",
+        {r.pop("model"): r for r in table[table["horizon"] == "all"].drop(columns="horizon").to_dict("records")},
+        {r["venue_id"]: {**r, "name": names[r["venue_id"]]} for r in venue_v4.to_dict("records")},
+        supabase, record_run,
+    )
+    if record_run:
+        report.record(supabase)
+
+    print("\n" + "=" * 70 + "\n")
+    return table
+
+
+def save_leaderboard_entry(report: RunReport, kind: str, summary: Dict[str, Optional[Dict]],
+                           venues: Dict[str, Dict], supabase, record_run: bool):
+    """Write the run's leaderboard entry (leaderboard.py); record_run also stores it in forecast_leaderboard."""
+    finished = report.to_dict()
+    fit_s = fit_seconds_by_venue(finished)
+    entry = build_entry(finished, kind, report.params, {m: a for m, a in summary.items() if a},
+                        {vid: {**m, "fit_s": fit_s.get(vid)} for vid, m in venues.items()})
+    print(f"[INFO] Leaderboard entry ({version_label(entry)}): {write_entry(entry)}")
+    if record_run:
+        record_entry(supabase, entry)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Backtest v4 gated vs v3 vs baseline")
     parser.add_argument("--holdout", type=int, default=90, help="Holdout days (default: 90)")
     parser.add_argument("--venue-id", type=str, help="Single venue UUID")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local history and weather caches")
+    parser.add_argument("--interval-mode", choices=INTERVAL_MODES, default=INTERVAL_MODE,
+                        help="Prophet interval mode for V4 accuracy (both are compared)")
+    parser.add_argument("--report", type=str, default=None,
+                        help="Write the JSON run report here (default: <cache>/runs/<run_id>.json)")
+    parser.add_argument("--record-run", action="store_true",
+                        help="Also store the run report in the forecast_runs table")
+    parser.add_argument("--rolling", type=int, default=None, metavar="K",
+                        help="Rolling-origin mode: K cutoffs per venue instead of one --holdout split")
+    parser.add_argument("--horizon", type=int, default=BACKTEST_HORIZON,
+                        help=f"Rolling mode: days scored after each cutoff (default: {BACKTEST_HORIZON})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Rolling mode: parallel fit processes (default: CPU count)")
+    parser.add_argument("--shard", type=str, default=None, metavar="I/N",
+                        help="Backtest only shard I of N (1-based); combine the reports with shards.py merge")
     args = parser.parse_args()
-
-    run_backtest(venue_id=args.venue_id, holdout_days=args.holdout)
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.rolling:
+        run_rolling_backtest(venue_id=args.venue_id, folds=args.rolling, horizon=args.horizon,
+                             workers=max(1, args.workers), use_cache=not args.no_cache,
+                             interval_mode=args.interval_mode, report_path=args.report,
+                             record_run=args.record_run, shard=shard)
+        return
+
+    run_backtest(venue_id=args.venue_id, holdout_days=args.holdout, use_cache=not args.no_cache,
+                 interval_mode=args.interval_mode, report_path=args.report,
+                 record_run=args.record_run, shard=shard)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+"""
+Micro-benchmarks for the demand forecaster (no DB or network access).
+
+Subcommands:
+  assembly  Row-wise (iterrows + per-record dicts) vs columnar forecast
+            assembly and demand_forecasts payload build, on synthetic
+            Prophet-shaped output for N venues x H horizon days.
+  startup   Interpreter startup + import time of forecaster.py with lazy
+            model backends, against the old eager import of every backend
+            and DB client, plus each backend's first-use cost. Every
+            scenario runs in a fresh Python process.
+
+Usage:
+    python benchmark.py assembly                        # 40 venues x 42 days
+    python benchmark.py assembly --venues 200 --days 90 --repeat 5
+    python benchmark.py startup --repeat 5
+"""
+
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+import pandas as pd
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from forecaster import (
+    MODEL_VERSION,
+    assemble_forecast_rows,
+    forecast_revenue,
+    get_day_type,
+    save_forecasts,
+)
+
+
+class _CaptureTable:
+    """
+    Stand-in for supabase.table(): counts upserted rows instead of sending
+    them. Reads (the stored-vintage lookup) return no rows and inserts
+    (forecast_changes) are dropped.
+    """
+
+    def __init__(self):
+        self.rows = 0
+
+    def table(self, name):
+        return self
+
+    def upsert(self, batch, on_conflict=None):
+        self.rows += len(batch)
+        return self
+
+    def insert(self, batch):
+        return self
+
+    def select(self, *columns):
+        return self
+
+    def in_(self, column, values):
+        return self
+
+    def gte(self, column, value):
+        return self
+
+    def lte(self, column, value):
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def range(self, start, end):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=[])
+
+
+def _synthetic_venue(seed: int, days: int) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Revenue-split forecast frame plus future resos and forecast weather for one venue."""
+    rng = np.random.default_rng(seed)
+    ds = pd.date_range(pd.Timestamp(datetime.now().date()) + pd.Timedelta(days=1), periods=days)
+    yhat = np.maximum(0, 150 + rng.normal(0, 30, days))
+    fc = pd.DataFrame({"ds": ds, "yhat": yhat, "yhat_lower": yhat * 0.85, "yhat_upper": yhat * 1.15})
+    fc["business_date"] = fc["ds"].dt.date
+    per_cover = {d: 50.0 + d for d in range(7)}
+    fc = forecast_revenue(fc, {d: 85.0 for d in range(7)}, per_cover, {d: 30.0 for d in range(7)})
+    resos = pd.DataFrame({"ds": ds[:min(days, 28)].date,
+                          "reso_covers": rng.integers(0, 120, min(days, 28))})
+    weather = pd.DataFrame({"ds": ds[:min(days, 16)], "temp_high": 72.0, "precip_inch": 0.05})
+    return fc, resos, weather
+
+
+def _assemble_rowwise(venues: List[Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame]]) -> List[Dict]:
+    """Previous forecaster path: lookup dicts + iterrows records, then per-record payload."""
+    today = str(datetime.now().date())
+    payload = []
+    for vid, fc, resos, weather in venues:
+        reso_lookup = {str(r["ds"]): int(r["reso_covers"]) for _, r in resos.iterrows()}
+        weather_lookup = {str(w["ds"].date()): {"high": w["temp_high"], "precip": w["precip_inch"]}
+                          for _, w in weather.iterrows()}
+        for _, row in fc.iterrows():
+            bdate = str(row["business_date"])
+            covers = int(row["yhat"])
+            lower, upper = int(row["yhat_lower"]), int(row["yhat_upper"])
+            reso = reso_lookup.get(bdate, 0)
+            conf = max(0.5, min(0.95, 1 - ((upper - lower) / max(covers, 1) / 2))) if covers > 0 else 0.5
+            w = weather_lookup.get(bdate)
+            payload.append({
+                "venue_id": vid,
+                "forecast_date": today,
+                "business_date": bdate,
+                "shift_type": "dinner",
+                "day_type": get_day_type(bdate),
+                "covers_predicted": covers,
+                "covers_lower": lower,
+                "covers_upper": upper,
+                "confidence_level": round(conf, 3),
+                "revenue_predicted": round(float(row["revenue"]), 2),
+                "food_revenue_predicted": round(float(row["food_revenue"]), 2),
+                "bev_revenue_predicted": round(float(row["bev_revenue"]), 2),
+                "reservation_covers_predicted": reso or None,
+                "walkin_covers_predicted": max(0, covers - reso) if reso else covers,
+                "model_version": MODEL_VERSION,
+                "model_accuracy": None,
+                "weather_forecast": json.dumps(w) if w else None,
+                "events": None,
+            })
+    return payload
+
+
+def _assemble_columnar(venues: List[Tuple[str, pd.DataFrame, pd.DataFrame, pd.DataFrame]]) -> int:
+    """Current forecaster path: assemble_forecast_rows per venue, one save_forecasts call."""
+    frames = [assemble_forecast_rows(fc, vid, resos, weather, has_fb_split=True)
+              for vid, fc, resos, weather in venues]
+    sink = _CaptureTable()
+    save_forecasts(pd.concat(frames, ignore_index=True), sink, save_mode="full")
+    return sink.rows
+
+
+def _best_of(fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_assembly(n_venues: int, days: int, repeat: int):
+    venues = [(f"venue-{i:04d}",) + _synthetic_venue(i, days) for i in range(n_venues)]
+    rows = n_venues * days
+    print(f"Assembly benchmark: {n_venues} venues x {days} days = {rows} rows (best of {repeat})")
+
+    rowwise = _best_of(lambda: _assemble_rowwise(venues), repeat)
+    columnar = _best_of(lambda: _assemble_columnar(venues), repeat)
+
+    print(f"  row-wise (iterrows): {rowwise * 1000:8.1f} ms  ({rows / rowwise:,.0f} rows/s)")
+    print(f"  columnar:            {columnar * 1000:8.1f} ms  ({rows / columnar:,.0f} rows/s)")
+    print(f"  speedup:             {rowwise / columnar:8.1f}x")
+
+
+# (label, python -c code or script args); run from this directory in a fresh process
+STARTUP_SCENARIOS = [
+    ("eager: every backend + DB clients",
+     ["-c", "import forecaster, model_backends, psycopg2, requests, supabase; model_backends.load_all()"]),
+    ("lazy: import forecaster", ["-c", "import forecaster"]),
+    ("lazy: forecaster.py --help", ["forecaster.py", "--help"]),
+    ("lazy: import backtest", ["-c", "import backtest"]),
+    ("lazy + naive backend", ["-c", "import forecaster, model_backends; model_backends.load_backend('naive')"]),
+    ("lazy + global backend", ["-c", "import forecaster, model_backends; model_backends.load_backend('global')"]),
+    ("lazy + prophet backend", ["-c", "import forecaster, model_backends; model_backends.load_backend('prophet')"]),
+]
+
+
+def _time_process(args: List[str], repeat: int) -> float:
+    """Best wall time of `python <args>` over repeat runs (raises if it fails)."""
+    cwd = Path(__file__).resolve().parent
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=cwd, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_startup(repeat: int):
+    print(f"Startup benchmark: fresh interpreter per run (best of {repeat})")
+    baseline = _time_process(["-c", "pass"], repeat)
+    eager = None
+    print(f"  {'interpreter only':<36} {baseline * 1000:8.0f} ms")
+    for i, (label, args) in enumerate(STARTUP_SCENARIOS):
+        try:
+            seconds = _time_process(args, repeat)
+        except subprocess.CalledProcessError as e:
+            print(f"  {label:<36} {'failed':>8}     {e.stderr.decode().strip().splitlines()[-1]}")
+            continue
+        if i == 0:
+            eager = seconds
+        vs_eager = f", {eager / seconds:4.1f}x vs eager" if eager else ""
+        print(f"  {label:<36} {seconds * 1000:8.0f} ms  (imports {(seconds - baseline) * 1000:6.0f} ms{vs_eager})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Demand forecaster micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_asm = sub.add_parser("assembly", help="Row-wise vs columnar forecast assembly")
+    p_asm.add_argument("--venues", type=int, default=40, help="Synthetic venues (default: 40)")
+    p_asm.add_argument("--days", type=int, default=42, help="Horizon days per venue (default: 42)")
+    p_asm.add_argument("--repeat", type=int, default=3, help="Timing repeats, best is reported (default: 3)")
+    p_start = sub.add_parser("startup", help="Import time with lazy vs eager model backends")
+    p_start.add_argument("--repeat", type=int, default=3, help="Timing repeats, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    if args.command == "assembly":
+        bench_assembly(args.venues, args.days, args.repeat)
+    elif args.command == "startup":
+        bench_startup(args.repeat)
+    sys.exit(0)
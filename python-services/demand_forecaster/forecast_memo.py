@@ -0,0 +1,74 @@
+"""
+Content-hash memoization of per-venue forecasts.
+
+Each venue run is fingerprinted from the inputs the model actually sees:
+cleaned training frame, future reservations, weather rows, closed weekdays,
+anomaly dates, ModelConfig, MODEL_VERSION and revenue inputs. If the
+fingerprint matches the last successful run, the stored horizon records are
+reused and Prophet is never called.
+
+Records are stored for the whole horizon (every day after the training
+window), then filtered to dates after today on reuse, which is exactly what
+a recomputation would emit.
+
+Layout:
+    <root>/memo/<venue_id>.json   {fingerprint, computed_at, records}
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+
+def _frame_digest(df: Optional[pd.DataFrame]) -> str:
+    if df is None or df.empty:
+        return "empty"
+    df = df.reset_index(drop=True)
+    df = df[sorted(df.columns)]
+    # Hash via a string view so datetime.date / Timestamp / Decimal columns are stable
+    return hashlib.sha256(df.astype(str).to_csv(index=False).encode()).hexdigest()
+
+
+def venue_fingerprint(frames: Dict[str, Optional[pd.DataFrame]], params: Dict[str, Any]) -> str:
+    """Stable SHA-256 over named input frames and JSON-serializable parameters."""
+    h = hashlib.sha256()
+    for name in sorted(frames):
+        h.update(f"{name}:{_frame_digest(frames[name])};".encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class ForecastMemo:
+    """Per-venue store of the last successful forecast keyed by input fingerprint."""
+
+    def __init__(self, root: Path):
+        self.dir = Path(root) / "memo"
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, venue_id: str) -> Path:
+        return self.dir / f"{venue_id}.json"
+
+    def get(self, venue_id: str, fingerprint: str) -> Optional[Dict]:
+        """Stored entry if its fingerprint matches, else None."""
+        path = self._path(venue_id)
+        if not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("fingerprint") == fingerprint else None
+
+    def put(self, venue_id: str, fingerprint: str, records: List[Dict]):
+        entry = {
+            "fingerprint": fingerprint,
+            "computed_at": datetime.now().isoformat(timespec="seconds"),
+            "records": records,
+        }
+        tmp = self._path(venue_id).with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, default=str))
+        os.replace(tmp, self._path(venue_id))
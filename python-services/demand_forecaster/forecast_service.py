@@ -0,0 +1,583 @@
+"""
+Long-lived demand forecast service: fitted models loaded once, queries
+answered from memory.
+
+At startup every venue's fitted Prophet model is loaded from the model
+registry (<cache>/models, written by forecaster.py) together with what the
+batch run derives from its history: learned reso betas, DOW average resos,
+avg check and food/bev per cover, dark days, booked resos and cached
+forecast weather. The reso-free covers forecast for the next forecast_days
+is predicted once per venue. A query is then a lookup plus the reso
+adjustment and revenue split; dates past the precomputed horizon are
+predicted on demand (Prophet, no uncertainty sampling) and kept.
+
+What-if queries replace the booked reso covers for a date and re-apply the
+learned elasticity, (resos - DOW avg resos) * DOW beta, without refitting.
+Tier C venues have no learned elasticity, so their what-ifs return the
+baseline. Tier D venues are served by the naive DOW average. Venues without
+a registry model (or on the global backend only) are reported unavailable
+until forecaster.py has fitted them.
+
+Interfaces (JSON-RPC 2.0; logs go to stderr in --stdio mode):
+    --stdio       one request per line on stdin, one response per line on stdout
+    --http PORT   POST a request to http://127.0.0.1:PORT/, or
+                  GET /<method>?param=value (e.g. /forecast?venue_id=..&date=2026-11-14)
+
+Methods:
+    forecast  {venue_id, date | start_date [+ end_date] | days}
+    what_if   {venue_id, date | dow, reso_covers}   dow: 0-6 (Mon=0) or a day name
+    venues    {}
+    reload    {venue_id?}                           refit-free reload from the caches
+    health    {}
+
+Usage:
+    python forecast_service.py --stdio
+    python forecast_service.py --http 8765
+    python forecast_service.py --http 8765 --venue-id UUID --offline
+    echo '{"jsonrpc": "2.0", "id": 1, "method": "what_if",
+           "params": {"venue_id": "UUID", "dow": "sat", "reso_covers": 180}}' \\
+        | python forecast_service.py --stdio
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl
+import numpy as np
+import pandas as pd
+
+from forecaster import (
+    FORECAST_CACHE_DIR,
+    FORECAST_DAYS,
+    FUTURE_RESO_COLUMNS,
+    MODEL_VERSION,
+    ModelConfig,
+    _get_weather_columns,
+    _join_on_date,
+    clean_training_data,
+    compute_avg_check_per_dow,
+    compute_food_bev_per_cover_bulk,
+    confidence_levels,
+    convert_weather_to_binary,
+    dow_avg_resos,
+    filter_anomaly_days,
+    filter_closed_days,
+    forecast_revenue,
+    get_future_reservations_bulk,
+    get_supabase,
+    get_tipsee_conn,
+    get_venue_anomaly_dates,
+    get_venue_closed_days,
+    get_venue_coords,
+    get_venue_mappings,
+    get_weather_forecast,
+    load_venue_history,
+    merge_future_weather,
+    model_router,
+    naive_dow_forecast,
+    predict_prophet,
+    residual_quantiles,
+    reso_adjustment,
+    zero_closed_day_forecasts,
+)
+from history_store import HistoryStore
+from model_registry import ModelRegistry
+from reso_elasticity import ResoElasticityCache
+from weather_cache import WeatherCache
+
+SERVICE_HOST = os.getenv("FORECAST_SERVICE_HOST", "127.0.0.1")
+SERVICE_MAX_DAYS = int(os.getenv("FORECAST_SERVICE_MAX_DAYS", "365"))   # furthest date served
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class ServedVenue:
+    """Everything needed to answer a venue's queries without TipSee or a refit."""
+
+    def __init__(self, venue_id: str, name: Optional[str], config: ModelConfig,
+                 train_end: pd.Timestamp, base: pd.DataFrame, future_resos: pd.DataFrame,
+                 reso_betas: Dict[int, float], dow_avg_reso: pd.Series,
+                 avg_checks: Dict[int, float], food_per_cover: Dict[int, float],
+                 bev_per_cover: Dict[int, float], closed_days: List[int],
+                 model=None, meta: Optional[Dict] = None,
+                 forecast_weather: Optional[pd.DataFrame] = None):
+        self.venue_id = venue_id
+        self.name = name
+        self.config = config
+        self.train_end = train_end
+        self.base = base                      # ds-indexed yhat, yhat_lower, yhat_upper (no reso adjustment)
+        self.future_resos = future_resos
+        self.reso_betas = reso_betas
+        self.dow_avg_reso = dow_avg_reso
+        self.avg_checks = avg_checks
+        self.food_per_cover = food_per_cover
+        self.bev_per_cover = bev_per_cover
+        self.closed_days = closed_days
+        self.model = model                    # None for Tier D (naive)
+        self.meta = meta or {}
+        self.forecast_weather = forecast_weather
+        self.resid_q = self.meta.get("residual_quantiles")
+
+    @property
+    def weather_mode(self) -> str:
+        return self.meta.get("signature", {}).get("weather_mode", "off")
+
+    def describe(self) -> Dict:
+        return {
+            "venue_id": self.venue_id,
+            "name": self.name,
+            "tier": self.config.tier,
+            "label": self.config.label,
+            "model_version": MODEL_VERSION,
+            "train_end": str(self.train_end.date()),
+            "fitted_on": self.meta.get("fitted_on"),
+            "weather_mode": self.weather_mode if self.model is not None else "off",
+            "reso_betas": {DAY_NAMES[d]: b for d, b in sorted(self.reso_betas.items())},
+            "horizon_end": str(self.base.index.max().date()),
+        }
+
+
+class ForecastService:
+    """Per-venue ServedVenue states plus the JSON-RPC methods that query them."""
+
+    def __init__(self, venue_id: Optional[str] = None, forecast_days: int = FORECAST_DAYS,
+                 use_tipsee: bool = True):
+        self.venue_id = venue_id
+        self.forecast_days = forecast_days
+        self.use_tipsee = use_tipsee
+        self.venues: Dict[str, ServedVenue] = {}
+        self.unavailable: Dict[str, str] = {}
+        self.loaded_at: Optional[datetime] = None
+        self.methods = {
+            "forecast": self.forecast,
+            "what_if": self.what_if,
+            "venues": self.list_venues,
+            "reload": self.reload,
+            "health": self.health,
+        }
+
+    # ------------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------------
+
+    def load(self, venue_id: Optional[str] = None):
+        """Load (or reload) every venue, or just venue_id, from the registry and local caches."""
+        t0 = time.perf_counter()
+        supabase = get_supabase()
+        mappings = get_venue_mappings(supabase, venue_id or self.venue_id)
+        venue_coords = get_venue_coords(supabase)
+        venue_closed_days = get_venue_closed_days(supabase)
+        venue_anomalies = get_venue_anomaly_dates(supabase)
+
+        store = HistoryStore(FORECAST_CACHE_DIR)
+        if self.use_tipsee:
+            tipsee_conn = get_tipsee_conn()
+            try:
+                venue_history = load_venue_history(tipsee_conn, mappings, store)
+                venue_future_resos = get_future_reservations_bulk(tipsee_conn, mappings, self.forecast_days)
+            finally:
+                tipsee_conn.close()
+        else:
+            venue_history = {
+                m["venue_id"]: store.load(HistoryStore.location_key(m.get("tipsee_location_uuid"),
+                                                                    m.get("tipsee_location_name")))
+                for m in mappings
+            }
+            venue_future_resos = {}
+        venue_food_bev = compute_food_bev_per_cover_bulk(supabase, [m["venue_id"] for m in mappings])
+
+        registry = ModelRegistry(FORECAST_CACHE_DIR)
+        weather_cache = WeatherCache(FORECAST_CACHE_DIR)
+        reso_cache = ResoElasticityCache(FORECAST_CACHE_DIR)
+        for m in mappings:
+            vid = m["venue_id"]
+            self.venues.pop(vid, None)
+            self.unavailable.pop(vid, None)
+            try:
+                self.venues[vid] = self._load_venue(
+                    m, venue_history.get(vid), venue_future_resos.get(vid),
+                    venue_coords.get(vid), venue_closed_days.get(vid, []),
+                    venue_anomalies.get(vid, set()), venue_food_bev[vid], registry, weather_cache,
+                    reso_cache,
+                )
+            except Exception as e:
+                self.unavailable[vid] = str(e)
+                print(f"  [SKIP] {m.get('tipsee_location_name') or vid}: {e}")
+
+        self.loaded_at = datetime.now()
+        print(f"[INFO] Serving {len(self.venues)} venues ({len(self.unavailable)} unavailable), "
+              f"loaded in {time.perf_counter() - t0:.1f}s")
+
+    def _load_venue(self, mapping: Dict, df: Optional[pd.DataFrame],
+                    future_resos: Optional[pd.DataFrame], coords: Optional[Dict],
+                    closed_days: List[int], anomaly_dates: set,
+                    food_bev: Tuple[Dict[int, float], Dict[int, float]],
+                    registry: ModelRegistry, weather_cache: WeatherCache,
+                    reso_cache: ResoElasticityCache) -> ServedVenue:
+        """Same history prep and routing as forecast_venue, with the registry model instead of a fit."""
+        vid = mapping["venue_id"]
+        if df is None or df.empty:
+            raise ValueError("No cached history")
+        df = filter_anomaly_days(filter_closed_days(df, closed_days), anomaly_dates)
+        if df.empty:
+            raise ValueError("No history after dark-day / anomaly filters")
+        config = model_router(len(df), mapping.get("venue_class"), has_coords=coords is not None)
+        food_per_cover, bev_per_cover = food_bev
+        if future_resos is None:
+            future_resos = pd.DataFrame(columns=FUTURE_RESO_COLUMNS)
+
+        if not config.use_prophet:
+            base = naive_dow_forecast(df, SERVICE_MAX_DAYS)
+            return ServedVenue(
+                vid, mapping.get("tipsee_location_name"), config,
+                pd.to_datetime(df["ds"]).max(), base.set_index("ds")[["yhat", "yhat_lower", "yhat_upper"]],
+                future_resos, {}, pd.Series(dtype=float), compute_avg_check_per_dow(df),
+                food_per_cover, bev_per_cover, closed_days,
+            )
+
+        df_clean = clean_training_data(df) if config.use_outlier_removal else df
+        model, meta = registry.load(vid)
+        if model is None:
+            raise ValueError("No fitted model in the registry (run forecaster.py first)")
+        if meta.get("signature", {}).get("model_version") != MODEL_VERSION:
+            print(f"  [WARN] {vid}: registry model is {meta.get('signature', {}).get('model_version')}, "
+                  f"not {MODEL_VERSION}")
+
+        fcast_weather = None
+        weather_mode = meta.get("signature", {}).get("weather_mode", "off")
+        if weather_mode != "off" and coords:
+            fcast_weather = get_weather_forecast(coords["lat"], coords["lon"], coords["tz"],
+                                                   min(self.forecast_days, 14), cache=weather_cache)
+            if fcast_weather is not None and weather_mode == "binary":
+                fcast_weather = convert_weather_to_binary(fcast_weather)
+
+        venue = ServedVenue(
+            vid, mapping.get("tipsee_location_name"), config, pd.to_datetime(df_clean["ds"]).max(),
+            pd.DataFrame(columns=["yhat", "yhat_lower", "yhat_upper"]), future_resos,
+            reso_cache.betas(vid, df, df_clean, {
+                "closed_days": sorted(closed_days),
+                "anomaly_dates": sorted(anomaly_dates),
+            }) if config.use_reso else {},
+            dow_avg_resos(df_clean), compute_avg_check_per_dow(df_clean),
+            food_per_cover, bev_per_cover, closed_days,
+            model=model, meta=meta, forecast_weather=fcast_weather,
+        )
+        if venue.resid_q is None:
+            venue.resid_q = residual_quantiles(model)
+        venue.base = self._predict_base(venue, pd.date_range(
+            venue.train_end + pd.Timedelta(days=1), periods=self.forecast_days, freq="D"))
+        return venue
+
+    @staticmethod
+    def _predict_base(venue: ServedVenue, ds: pd.DatetimeIndex) -> pd.DataFrame:
+        """Reso-free covers forecast for ds from the venue's Prophet model (fast intervals)."""
+        future = pd.DataFrame({"ds": ds})
+        weather_cols = _get_weather_columns(venue.weather_mode)
+        if weather_cols:
+            # Training regressors live in model.history: they fill days without forecast weather
+            future = merge_future_weather(future, weather_cols,
+                                            venue.model.history[["ds"] + weather_cols],
+                                            venue.forecast_weather)
+        fc = predict_prophet(venue.model, future, "fast", venue.resid_q)
+        return fc.set_index("ds")[["yhat", "yhat_lower", "yhat_upper"]]
+
+    # ------------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------------
+
+    def _venue(self, venue_id: Optional[str]) -> ServedVenue:
+        if not venue_id:
+            raise ValueError("venue_id is required")
+        if venue_id in self.unavailable:
+            raise ValueError(f"Venue {venue_id} unavailable: {self.unavailable[venue_id]}")
+        if venue_id not in self.venues:
+            raise ValueError(f"Unknown venue {venue_id}")
+        return self.venues[venue_id]
+
+    def _dates(self, venue: ServedVenue, date: Optional[str] = None, start_date: Optional[str] = None,
+               end_date: Optional[str] = None, days: Optional[int] = None) -> pd.DatetimeIndex:
+        if date:
+            ds = pd.DatetimeIndex([pd.Timestamp(date)])
+        elif start_date:
+            ds = pd.date_range(pd.Timestamp(start_date), pd.Timestamp(end_date or start_date), freq="D")
+        else:
+            first = max(pd.Timestamp(datetime.now().date()), venue.train_end) + pd.Timedelta(days=1)
+            ds = pd.date_range(first, periods=int(days or self.forecast_days), freq="D")
+        if len(ds) == 0:
+            raise ValueError("Empty date range")
+        if ds.min() <= venue.train_end:
+            raise ValueError(f"Dates must be after the venue's last history day ({venue.train_end.date()})")
+        if ds.max() > venue.train_end + pd.Timedelta(days=SERVICE_MAX_DAYS):
+            raise ValueError(f"Dates must be within {SERVICE_MAX_DAYS} days of the last history day")
+        return ds
+
+    def _covers(self, venue: ServedVenue, ds: pd.DatetimeIndex) -> pd.DataFrame:
+        """Base rows for ds, predicting (and keeping) any the horizon does not cover yet."""
+        missing = ds.difference(venue.base.index)
+        if len(missing):
+            venue.base = pd.concat([venue.base, self._predict_base(venue, missing)]).sort_index()
+        return venue.base.loc[ds].rename_axis("ds").reset_index()
+
+    def _answer(self, venue: ServedVenue, ds: pd.DatetimeIndex,
+                reso_override: Optional[pd.DataFrame] = None) -> List[Dict]:
+        """Rows for ds: base covers + reso adjustment, dark days zeroed, revenue split."""
+        fc = self._covers(venue, ds)
+        resos = venue.future_resos
+        if reso_override is not None:
+            resos = pd.concat([resos, reso_override], ignore_index=True)  # override is last, so it wins
+        booked = _join_on_date(fc["ds"].to_numpy().astype("datetime64[D]"),
+                                 resos.assign(ds=pd.to_datetime(resos["ds"])) if not resos.empty else None,
+                                 "reso_covers")
+
+        adjustment = np.zeros(len(fc))
+        if venue.config.use_reso and not resos.empty:
+            adjustment = reso_adjustment(fc["ds"], resos, venue.dow_avg_reso, venue.reso_betas)
+        for col in ["yhat", "yhat_lower", "yhat_upper"]:
+            fc[col] = (fc[col] + adjustment).clip(lower=0).round(0)
+        with redirect_stdout(sys.stderr):
+            fc = zero_closed_day_forecasts(fc, venue.closed_days)
+        has_fb_split = bool(venue.food_per_cover and venue.bev_per_cover)
+        fc = forecast_revenue(fc, venue.avg_checks,
+                                venue.food_per_cover if has_fb_split else None,
+                                venue.bev_per_cover if has_fb_split else None)
+
+        covers = fc["yhat"].to_numpy().astype(int)
+        lower = fc["yhat_lower"].to_numpy().astype(int)
+        upper = fc["yhat_upper"].to_numpy().astype(int)
+        confidence = confidence_levels(covers, lower, upper)
+        dows = fc["ds"].dt.dayofweek.to_numpy()
+        rows = []
+        for i in range(len(fc)):
+            rows.append({
+                "venue_id": venue.venue_id,
+                "business_date": str(fc["ds"].iloc[i].date()),
+                "day": DAY_NAMES[dows[i]],
+                "covers_predicted": int(covers[i]),
+                "covers_lower": int(lower[i]),
+                "covers_upper": int(upper[i]),
+                "confidence_level": float(confidence[i]),
+                "revenue_predicted": _num(fc["revenue"].iloc[i]),
+                "food_revenue_predicted": _num(fc["food_revenue"].iloc[i]),
+                "bev_revenue_predicted": _num(fc["bev_revenue"].iloc[i]),
+                "reso_covers": None if np.isnan(booked[i]) else int(booked[i]),
+                "reso_beta": venue.reso_betas.get(int(dows[i])) if venue.config.use_reso else None,
+                "reso_adjustment": round(float(adjustment[i]), 1),
+                "tier": venue.config.tier,
+                "model_version": MODEL_VERSION,
+            })
+        return rows
+
+    def forecast(self, venue_id: Optional[str] = None, date: Optional[str] = None,
+                 start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 days: Optional[int] = None) -> List[Dict]:
+        """Forecast rows for one date, a date range, or the next `days` days (default: forecast_days)."""
+        venue = self._venue(venue_id)
+        return self._answer(venue, self._dates(venue, date, start_date, end_date, days))
+
+    def what_if(self, venue_id: Optional[str] = None, reso_covers=None, date: Optional[str] = None,
+                dow=None) -> Dict:
+        """Baseline vs. forecast with reso_covers booked on date (or the next `dow`)."""
+        venue = self._venue(venue_id)
+        if reso_covers is None:
+            raise ValueError("reso_covers is required")
+        if date is None:
+            if dow is None:
+                raise ValueError("date or dow is required")
+            date = str(_next_dow(_parse_dow(dow), max(pd.Timestamp(datetime.now().date()),
+                                                      venue.train_end)).date())
+        ds = self._dates(venue, date=date)
+        baseline = self._answer(venue, ds)[0]
+        override = pd.DataFrame({"ds": ds, "reso_count": np.nan, "reso_covers": float(reso_covers)})
+        scenario = self._answer(venue, ds, override)[0]
+        note = None
+        if not venue.config.use_reso:
+            note = f"Tier {venue.config.tier} has no learned reso elasticity; covers do not move with resos"
+        return {
+            "venue_id": venue.venue_id,
+            "business_date": baseline["business_date"],
+            "reso_covers": int(reso_covers),
+            "baseline": baseline,
+            "what_if": scenario,
+            "covers_delta": scenario["covers_predicted"] - baseline["covers_predicted"],
+            "note": note,
+        }
+
+    def list_venues(self) -> Dict:
+        return {
+            "venues": [v.describe() for v in self.venues.values()],
+            "unavailable": self.unavailable,
+        }
+
+    def reload(self, venue_id: Optional[str] = None) -> Dict:
+        with redirect_stdout(sys.stderr):
+            self.load(venue_id)
+        return self.health()
+
+    def health(self) -> Dict:
+        return {
+            "status": "ok" if self.venues else "empty",
+            "venues": len(self.venues),
+            "unavailable": len(self.unavailable),
+            "loaded_at": self.loaded_at.isoformat(timespec="seconds") if self.loaded_at else None,
+            "model_version": MODEL_VERSION,
+        }
+
+    # ------------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------------
+
+    def handle(self, request) -> Optional[Dict]:
+        """Dispatch one JSON-RPC 2.0 request dict. Returns None for notifications (no id)."""
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        req_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return _error(req_id, METHOD_NOT_FOUND, f"Unknown method {request['method']}")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return _error(req_id, INVALID_PARAMS, "params must be an object")
+        try:
+            result = method(**params)
+        except (TypeError, ValueError, KeyError) as e:
+            return _error(req_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            print(f"[ERROR] {request['method']}: {e}", file=sys.stderr)
+            return _error(req_id, INTERNAL_ERROR, str(e))
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+    def handle_line(self, line: str) -> Optional[Dict]:
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {e}")
+        return self.handle(request)
+
+
+def _num(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else round(float(value), 2)
+
+
+def _error(req_id, code: int, message: str) -> Dict:
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def _parse_dow(dow) -> int:
+    """0-6 (Mon=0) or a day name / prefix ("sat", "Saturday")."""
+    if isinstance(dow, int) or str(dow).isdigit():
+        d = int(dow)
+        if 0 <= d <= 6:
+            return d
+    else:
+        key = str(dow).strip().lower()[:3]
+        if key in DAY_NAMES:
+            return DAY_NAMES.index(key)
+    raise ValueError(f"Invalid dow {dow!r} (0-6 with Mon=0, or a day name)")
+
+
+def _next_dow(dow: int, after: pd.Timestamp) -> pd.Timestamp:
+    """First date strictly after `after` that falls on dow."""
+    return after + timedelta(days=(dow - after.dayofweek - 1) % 7 + 1)
+
+
+# ============================================================================
+# SERVERS
+# ============================================================================
+
+def serve_stdio(service: ForecastService):
+    """JSON-RPC over stdin/stdout, one request per line. Everything printed goes to stderr."""
+    out = sys.stdout
+    print("[INFO] Ready on stdin (JSON-RPC, one request per line)", file=sys.stderr)
+    with redirect_stdout(sys.stderr):
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            response = service.handle_line(line)
+            if response is not None:
+                out.write(json.dumps(response, default=str) + "\n")
+                out.flush()
+
+
+def serve_http(service: ForecastService, port: int, host: str = SERVICE_HOST):
+    """
+    JSON-RPC over HTTP. Single-threaded on purpose: queries take milliseconds
+    and Prophet models are not safe to predict from concurrent threads.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, payload: Optional[Dict], status: int = 200):
+            body = json.dumps(payload, default=str).encode() if payload is not None else b""
+            self.send_response(status if payload is not None else 204)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self._send(service.handle_line(self.rfile.read(length).decode() or "null"))
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = dict(parse_qsl(url.query))
+            response = service.handle({"jsonrpc": "2.0", "id": None,
+                                       "method": url.path.strip("/") or "health", "params": params})
+            self._send(response, 400 if "error" in response else 200)
+
+        def log_message(self, fmt, *args):
+            print(f"[HTTP] {self.address_string()} {fmt % args}")
+
+    server = HTTPServer((host, port), Handler)
+    print(f"[INFO] Listening on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    import logging
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    logging.getLogger("prophet").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="Serve demand forecasts from fitted models held in memory")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--stdio", action="store_true", help="JSON-RPC over stdin/stdout")
+    mode.add_argument("--http", type=int, metavar="PORT", help="JSON-RPC over HTTP on this port")
+    parser.add_argument("--host", type=str, default=SERVICE_HOST, help=f"HTTP bind address (default: {SERVICE_HOST})")
+    parser.add_argument("--venue-id", type=str, help="Serve a single venue")
+    parser.add_argument("--days", type=int, default=FORECAST_DAYS,
+                        help=f"Horizon precomputed per venue (default: {FORECAST_DAYS})")
+    parser.add_argument("--offline", action="store_true",
+                        help="Serve from the local history cache without TipSee (no booked resos)")
+    args = parser.parse_args()
+
+    service = ForecastService(venue_id=args.venue_id, forecast_days=args.days, use_tipsee=not args.offline)
+    if args.stdio:
+        with redirect_stdout(sys.stderr):
+            service.load()
+        serve_stdio(service)
+    else:
+        service.load()
+        serve_http(service, args.http, args.host)
+
+
+if __name__ == "__main__":
+    main()
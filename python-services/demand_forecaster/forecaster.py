@@ -11,23 +11,67 @@ Usage:
     python forecaster.py                    # All venues
     python forecaster.py --venue-id UUID    # Single venue
     python forecaster.py --dry-run          # Don't save to DB
+    python forecaster.py --workers 4        # Fan venues out to 4 processes
+    python forecaster.py --backend hybrid   # Pooled global model for Tier C/D venues
+    python forecaster.py --record-run       # Also store the run report in forecast_runs
+    python forecaster.py --stream           # Save each venue as it finishes (bounded memory)
+    python forecaster.py --shard 2/4        # Second of four venue shards (shards.py)
+    python forecaster.py --resume RUN_ID    # Skip venues RUN_ID already saved (run_manifest.py)
+
+Model backends (Prophet, pooled ridge, naive DOW) load lazily, see model_backends.py.
+Daily forecasts are split into hourly / shift rows by intraday_curves.py.
 """
 
+from __future__ import annotations
+
 import os
+import io
+import gc
 import sys
 import json
+import time
 import argparse
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Tuple
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple
 import pandas as pd
 import numpy as np
-import psycopg2
-import requests
-from sklearn.linear_model import Ridge
-from supabase import create_client, Client
-from prophet import Prophet
 from dotenv import load_dotenv
 from pathlib import Path
+from history_store import HistoryStore
+from weather_cache import WeatherCache
+from model_registry import ModelRegistry
+from forecast_memo import ForecastMemo, venue_fingerprint
+from model_backends import TIER_BACKENDS, is_loaded, load_backend
+from run_report import RunReport, StageTimer
+from shards import parse_shard, select_shard
+from run_manifest import RunManifest
+from forecast_store import (
+    COVERS_COLUMNS,
+    REVENUE_COLUMNS,
+    ROW_KEY,
+    changed_rows,
+    copy_merge,
+    forecast_changes,
+    forecast_db_dsn,
+    get_forecast_db_conn,
+    save_delta,
+)
+from reso_elasticity import ResoElasticityCache, learn_reso_elasticity_batch
+from intraday_curves import (
+    CHECK_HOUR_COLUMNS, HOURLY_CONFLICT_KEY, INTRADAY_LOOKBACK_DAYS,
+    hourly_records, learn_intraday_curves,
+)
+
+# Shared python-services modules (business calendar)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from business_calendar import DOW_NAMES, get_calendar
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+    from supabase import Client
 
 # Load env from project root (two levels up from this file)
 _project_root = Path(__file__).resolve().parent.parent.parent
@@ -37,11 +81,11 @@ load_dotenv(_project_root / ".env.local", override=True)
 # Configuration
 FORECAST_DAYS = int(os.getenv("FORECAST_DAYS", "42"))
 MODEL_VERSION = "prophet_v4_tuned"
+GLOBAL_MODEL_VERSION = "global_ridge_v1"
 MIN_COVERS_THRESHOLD = 10
 
-# Reso elasticity bounds
-RESO_BETA_MIN = 0.0
-RESO_BETA_MAX = 1.5
+# Local cache root (history store, etc.)
+FORECAST_CACHE_DIR = Path(os.getenv("FORECAST_CACHE_DIR", str(Path(__file__).resolve().parent / ".cache")))
 
 # Outlier removal
 OUTLIER_PERCENTILE_LOW = 1    # bottom 1%
@@ -53,6 +97,30 @@ TIER_B_MIN = 45    # Moderate: Prophet + binary weather flags + reso
 TIER_C_MIN = 30    # Basic: Prophet baseline (no weather, no reso)
                     # Below TIER_C_MIN = Tier D: naive rolling average
 
+# Model backend: "prophet" (per-venue, tiered), "global" (one pooled model for
+# every venue with GLOBAL_MIN_DAYS+), "hybrid" (Prophet for A/B, pooled for C/D)
+FORECAST_BACKENDS = ("prophet", "global", "hybrid")
+FORECAST_BACKEND = os.getenv("FORECAST_BACKEND", "prophet")
+GLOBAL_MIN_DAYS = 14
+
+# Prophet interval mode: "fast" predicts only horizon rows without Monte Carlo
+# sampling and takes the 80% band from in-sample residual quantiles per DOW;
+# "exact" is Prophet's full predict with uncertainty samples.
+INTERVAL_MODES = ("fast", "exact")
+INTERVAL_MODE = os.getenv("FORECAST_INTERVAL_MODE", "fast")
+INTERVAL_QUANTILES = (0.10, 0.90)   # 80% band, matches interval_width=0.80
+INTERVAL_Z = 1.2816                 # normal z for the same band
+INTERVAL_MIN_DOW_RESIDUALS = 8
+
+# demand_forecasts persistence: "delta" = changed rows only, COPY + merge over
+# direct Postgres (forecast_store.py); "full" = upsert every row via PostgREST.
+# Delta leaves unchanged days on older vintages: read demand_forecasts_latest.
+SAVE_MODES = ("delta", "full")
+SAVE_MODE = os.getenv("FORECAST_SAVE_MODE", "delta")
+
+# Streaming: save each venue as it finishes instead of once at the end of the run
+STREAM = os.getenv("FORECAST_STREAM", "").lower() in ("1", "true", "yes")
+
 # Venue classes where weather impact is weak/indirect
 WEATHER_WEAK_CLASSES = {"nightclub", "late_night"}
 
@@ -104,31 +172,51 @@ DEFAULT_PROPHET_PARAMS = {
     "seasonality_mode": "multiplicative",
 }
 
-# US holidays for day_type classification (must match SQL get_day_type function)
-US_HOLIDAYS = {
-    # 2025
-    "2025-01-01", "2025-01-20", "2025-02-17", "2025-05-26", "2025-07-04",
-    "2025-09-01", "2025-11-27", "2025-11-28", "2025-12-25", "2025-12-31",
-    # 2026
-    "2026-01-01", "2026-01-19", "2026-02-16", "2026-05-25", "2026-07-04",
-    "2026-09-07", "2026-11-26", "2026-11-27", "2026-12-25", "2026-12-31",
-}
+# Tuned per-class params written by tune.py as prophet_params/v<N>.json. The
+# newest version overrides the constants above; PROPHET_PARAMS_FILE pins a file.
+PROPHET_PARAMS_DIR = Path(__file__).resolve().parent / "prophet_params"
+
+
+def load_tuned_prophet_params(path: Optional[str] = None) -> Tuple[Optional[int], Dict[str, Dict]]:
+    """
+    (version, {venue_class or "default": params}) from a tune.py config, or
+    (None, {}) when there is none. Without a path the newest
+    PROPHET_PARAMS_DIR/v<N>.json is used.
+    """
+    if path is None:
+        versions = sorted((int(f.stem[1:]), f) for f in PROPHET_PARAMS_DIR.glob("v*.json")
+                          if f.stem[1:].isdigit())
+        if not versions:
+            return None, {}
+        path = versions[-1][1]
+    try:
+        cfg = json.loads(Path(path).read_text())
+    except (OSError, ValueError) as e:
+        print(f"[WARN] Tuned Prophet params unreadable ({path}), using built-in params: {e}")
+        return None, {}
+    return cfg.get("version"), {cls: entry["params"] for cls, entry in cfg.get("classes", {}).items()}
+
+
+TUNED_PARAMS_VERSION, TUNED_PROPHET_PARAMS = load_tuned_prophet_params(os.getenv("PROPHET_PARAMS_FILE"))
+
+
+def prophet_params_for(venue_class: Optional[str]) -> Dict:
+    """Prophet params for a venue class: tuned config first, then the built-in constants."""
+    if venue_class in TUNED_PROPHET_PARAMS:
+        return TUNED_PROPHET_PARAMS[venue_class]
+    if venue_class in VENUE_CLASS_PROPHET_PARAMS:
+        return VENUE_CLASS_PROPHET_PARAMS[venue_class]
+    return TUNED_PROPHET_PARAMS.get("default", DEFAULT_PROPHET_PARAMS)
 
 
 def get_day_type(date_str: str) -> str:
     """Classify a date into day_type. Mirrors SQL get_day_type() function."""
-    if date_str in US_HOLIDAYS:
-        return "holiday"
-    d = pd.Timestamp(date_str)
-    dow = d.dayofweek  # 0=Mon, 6=Sun
-    if dow == 6:
-        return "sunday"
-    elif dow == 4:
-        return "friday"
-    elif dow == 5:
-        return "saturday"
-    else:
-        return "weekday"
+    return get_calendar().day_type(date_str)
+
+
+def get_day_types(dates: pd.Series) -> np.ndarray:
+    """Vectorized get_day_type for a Series of YYYY-MM-DD strings."""
+    return get_calendar().day_types(dates)
 
 
 # ============================================================================
@@ -139,7 +227,7 @@ class ModelConfig:
     """Configuration returned by the model router for a specific venue."""
     def __init__(self, tier: str, use_weather: str, use_reso: bool,
                  use_outlier_removal: bool, use_prophet: bool, label: str,
-                 prophet_params: Optional[Dict] = None):
+                 prophet_params: Optional[Dict] = None, backend: Optional[str] = None):
         self.tier = tier                    # A, B, C, D
         self.use_weather = use_weather      # "continuous", "binary", "off"
         self.use_reso = use_reso
@@ -147,13 +235,14 @@ class ModelConfig:
         self.use_prophet = use_prophet      # False = naive fallback
         self.label = label
         self.prophet_params = prophet_params or DEFAULT_PROPHET_PARAMS
+        self.backend = backend or TIER_BACKENDS[tier]  # prophet, naive, global (model_backends.py)
 
     def __repr__(self):
         return f"Tier {self.tier}: {self.label}"
 
 
 def model_router(training_days: int, venue_class: Optional[str] = None,
-                 has_coords: bool = True) -> ModelConfig:
+                 has_coords: bool = True, backend: str = "prophet") -> ModelConfig:
     """
     Route a venue to the right model tier based on data quantity and venue type.
 
@@ -163,10 +252,23 @@ def model_router(training_days: int, venue_class: Optional[str] = None,
     Tier D (<30):      Naive DOW rolling average (no Prophet)
 
     Nightclubs/late-night: weather downgraded one level (A->binary, B->off)
-    Prophet hyperparameters tuned per venue class (restaurant vs nightclub vs members club).
+    Prophet hyperparameters tuned per venue class (restaurant vs nightclub vs members club),
+    from the newest tune.py config when there is one (see prophet_params_for).
+
+    backend="global" sends every venue with GLOBAL_MIN_DAYS+ to the pooled
+    multi-venue model (tier letter kept for reporting); "hybrid" only Tier C/D.
     """
     is_weather_weak = venue_class in WEATHER_WEAK_CLASSES
-    params = VENUE_CLASS_PROPHET_PARAMS.get(venue_class, DEFAULT_PROPHET_PARAMS)
+    params = prophet_params_for(venue_class)
+
+    if backend in ("global", "hybrid") and training_days >= GLOBAL_MIN_DAYS:
+        tier = ("A" if training_days >= TIER_A_MIN else "B" if training_days >= TIER_B_MIN
+                else "C" if training_days >= TIER_C_MIN else "D")
+        if backend == "global" or tier in ("C", "D"):
+            weather = "continuous" if has_coords and not is_weather_weak else "off"
+            return ModelConfig(tier, weather, True, True, False,
+                               f"Global pooled model (weather={weather}, {training_days}d)",
+                               prophet_params=params, backend="global")
 
     if training_days >= TIER_A_MIN:
         if is_weather_weak:
@@ -206,6 +308,7 @@ def model_router(training_days: int, venue_class: Optional[str] = None,
 
 def get_tipsee_conn():
     """Get connection to TipSee PostgreSQL."""
+    import psycopg2
     return psycopg2.connect(
         host=os.environ["TIPSEE_DB_HOST"],
         port=int(os.getenv("TIPSEE_DB_PORT", "5432")),
@@ -219,6 +322,7 @@ def get_tipsee_conn():
 
 def get_supabase() -> Client:
     """Get Supabase client."""
+    from supabase import create_client
     url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
     key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
     return create_client(url, key)
@@ -282,11 +386,10 @@ def filter_closed_days(df: pd.DataFrame, closed_weekdays: List[int]) -> pd.DataF
     df = df.copy()
     df["ds"] = pd.to_datetime(df["ds"])
     before = len(df)
-    df = df[~df["ds"].dt.dayofweek.isin(closed_weekdays)]
+    df = df[~get_calendar().closed(df["ds"], closed_weekdays)]
     removed = before - len(df)
     if removed > 0:
-        day_names = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
-        closed_names = [day_names[d] for d in closed_weekdays]
+        closed_names = [DOW_NAMES[d] for d in closed_weekdays]
         print(f"  Dark-day filter: removed {removed} rows for closed days ({', '.join(closed_names)})")
     return df
 
@@ -337,7 +440,7 @@ def zero_closed_day_forecasts(fc: pd.DataFrame, closed_weekdays: List[int]) -> p
     if not closed_weekdays:
         return fc
     fc = fc.copy()
-    mask = fc["ds"].dt.dayofweek.isin(closed_weekdays)
+    mask = get_calendar().closed(fc["ds"], closed_weekdays)
     zeroed = mask.sum()
     if zeroed > 0:
         fc.loc[mask, ["yhat", "yhat_lower", "yhat_upper"]] = 0
@@ -345,8 +448,7 @@ def zero_closed_day_forecasts(fc: pd.DataFrame, closed_weekdays: List[int]) -> p
             fc.loc[mask, "trend"] = 0
         if "revenue" in fc.columns:
             fc.loc[mask, "revenue"] = 0
-        day_names = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
-        closed_names = [day_names[d] for d in closed_weekdays]
+        closed_names = [DOW_NAMES[d] for d in closed_weekdays]
         print(f"  Dark-day zeroed: {zeroed} forecast rows ({', '.join(closed_names)})")
     return fc
 
@@ -448,13 +550,335 @@ def get_future_reservations(conn, location_uuid: str, days: int = FORECAST_DAYS)
     return pd.read_sql(sql, conn, params=(location_uuid, str(today), str(end_date)))
 
 
+# ----------------------------------------------------------------------------
+# Bulk extraction: one grouped query per source table for all mapped venues,
+# streamed through a server-side cursor and split per venue in memory.
+# Per-venue semantics match get_historical_data / _simphony / get_future_reservations.
+# ----------------------------------------------------------------------------
+
+HISTORY_CURSOR_ITERSIZE = 20000
+
+HISTORY_COLUMNS = ["ds", "covers", "net_sales", "reso_count", "reso_covers"]
+FUTURE_RESO_COLUMNS = ["ds", "reso_count", "reso_covers"]
+FUTURE_RESO_STATUSES = ("CONFIRMED", "BOOKED")
+
+
+def _pg_array_literal(values: List[str]) -> str:
+    """
+    Build an untyped Postgres array literal ('{"a","b"}').
+    Passed as a plain string so `col = ANY(%s)` infers the column's type
+    (uuid or text), the same way node-postgres sends arrays in lib/database/tipsee.ts.
+    """
+    escaped = [str(v).replace("\\", "\\\\").replace('"', '\\"') for v in values]
+    return "{" + ",".join(f'"{v}"' for v in escaped) + "}"
+
+
+def _stream_query(conn, sql: str, params: tuple, columns: List[str],
+                  cursor_name: str) -> pd.DataFrame:
+    """Run a query through a named (server-side) cursor, fetching in chunks."""
+    chunks = []
+    cur = conn.cursor(name=cursor_name)
+    cur.itersize = HISTORY_CURSOR_ITERSIZE
+    try:
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(HISTORY_CURSOR_ITERSIZE)
+            if not rows:
+                break
+            chunks.append(pd.DataFrame(rows, columns=columns))
+    finally:
+        cur.close()
+        conn.commit()  # end the read transaction the named cursor lives in
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def get_pos_types(conn, location_uuids: List[str]) -> Dict[str, str]:
+    """Bulk get_pos_type: {location_uuid: pos_type}, defaulting to upserve."""
+    pos_types = {u: "upserve" for u in location_uuids}
+    if not location_uuids:
+        return pos_types
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT DISTINCT ON (uuid) uuid::text, pos_type
+            FROM public.general_locations
+            WHERE uuid = ANY(%s) AND pos_type IS NOT NULL
+            ORDER BY uuid
+            """,
+            (_pg_array_literal(location_uuids),)
+        )
+        for uuid, pos_type in cur.fetchall():
+            pos_types[uuid] = pos_type
+        cur.close()
+    except Exception as e:
+        conn.rollback()
+        print(f"  [WARN] POS type lookup failed, assuming upserve: {e}")
+    return pos_types
+
+
+def _attribute_to_venues(rows: pd.DataFrame, targets: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attribute (location_uuid, location, ds) aggregates to venues.
+    A row belongs to a venue if its uuid OR its location name matches the
+    venue's mapping (same predicate as get_historical_data), counted once per venue.
+    """
+    rows = rows.reset_index(drop=True)
+    rows["_row"] = rows.index
+    by_uuid = targets.dropna(subset=["location_uuid"]).merge(
+        rows[["_row", "location_uuid"]], on="location_uuid"
+    )[["venue_id", "_row"]]
+    by_name = targets.dropna(subset=["location_name"]).merge(
+        rows[["_row", "location"]], left_on="location_name", right_on="location"
+    )[["venue_id", "_row"]]
+    matched = pd.concat([by_uuid, by_name], ignore_index=True).drop_duplicates()
+    return matched.merge(rows, on="_row").drop(columns=["_row"])
+
+
+def get_historical_data_bulk(conn, mappings: List[Dict],
+                             since: Optional[date] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Bulk get_historical_data for all mapped venues in a handful of queries:
+    POS types, Upserve checks, Simphony sales and completed reservations.
+    since: only pull trading days on/after this date (None = full history).
+
+    Returns {venue_id: DataFrame[ds, covers, net_sales, reso_count, reso_covers]},
+    with an empty frame for venues without history.
+    """
+    since_params = (str(since),) if since else ()
+    trading_day_filter = "AND trading_day >= %s" if since else ""
+    reso_date_filter = "AND date >= %s" if since else ""
+    uuids = sorted({m["tipsee_location_uuid"] for m in mappings if m.get("tipsee_location_uuid")})
+    pos_types = get_pos_types(conn, uuids)
+
+    targets = pd.DataFrame([{
+        "venue_id": m["venue_id"],
+        "location_uuid": m.get("tipsee_location_uuid"),
+        "location_name": m.get("tipsee_location_name") or None,
+        "pos_type": pos_types.get(m.get("tipsee_location_uuid"), "upserve")
+                    if m.get("tipsee_location_uuid") else "upserve",
+    } for m in mappings])
+
+    upserve = targets[targets["pos_type"] != "simphony"]
+    simphony = targets[targets["pos_type"] == "simphony"]
+    frames = []
+
+    # --- Upserve: checks matched by uuid OR name, plus reservations by uuid ---
+    up_uuids = sorted(upserve["location_uuid"].dropna().unique())
+    up_names = sorted(upserve["location_name"].dropna().unique())
+    if up_uuids or up_names:
+        pos_rows = _stream_query(conn, f"""
+            SELECT
+                location_uuid::text AS location_uuid,
+                location,
+                trading_day::date AS ds,
+                SUM(guest_count)::int AS covers,
+                SUM(revenue_total) AS net_sales
+            FROM public.tipsee_checks
+            WHERE (location_uuid = ANY(%s) OR location = ANY(%s))
+            {trading_day_filter}
+            GROUP BY location_uuid, location, trading_day::date
+            """,
+            (_pg_array_literal(up_uuids), _pg_array_literal(up_names)) + since_params,
+            ["location_uuid", "location", "ds", "covers", "net_sales"],
+            "forecaster_history_checks",
+        )
+        pos = _attribute_to_venues(pos_rows, upserve)
+        pos["net_sales"] = pd.to_numeric(pos["net_sales"], errors="coerce")
+        pos = pos.groupby(["venue_id", "ds"], as_index=False)[["covers", "net_sales"]].sum()
+        pos["net_sales"] = pos["net_sales"].round(2)
+
+        reso = pd.DataFrame(columns=["location_uuid", "ds", "reso_count", "reso_covers"])
+        if up_uuids:
+            reso = _stream_query(conn, f"""
+                SELECT
+                    location_uuid::text AS location_uuid,
+                    date AS ds,
+                    COUNT(*) AS reso_count,
+                    SUM(max_guests)::int AS reso_covers
+                FROM public.full_reservations
+                WHERE location_uuid = ANY(%s)
+                  AND status IN ('COMPLETE', 'ARRIVED', 'SEATED', 'CONFIRMED')
+                {reso_date_filter}
+                GROUP BY location_uuid, date
+                """,
+                (_pg_array_literal(up_uuids),) + since_params,
+                ["location_uuid", "ds", "reso_count", "reso_covers"],
+                "forecaster_history_resos",
+            )
+        reso = upserve[["venue_id", "location_uuid"]].dropna().merge(reso, on="location_uuid")
+        pos = pos.merge(reso.drop(columns=["location_uuid"]), on=["venue_id", "ds"], how="left")
+        frames.append(pos)
+
+    # --- Simphony: sales by uuid, no reservations ---
+    sim_uuids = sorted(simphony["location_uuid"].dropna().unique())
+    if sim_uuids:
+        sim_rows = _stream_query(conn, f"""
+            SELECT
+                location_uuid::text AS location_uuid,
+                trading_day::date AS ds,
+                SUM(guest_count)::int AS covers,
+                SUM(net_sales)::numeric(14,2) AS net_sales
+            FROM public.tipsee_simphony_sales
+            WHERE location_uuid = ANY(%s)
+            {trading_day_filter}
+            GROUP BY location_uuid, trading_day::date
+            """,
+            (_pg_array_literal(sim_uuids),) + since_params,
+            ["location_uuid", "ds", "covers", "net_sales"],
+            "forecaster_history_simphony",
+        )
+        sim = simphony[["venue_id", "location_uuid"]].merge(sim_rows, on="location_uuid")
+        sim["net_sales"] = pd.to_numeric(sim["net_sales"], errors="coerce")
+        frames.append(sim.drop(columns=["location_uuid"]))
+
+    history = {m["venue_id"]: pd.DataFrame(columns=HISTORY_COLUMNS) for m in mappings}
+    if not frames:
+        return history
+
+    all_rows = pd.concat(frames, ignore_index=True)
+    all_rows["reso_count"] = pd.to_numeric(all_rows.get("reso_count"), errors="coerce").fillna(0).astype(int)
+    all_rows["reso_covers"] = pd.to_numeric(all_rows.get("reso_covers"), errors="coerce").fillna(0).astype(int)
+    all_rows["covers"] = all_rows["covers"].astype(int)
+    all_rows = all_rows[all_rows["covers"] > MIN_COVERS_THRESHOLD]
+    all_rows = all_rows.sort_values(["venue_id", "ds"])
+
+    for vid, venue_df in all_rows.groupby("venue_id", sort=False):
+        history[vid] = venue_df[HISTORY_COLUMNS].reset_index(drop=True)
+
+    n_sim = len(sim_uuids)
+    print(f"[INFO] History loaded for {len(all_rows['venue_id'].unique())}/{len(mappings)} venues "
+          f"({len(all_rows)} venue-days, {n_sim} Simphony{f', since {since}' if since else ''})")
+    return history
+
+
+def load_venue_history(conn, mappings: List[Dict], store: Optional[HistoryStore] = None,
+                       full_refresh: bool = False) -> Dict[str, pd.DataFrame]:
+    """
+    History for all venues, served from the local HistoryStore where possible.
+
+    Cached locations only re-pull days after their last pull minus the
+    re-sync window, in one bulk pass per distinct start day; uncached
+    locations get a full bulk pull. Without a store this is
+    get_historical_data_bulk.
+    """
+    if store is None:
+        return get_historical_data_bulk(conn, mappings)
+
+    keys = {m["venue_id"]: HistoryStore.location_key(m.get("tipsee_location_uuid"),
+                                                     m.get("tipsee_location_name"))
+            for m in mappings}
+    starts = {vid: None if full_refresh else store.resync_start(key) for vid, key in keys.items()}
+    groups: Dict[Optional[date], List[Dict]] = {}
+    for m in mappings:
+        groups.setdefault(starts[m["venue_id"]], []).append(m)
+    cold = len(groups.get(None, []))
+    warm_starts = sorted(s for s in groups if s is not None)
+    print(f"[INFO] History cache: {len(mappings) - cold} warm"
+          f"{f' (re-pulling from {warm_starts[0]}, {len(warm_starts)} bulk passes)' if warm_starts else ''}"
+          f", {cold} cold")
+
+    history = {}
+    for group_since, group in groups.items():
+        fresh = get_historical_data_bulk(conn, group, since=group_since)
+        for m in group:
+            vid = m["venue_id"]
+            history[vid] = store.upsert(
+                keys[vid], fresh[vid], since=group_since,
+                location_uuid=m.get("tipsee_location_uuid"),
+                location_name=m.get("tipsee_location_name"),
+            )
+    return history
+
+
+def get_future_reservations_bulk(conn, mappings: List[Dict], days: int = FORECAST_DAYS,
+                                 statuses: Tuple[str, ...] = FUTURE_RESO_STATUSES) -> Dict[str, pd.DataFrame]:
+    """Bulk get_future_reservations: {venue_id: DataFrame[ds, reso_count, reso_covers]}."""
+    today = datetime.now().date()
+    end_date = today + timedelta(days=days)
+    uuids = sorted({m["tipsee_location_uuid"] for m in mappings if m.get("tipsee_location_uuid")})
+
+    resos = pd.DataFrame(columns=["location_uuid"] + FUTURE_RESO_COLUMNS)
+    if uuids:
+        resos = _stream_query(conn, """
+            SELECT
+                location_uuid::text AS location_uuid,
+                date AS ds,
+                COUNT(*) AS reso_count,
+                COALESCE(SUM(max_guests), 0)::int AS reso_covers
+            FROM public.full_reservations
+            WHERE location_uuid = ANY(%s)
+              AND date >= %s
+              AND date <= %s
+              AND status = ANY(%s)
+            GROUP BY location_uuid, date
+            """,
+            (_pg_array_literal(uuids), str(today), str(end_date), _pg_array_literal(statuses)),
+            ["location_uuid"] + FUTURE_RESO_COLUMNS,
+            "forecaster_future_resos",
+        )
+
+    by_uuid = {u: g[FUTURE_RESO_COLUMNS].reset_index(drop=True)
+               for u, g in resos.groupby("location_uuid")}
+    return {
+        m["venue_id"]: by_uuid.get(m.get("tipsee_location_uuid"),
+                                   pd.DataFrame(columns=FUTURE_RESO_COLUMNS))
+        for m in mappings
+    }
+
+
+def get_check_open_hours_bulk(conn, mappings: List[Dict],
+                              lookback_days: int = INTRADAY_LOOKBACK_DAYS) -> pd.DataFrame:
+    """
+    Covers by venue x trading-day DOW x check open hour over the last
+    lookback_days, for every Upserve venue in one grouped query
+    (DataFrame[CHECK_HOUR_COLUMNS], dow 0=Monday). Input to learn_intraday_curves.
+    """
+    since = datetime.now().date() - timedelta(days=lookback_days)
+    uuids = sorted({m["tipsee_location_uuid"] for m in mappings if m.get("tipsee_location_uuid")})
+    pos_types = get_pos_types(conn, uuids)
+    targets = pd.DataFrame([{
+        "venue_id": m["venue_id"],
+        "location_uuid": m.get("tipsee_location_uuid"),
+        "location_name": m.get("tipsee_location_name") or None,
+    } for m in mappings if pos_types.get(m.get("tipsee_location_uuid"), "upserve") != "simphony"],
+        columns=["venue_id", "location_uuid", "location_name"])
+    up_uuids = sorted(targets["location_uuid"].dropna().unique())
+    up_names = sorted(targets["location_name"].dropna().unique())
+    if not up_uuids and not up_names:
+        return pd.DataFrame(columns=CHECK_HOUR_COLUMNS)
+
+    rows = _stream_query(conn, """
+        SELECT
+            location_uuid::text AS location_uuid,
+            location,
+            (EXTRACT(ISODOW FROM trading_day)::int - 1) AS dow,
+            EXTRACT(HOUR FROM open_time)::int AS hour,
+            SUM(guest_count)::int AS covers
+        FROM public.tipsee_checks
+        WHERE (location_uuid = ANY(%s) OR location = ANY(%s))
+          AND trading_day >= %s
+          AND open_time IS NOT NULL
+          AND guest_count > 0
+        GROUP BY location_uuid, location, 3, 4
+        """,
+        (_pg_array_literal(up_uuids), _pg_array_literal(up_names), str(since)),
+        ["location_uuid", "location", "dow", "hour", "covers"],
+        "forecaster_check_hours",
+    )
+    return _attribute_to_venues(rows, targets)[CHECK_HOUR_COLUMNS]
+
+
 # ============================================================================
 # IMPROVEMENT #2: WEATHER AS PROPHET REGRESSOR
 # ============================================================================
 
-def get_weather_forecast(lat: float, lon: float, tz: str, days: int = 14) -> Optional[pd.DataFrame]:
+def _fetch_weather_forecast(lat: float, lon: float, tz: str, days: int = 14) -> Optional[pd.DataFrame]:
     """Fetch weather forecast from Open-Meteo (free, no API key)."""
     try:
+        import requests
         url = "https://api.open-meteo.com/v1/forecast"
         params = {
             "latitude": lat,
@@ -488,13 +912,11 @@ def get_weather_forecast(lat: float, lon: float, tz: str, days: int = 14) -> Opt
         return None
 
 
-def get_historical_weather(lat: float, lon: float, tz: str,
-                           start_date: str, end_date: str) -> Optional[pd.DataFrame]:
-    """
-    Fetch historical weather from Open-Meteo Archive API.
-    Required to use weather as a Prophet regressor (needs training data too).
-    """
+def _fetch_historical_weather(lat: float, lon: float, tz: str,
+                              start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+    """Fetch raw historical weather from Open-Meteo Archive API (unpublished days are null)."""
     try:
+        import requests
         url = "https://archive-api.open-meteo.com/v1/archive"
         params = {
             "latitude": lat,
@@ -523,16 +945,75 @@ def get_historical_weather(lat: float, lon: float, tz: str,
                 "precip_inch": precip[i] if i < len(precip) else 0,
             })
 
-        df = pd.DataFrame(rows)
-        # Fill any None values
-        df["temp_high"] = df["temp_high"].fillna(df["temp_high"].median())
-        df["precip_inch"] = df["precip_inch"].fillna(0)
-        return df
+        return pd.DataFrame(rows, columns=["ds", "temp_high", "precip_inch"])
     except Exception as e:
         print(f"  [WARN] Historical weather API error: {e}")
         return None
 
 
+def get_weather_forecast(lat: float, lon: float, tz: str, days: int = 14,
+                         cache: Optional[WeatherCache] = None) -> Optional[pd.DataFrame]:
+    """Weather forecast from Open-Meteo, served from the weather cache when given."""
+    if cache is not None:
+        return cache.get_forecast(lat, lon, tz, days, _fetch_weather_forecast)
+    return _fetch_weather_forecast(lat, lon, tz, days)
+
+
+def get_historical_weather(lat: float, lon: float, tz: str,
+                           start_date: str, end_date: str,
+                           cache: Optional[WeatherCache] = None) -> Optional[pd.DataFrame]:
+    """
+    Historical weather from Open-Meteo Archive API (only uncached gaps are
+    requested when a weather cache is given).
+    Required to use weather as a Prophet regressor (needs training data too).
+    """
+    if cache is not None:
+        df = cache.get_history(lat, lon, tz, start_date, end_date, _fetch_historical_weather)
+    else:
+        df = _fetch_historical_weather(lat, lon, tz, start_date, end_date)
+    if df is None or df.empty:
+        return None
+    df = df.copy()
+    # Fill any None values
+    df["temp_high"] = pd.to_numeric(df["temp_high"], errors="coerce")
+    df["temp_high"] = df["temp_high"].fillna(df["temp_high"].median())
+    df["precip_inch"] = pd.to_numeric(df["precip_inch"], errors="coerce").fillna(0)
+    return df
+
+
+def prefetch_weather(mappings: List[Dict], venue_coords: Dict[str, Dict],
+                     venue_history: Dict[str, pd.DataFrame], cache: WeatherCache,
+                     forecast_days: int = FORECAST_DAYS):
+    """
+    Warm the weather cache once per unique rounded coordinate before venues run,
+    so venues sharing a location (and pool workers) never repeat a request.
+    Only venues with enough history to reach a weather tier are considered.
+    """
+    groups: Dict[str, Dict] = {}
+    for m in mappings:
+        coords = venue_coords.get(m["venue_id"])
+        df = venue_history.get(m["venue_id"])
+        if not coords or df is None or len(df) < TIER_B_MIN:
+            continue
+        key = cache.key(coords["lat"], coords["lon"], coords["tz"])
+        start = str(df["ds"].min())
+        group = groups.setdefault(key, {"coords": coords, "start": start, "venues": 0})
+        group["start"] = min(group["start"], start)
+        group["venues"] += 1
+
+    if not groups:
+        return
+    end_date = str((datetime.now() - timedelta(days=1)).date())
+    requests_before = cache.requests
+    for group in groups.values():
+        c = group["coords"]
+        get_historical_weather(c["lat"], c["lon"], c["tz"], group["start"], end_date, cache=cache)
+        get_weather_forecast(c["lat"], c["lon"], c["tz"], min(forecast_days, 14), cache=cache)
+    venues = sum(g["venues"] for g in groups.values())
+    print(f"[INFO] Weather cache: {len(groups)} locations for {venues} venues, "
+          f"{cache.requests - requests_before} API requests")
+
+
 # ============================================================================
 # BINARY WEATHER FLAGS (Tier B)
 # ============================================================================
@@ -607,45 +1088,10 @@ def learn_reso_elasticity(df: pd.DataFrame) -> Dict[int, float]:
     For each DOW, fit: covers_ratio ~ 1 + beta * (resos_ratio - 1)
     Where ratio = value / avg_for_that_dow
 
+    Ridge closed form on grouped sums (see reso_elasticity.py).
     Returns dict of {dow: beta} clamped to [RESO_BETA_MIN, RESO_BETA_MAX].
     """
-    df = df.copy()
-    df["ds"] = pd.to_datetime(df["ds"])
-    df["dow"] = df["ds"].dt.dayofweek
-    df["covers"] = pd.to_numeric(df["covers"], errors="coerce").fillna(0)
-    df["reso_covers"] = pd.to_numeric(df["reso_covers"], errors="coerce").fillna(0)
-
-    # Compute DOW averages
-    dow_avg_covers = df.groupby("dow")["covers"].mean()
-    dow_avg_resos = df.groupby("dow")["reso_covers"].mean()
-
-    betas = {}
-    for dow in range(7):
-        subset = df[df["dow"] == dow].copy()
-        avg_c = dow_avg_covers.get(dow, 0)
-        avg_r = dow_avg_resos.get(dow, 0)
-
-        if avg_c <= 0 or avg_r <= 0 or len(subset) < 8:
-            betas[dow] = 0.0
-            continue
-
-        # Compute ratios
-        subset["covers_ratio"] = subset["covers"] / avg_c
-        subset["resos_ratio"] = subset["reso_covers"] / avg_r
-
-        # Target: covers_ratio - 1 (excess covers)
-        # Feature: resos_ratio - 1 (excess resos)
-        y = (subset["covers_ratio"] - 1).values.reshape(-1, 1)
-        X = (subset["resos_ratio"] - 1).values.reshape(-1, 1)
-
-        # Ridge regression with light regularization
-        model = Ridge(alpha=1.0, fit_intercept=False)
-        model.fit(X, y)
-
-        beta = float(np.clip(model.coef_[0][0], RESO_BETA_MIN, RESO_BETA_MAX))
-        betas[dow] = round(beta, 3)
-
-    return betas
+    return learn_reso_elasticity_batch({"": df})[""]
 
 
 # ============================================================================
@@ -691,7 +1137,7 @@ def build_prophet_model(weather_mode: str = "off",
                     holidays_prior_scale, seasonality_mode
     """
     p = prophet_params or DEFAULT_PROPHET_PARAMS
-    m = Prophet(
+    m = load_backend("prophet").Prophet(
         yearly_seasonality=True,
         weekly_seasonality=True,
         daily_seasonality=False,
@@ -722,6 +1168,112 @@ def _get_weather_columns(weather_mode: str) -> List[str]:
     return []
 
 
+def residual_quantiles(model: Prophet) -> Dict[str, List[float]]:
+    """
+    In-sample residual (y - yhat) quantiles per DOW for fast intervals, from a
+    sample-free predict over the model history. Keys are "0".."6" plus "all"
+    (JSON-safe so they can live in ModelRegistry metadata); DOWs with fewer
+    than INTERVAL_MIN_DOW_RESIDUALS residuals fall back to "all".
+    """
+    samples, model.uncertainty_samples = model.uncertainty_samples, 0
+    try:
+        fitted = model.predict()
+    finally:
+        model.uncertainty_samples = samples
+    resid = pd.Series(model.history["y"].to_numpy() - fitted["yhat"].to_numpy())
+    dow = model.history["ds"].dt.dayofweek.to_numpy()
+    lo, hi = INTERVAL_QUANTILES
+
+    quantiles = {"all": [float(resid.quantile(lo)), float(resid.quantile(hi))]}
+    for d, r in resid.groupby(dow):
+        if len(r) >= INTERVAL_MIN_DOW_RESIDUALS:
+            quantiles[str(d)] = [float(r.quantile(lo)), float(r.quantile(hi))]
+    return quantiles
+
+
+def predict_prophet(model: Prophet, future: pd.DataFrame, interval_mode: str = INTERVAL_MODE,
+                    resid_q: Optional[Dict[str, List[float]]] = None) -> pd.DataFrame:
+    """
+    model.predict with the chosen interval mode. "fast" skips uncertainty
+    sampling. Its band combines per-DOW residual quantiles (observation noise)
+    with the analytic spread of Prophet's simulated future trend.
+
+    Prophet samples Poisson(S * h) new changepoints with Laplace(0, mean|delta|)
+    rate changes over a horizon h (in units of the history span). The trend
+    offset then has sd = mean|delta| * sqrt(2S/3) * h^1.5 (times y_scale, and
+    the multiplicative seasonality factor). The two parts add in quadrature.
+    """
+    if interval_mode == "exact":
+        return model.predict(future)
+
+    if resid_q is None:
+        resid_q = residual_quantiles(model)
+    samples, model.uncertainty_samples = model.uncertainty_samples, 0
+    try:
+        fc = model.predict(future)
+    finally:
+        model.uncertainty_samples = samples
+    dow = fc["ds"].dt.dayofweek.astype(str)
+    q_low = dow.map(lambda d: resid_q.get(d, resid_q["all"])[0]).to_numpy()
+    q_high = dow.map(lambda d: resid_q.get(d, resid_q["all"])[1]).to_numpy()
+
+    horizon = (fc["ds"] - model.history["ds"].max()).dt.days.clip(lower=0).to_numpy() / model.t_scale.days
+    n_changepoints = len(model.changepoints_t)
+    delta_scale = float(np.mean(np.abs(model.params["delta"][0]))) + 1e-8
+    trend_sd = model.y_scale * delta_scale * np.sqrt(2 * n_changepoints / 3) * horizon ** 1.5
+    if model.seasonality_mode == "multiplicative":
+        trend_sd = trend_sd * np.abs(1 + fc["multiplicative_terms"].to_numpy())
+    trend_w = INTERVAL_Z * trend_sd
+
+    fc["yhat_lower"] = fc["yhat"] - np.sqrt(np.minimum(q_low, 0) ** 2 + trend_w ** 2)
+    fc["yhat_upper"] = fc["yhat"] + np.sqrt(np.maximum(q_high, 0) ** 2 + trend_w ** 2)
+    return fc
+
+
+def dow_avg_resos(df: pd.DataFrame) -> pd.Series:
+    """Mean reso covers per DOW over a history frame (the elasticity baseline)."""
+    ds = pd.to_datetime(df["ds"])
+    resos = pd.to_numeric(df["reso_covers"], errors="coerce").fillna(0)
+    return resos.groupby(ds.dt.dayofweek.to_numpy()).mean()
+
+
+def reso_adjustment(ds: pd.Series, future_resos: pd.DataFrame, dow_avg_reso: pd.Series,
+                    reso_betas: Dict[int, float]) -> np.ndarray:
+    """
+    Covers adjustment per forecast date: (booked resos - DOW avg resos) * DOW beta,
+    only on dates with bookings (0 elsewhere).
+    """
+    booked = (future_resos.assign(ds=pd.to_datetime(future_resos["ds"]))
+              .drop_duplicates(subset=["ds"], keep="last")
+              .set_index("ds")["reso_covers"])
+    actual_resos = ds.map(pd.to_numeric(booked, errors="coerce"))
+    dow = ds.dt.dayofweek
+    avg_resos = dow.map(dow_avg_reso)
+    beta = dow.map(reso_betas).fillna(0.0)
+    has_booking = actual_resos.notna() & (avg_resos > 0)
+    return np.where(has_booking, (actual_resos - avg_resos) * beta, 0.0)
+
+
+def merge_future_weather(future: pd.DataFrame, weather_cols: List[str],
+                         historical_weather: Optional[pd.DataFrame],
+                         forecast_weather: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Join weather regressors onto a future frame (forecast wins over history on
+    overlap). Gaps get the historical median temp_high and 0 for the rest.
+    """
+    all_weather = pd.concat([w for w in (historical_weather, forecast_weather) if w is not None],
+                            ignore_index=True)
+    all_weather = all_weather.drop_duplicates(subset=["ds"], keep="last")
+    future = future.merge(all_weather[["ds"] + weather_cols], on="ds", how="left")
+    fill_from = historical_weather if historical_weather is not None else all_weather
+    for col in weather_cols:
+        if col in ["temp_high"]:
+            future[col] = future[col].fillna(fill_from[col].median())
+        else:
+            future[col] = future[col].fillna(0)
+    return future
+
+
 def fit_and_forecast(
     df: pd.DataFrame,
     future_resos: pd.DataFrame,
@@ -730,13 +1282,28 @@ def fit_and_forecast(
     forecast_days: int = FORECAST_DAYS,
     historical_weather: Optional[pd.DataFrame] = None,
     forecast_weather: Optional[pd.DataFrame] = None,
+    registry: Optional[ModelRegistry] = None,
+    venue_id: Optional[str] = None,
+    interval_mode: str = INTERVAL_MODE,
+    timer: Optional[StageTimer] = None,
 ) -> Tuple[pd.DataFrame, int]:
     """
     Fit Prophet + optional reso adjustment + optional weather regressors.
     Model behavior controlled by config (from model_router).
 
+    With a registry, a recent compatible model for venue_id is re-predicted
+    without refitting; otherwise the fit is warm-started from the stored
+    parameters and the new model is saved back.
+
+    interval_mode="fast" predicts only the forecast_days after the training
+    end, with residual-quantile intervals (see predict_prophet); "exact"
+    predicts history + horizon with Prophet's sampled intervals.
+
+    timer records the registry load, fit and predict stages.
+
     Returns: (forecast_df, training_days)
     """
+    timer = timer or StageTimer()
     weather_mode = config.use_weather
     weather_cols = _get_weather_columns(weather_mode)
     has_weather = (weather_mode != "off"
@@ -771,58 +1338,74 @@ def fit_and_forecast(
         raise ValueError(f"Insufficient history: {training_days} days (need >= {TIER_C_MIN})")
 
     # DOW average reservations for elasticity adjustment
-    reso_df = df[["ds", "reso_covers"]].copy()
-    reso_df["ds"] = pd.to_datetime(reso_df["ds"])
-    reso_df["reso_covers"] = pd.to_numeric(reso_df["reso_covers"], errors="coerce").fillna(0)
-    dow_avg_reso = reso_df.groupby(reso_df["ds"].dt.dayofweek)["reso_covers"].mean()
+    dow_avg_reso = dow_avg_resos(df)
 
     # Build and fit (with venue-class-specific hyperparameters)
-    model = build_prophet_model(
-        weather_mode=weather_mode if has_weather else "off",
-        prophet_params=config.prophet_params,
-    )
-    model.fit(prophet_df)
-
-    # Create future dataframe
-    future = model.make_future_dataframe(periods=forecast_days, freq="D")
+    effective_weather = weather_mode if has_weather else "off"
+    train_end = prophet_df["ds"].max()
+    prior_model, prior_meta = (None, None)
+    if registry is not None and venue_id:
+        with timer.stage("registry_load"):
+            prior_model, prior_meta = registry.load(venue_id)
+    signature = {
+        "model_version": MODEL_VERSION,
+        "weather_mode": effective_weather,
+        "prophet_params": dict(config.prophet_params),
+    }
+
+    resid_q = None
+    if prior_model is not None and registry.is_reusable(prior_meta, signature, train_end.date()):
+        model = prior_model
+        resid_q = prior_meta.get("residual_quantiles")
+        print(f"  Reusing model fitted {prior_meta['fitted_on']} "
+              f"(trained to {prior_meta['train_end']}, refit every {registry.refit_days}d)")
+    else:
+        with timer.stage("fit", rows=len(prophet_df)):
+            model = build_prophet_model(
+                weather_mode=effective_weather,
+                prophet_params=config.prophet_params,
+            )
+            if prior_model is not None and prior_meta.get("signature") == signature:
+                model.fit(prophet_df, init=ModelRegistry.warm_start_params(prior_model))
+                warm_started = True
+            else:
+                model.fit(prophet_df)
+                warm_started = False
+            if interval_mode == "fast":
+                resid_q = residual_quantiles(model)
+        if registry is not None and venue_id:
+            with timer.stage("registry_save"):
+                registry.save(venue_id, model, {
+                    "venue_id": venue_id,
+                    "tier": config.tier,
+                    "label": config.label,
+                    "signature": signature,
+                    "train_start": str(prophet_df["ds"].min().date()),
+                    "train_end": str(train_end.date()),
+                    "training_days": training_days,
+                    "fitted_on": str(datetime.now().date()),
+                    "warm_started": warm_started,
+                    "residual_quantiles": resid_q,
+                })
+
+    # Create future dataframe (a reused model's history may end before today's training end)
+    if interval_mode == "fast":
+        future = pd.DataFrame({"ds": pd.date_range(train_end + pd.Timedelta(days=1),
+                                                   periods=forecast_days, freq="D")})
+    else:
+        lag_days = (train_end - model.history["ds"].max()).days
+        future = model.make_future_dataframe(periods=forecast_days + lag_days, freq="D")
 
     # Add weather regressors to future
     if has_weather:
-        all_weather = pd.concat([historical_weather, forecast_weather], ignore_index=True)
-        all_weather = all_weather.drop_duplicates(subset=["ds"], keep="last")
-        merge_cols = ["ds"] + weather_cols
-        future = future.merge(
-            all_weather[merge_cols],
-            on="ds", how="left"
-        )
-        for col in weather_cols:
-            if col in ["temp_high"]:
-                future[col] = future[col].fillna(historical_weather[col].median())
-            else:
-                future[col] = future[col].fillna(0)
+        future = merge_future_weather(future, weather_cols, historical_weather, forecast_weather)
 
-    fc = model.predict(future)
+    with timer.stage("predict", rows=len(future)):
+        fc = predict_prophet(model, future, interval_mode, resid_q)
 
     # Apply learned reservation adjustment (only if config enables it)
     if config.use_reso:
-        future_resos = future_resos.copy()
-        future_resos["ds"] = pd.to_datetime(future_resos["ds"])
-        reso_lookup = dict(zip(future_resos["ds"], future_resos["reso_covers"]))
-
-        adjustments = []
-        for _, row in fc.iterrows():
-            adjustment = 0
-            if row["ds"] in reso_lookup:
-                dow = row["ds"].dayofweek
-                actual_resos = reso_lookup[row["ds"]]
-                avg_resos = dow_avg_reso.get(dow, 0)
-                if avg_resos > 0:
-                    reso_delta = actual_resos - avg_resos
-                    beta = reso_betas.get(dow, 0.0)
-                    adjustment = reso_delta * beta
-            adjustments.append(adjustment)
-
-        fc["reso_adjustment"] = adjustments
+        fc["reso_adjustment"] = reso_adjustment(fc["ds"], future_resos, dow_avg_reso, reso_betas)
         fc["yhat"] = fc["yhat"] + fc["reso_adjustment"]
         fc["yhat_lower"] = fc["yhat_lower"] + fc["reso_adjustment"]
         fc["yhat_upper"] = fc["yhat_upper"] + fc["reso_adjustment"]
@@ -878,76 +1461,98 @@ def compute_avg_check_per_dow(df: pd.DataFrame, window_weeks: int = 10) -> Dict[
     return avg_checks
 
 
-def compute_food_bev_per_cover(supabase: Client, venue_id: str, window_weeks: int = 10) -> Tuple[Dict[int, float], Dict[int, float]]:
+FOOD_BEV_WINDOW_WEEKS = 10
+SUPABASE_PAGE_SIZE = 1000   # PostgREST max rows per response
+
+
+def get_venue_day_facts_bulk(supabase: Client, venue_ids: List[str],
+                             window_weeks: int = FOOD_BEV_WINDOW_WEEKS) -> pd.DataFrame:
     """
-    Compute average food and bev revenue per cover per DOW from venue_day_facts.
-    Returns (food_per_cover_by_dow, bev_per_cover_by_dow).
-    Falls back to a proportional split of total avg_check if no food/bev data.
+    venue_day_facts covers / food / bev sales for all venue_ids over the trailing
+    window in one ranged query (paged by SUPABASE_PAGE_SIZE).
+    Returns DataFrame[venue_id, business_date, covers_count, food_sales, beverage_sales].
     """
+    columns = ["venue_id", "business_date", "covers_count", "food_sales", "beverage_sales"]
     cutoff = (datetime.now() - timedelta(weeks=window_weeks)).strftime("%Y-%m-%d")
+    rows: List[Dict] = []
+    for offset in range(0, 10**7, SUPABASE_PAGE_SIZE):
+        page = supabase.table("venue_day_facts") \
+            .select(", ".join(columns)) \
+            .in_("venue_id", list(venue_ids)) \
+            .gte("business_date", cutoff) \
+            .gt("covers_count", 10) \
+            .order("venue_id").order("business_date") \
+            .range(offset, offset + SUPABASE_PAGE_SIZE - 1) \
+            .execute().data or []
+        rows.extend(page)
+        if len(page) < SUPABASE_PAGE_SIZE:
+            break
+    return pd.DataFrame(rows, columns=columns)
+
+
+def food_bev_per_cover_by_dow(facts: pd.DataFrame) -> Dict[str, Tuple[Dict[int, float], Dict[int, float]]]:
+    """
+    Winsorized mean food and bev revenue per cover per venue x DOW, all venues at once.
+    Per venue x DOW: with more than 4 days, clip to the 5th-95th percentile before
+    averaging; capped at 3x the venue's overall median (floors $200 food, $500 bev).
+    DOWs with fewer than 2 days use the venue median.
+    Venues without bev data (Simphony/Avero) are left out (caller skips the split).
+    """
+    f = facts.copy()
+    for col in ["covers_count", "food_sales", "beverage_sales"]:
+        f[col] = pd.to_numeric(f[col], errors="coerce").fillna(0.0)
+    f = f[f["covers_count"] > 0]
+    if f.empty:
+        return {}
+    f["dow"] = pd.to_datetime(f["business_date"]).dt.dayofweek
+    f["food"] = f["food_sales"] / f["covers_count"]
+    f["bev"] = f["beverage_sales"] / f["covers_count"]
+    f = f[f.groupby("venue_id")["beverage_sales"].transform("max") > 0]
+    if f.empty:
+        return {}
+
+    by_venue = f.groupby("venue_id")
+    by_dow = f.groupby(["venue_id", "dow"])
+    n = by_dow["food"].transform("size")
+    out = {}
+    for col, floor in (("food", 200.0), ("bev", 500.0)):
+        median = by_venue[col].median()
+        # Sanity caps: no per-cover amount should exceed 3x the overall median
+        # Catches DOWs with tiny sample sizes and extreme outliers (e.g., Bird Streets Sunday)
+        cap = np.maximum(median * 3, floor)
+        lo, hi = by_dow[col].transform("quantile", 0.05), by_dow[col].transform("quantile", 0.95)
+        vals = f[col].where(n <= 4, f[col].clip(lo, hi))
+        stats = vals.groupby([f["venue_id"], f["dow"]]).agg(["mean", "size"])
+        means = np.minimum(stats["mean"], stats.index.get_level_values("venue_id").map(cap))
+        means = means.where(stats["size"] >= 2).unstack("dow").reindex(columns=range(7))
+        out[col] = means.apply(lambda row: row.fillna(median[row.name]), axis=1)
+
+    return {
+        vid: ({d: float(v) for d, v in out["food"].loc[vid].items()},
+              {d: float(v) for d, v in out["bev"].loc[vid].items()})
+        for vid in out["food"].index
+    }
+
+
+def compute_food_bev_per_cover_bulk(supabase: Client, venue_ids: List[str],
+                                    window_weeks: int = FOOD_BEV_WINDOW_WEEKS
+                                    ) -> Dict[str, Tuple[Dict[int, float], Dict[int, float]]]:
+    """
+    {venue_id: (food_per_cover_by_dow, bev_per_cover_by_dow)} for all venues from
+    one venue_day_facts query; ({}, {}) for venues without food/bev data.
+    """
+    split = food_bev_per_cover_by_dow(get_venue_day_facts_bulk(supabase, venue_ids, window_weeks))
+    return {vid: split.get(vid, ({}, {})) for vid in venue_ids}
 
-    response = supabase.table("venue_day_facts") \
-        .select("business_date, covers_count, food_sales, beverage_sales") \
-        .eq("venue_id", venue_id) \
-        .gte("business_date", cutoff) \
-        .gt("covers_count", 10) \
-        .execute()
-
-    food_by_dow: Dict[int, List[float]] = {}
-    bev_by_dow: Dict[int, List[float]] = {}
-    has_bev_data = False
-
-    for row in response.data or []:
-        covers = float(row["covers_count"] or 0)
-        food = float(row["food_sales"] or 0)
-        bev = float(row["beverage_sales"] or 0)
-        if covers <= 0:
-            continue
-        if bev > 0:
-            has_bev_data = True
-
-        dt = datetime.strptime(row["business_date"], "%Y-%m-%d")
-        dow = dt.weekday()  # 0=Mon
-
-        food_by_dow.setdefault(dow, []).append(food / covers)
-        bev_by_dow.setdefault(dow, []).append(bev / covers)
-
-    if not has_bev_data:
-        # No bev data (Simphony/Avero venues) — return empty, caller will skip
-        return {}, {}
-
-    # Average per DOW with winsorization + sanity cap
-    food_result: Dict[int, float] = {}
-    bev_result: Dict[int, float] = {}
-
-    all_food = [v for vals in food_by_dow.values() for v in vals]
-    all_bev = [v for vals in bev_by_dow.values() for v in vals]
-    food_median = float(np.median(all_food)) if all_food else 0
-    bev_median = float(np.median(all_bev)) if all_bev else 0
-
-    # Sanity caps: no per-cover amount should exceed 3× the overall median
-    # Catches DOWs with tiny sample sizes and extreme outliers (e.g., Bird Streets Sunday)
-    food_cap = max(food_median * 3, 200)   # at least $200 floor
-    bev_cap = max(bev_median * 3, 500)     # at least $500 floor (nightclubs have high bev)
-
-    for dow in range(7):
-        if dow in food_by_dow and len(food_by_dow[dow]) >= 2:
-            vals = np.array(food_by_dow[dow])
-            if len(vals) > 4:
-                vals = np.clip(vals, np.percentile(vals, 5), np.percentile(vals, 95))
-            food_result[dow] = min(float(np.mean(vals)), food_cap)
-        else:
-            food_result[dow] = food_median
-
-        if dow in bev_by_dow and len(bev_by_dow[dow]) >= 2:
-            vals = np.array(bev_by_dow[dow])
-            if len(vals) > 4:
-                vals = np.clip(vals, np.percentile(vals, 5), np.percentile(vals, 95))
-            bev_result[dow] = min(float(np.mean(vals)), bev_cap)
-        else:
-            bev_result[dow] = bev_median
 
-    return food_result, bev_result
+def compute_food_bev_per_cover(supabase: Client, venue_id: str,
+                               window_weeks: int = FOOD_BEV_WINDOW_WEEKS) -> Tuple[Dict[int, float], Dict[int, float]]:
+    """
+    Compute average food and bev revenue per cover per DOW from venue_day_facts.
+    Returns (food_per_cover_by_dow, bev_per_cover_by_dow), both empty without
+    bev data (caller skips the split). Single-venue form of the bulk computation.
+    """
+    return compute_food_bev_per_cover_bulk(supabase, [venue_id], window_weeks)[venue_id]
 
 
 def forecast_revenue(covers_forecast: pd.DataFrame, avg_check_per_dow: Dict[int, float],
@@ -977,6 +1582,68 @@ def forecast_revenue(covers_forecast: pd.DataFrame, avg_check_per_dow: Dict[int,
     return result
 
 
+# ============================================================================
+# GLOBAL (POOLED) BACKEND
+# ============================================================================
+
+def forecast_global(mappings: List[Dict], venue_history: Dict[str, pd.DataFrame],
+                    venue_future_resos: Dict[str, pd.DataFrame],
+                    venue_coords: Dict[str, Dict],
+                    venue_closed_days: Dict[str, List[int]],
+                    venue_anomalies: Dict[str, set],
+                    forecast_days: int = FORECAST_DAYS,
+                    weather_cache: Optional[WeatherCache] = None,
+                    backend: str = FORECAST_BACKEND) -> Dict[str, pd.DataFrame]:
+    """
+    Fit one GlobalModel on every venue with GLOBAL_MIN_DAYS+ of cleaned history
+    (the pool includes Prophet-routed venues in hybrid mode) and score the
+    horizons of the venues model_router sends to the global backend in one
+    predict. Returns {venue_id: covers forecast frame} in fit_and_forecast's shape.
+    """
+    histories, hist_weather, fcast_weather, routed = {}, {}, {}, []
+    yesterday = str((datetime.now() - timedelta(days=1)).date())
+    with redirect_stdout(io.StringIO()):  # per-venue filter logs are printed again by forecast_venue
+        for m in mappings:
+            vid = m["venue_id"]
+            df = venue_history.get(vid)
+            if df is None or df.empty:
+                continue
+            df = filter_closed_days(df, venue_closed_days.get(vid, []))
+            df = filter_anomaly_days(df, venue_anomalies.get(vid, set()))
+            coords = venue_coords.get(vid)
+            pooled = model_router(len(df), m.get("venue_class"), coords is not None, backend="global")
+            if pooled.backend != "global":
+                continue
+            if model_router(len(df), m.get("venue_class"), coords is not None, backend).backend == "global":
+                routed.append(vid)
+            histories[vid] = clean_training_data(df)
+            if pooled.use_weather != "off":
+                hist_weather[vid] = get_historical_weather(
+                    coords["lat"], coords["lon"], coords["tz"],
+                    str(histories[vid]["ds"].min()), yesterday, cache=weather_cache,
+                )
+                fcast_weather[vid] = get_weather_forecast(
+                    coords["lat"], coords["lon"], coords["tz"], min(forecast_days, 14),
+                    cache=weather_cache,
+                )
+
+    if not routed:
+        return {}
+
+    t0 = time.perf_counter()
+    gm = load_backend("global")
+    train = gm.stack_history(histories, hist_weather)
+    model = gm.GlobalModel().fit(train)
+    last_dates = {vid: pd.to_datetime(histories[vid]["ds"]).max() for vid in routed}
+    fc = model.predict(gm.future_frame(last_dates, forecast_days, venue_future_resos, fcast_weather))
+    print(f"[INFO] Global model: pooled {len(model.venues)} venues ({len(train)} days), "
+          f"forecast {fc['venue_id'].nunique()} in {time.perf_counter() - t0:.1f}s")
+
+    fc["business_date"] = fc["ds"].dt.date
+    return {vid: part.drop(columns="venue_id").reset_index(drop=True)
+            for vid, part in fc.groupby("venue_id")}
+
+
 # ============================================================================
 # VENUE MAPPINGS + SAVE
 # ============================================================================
@@ -1006,50 +1673,217 @@ def get_venue_mappings(supabase: Client, venue_id: Optional[str] = None) -> List
     return mappings
 
 
-def save_forecasts(forecasts: list, supabase: Client):
-    """Save forecasts to demand_forecasts table."""
-    if not forecasts:
-        return
-
-    batch_size = 500
+# Columnar per-day forecast rows (one frame per venue, concatenated for saving)
+FORECAST_ROW_COLUMNS = [
+    "venue_id", "business_date",
+    "covers_predicted", "covers_lower", "covers_upper",
+    "revenue_predicted", "food_revenue_predicted", "bev_revenue_predicted",
+    "reso_covers", "weather_high", "weather_precip", "model_version",
+]
+
+
+def _join_on_date(days: np.ndarray, frame: Optional[pd.DataFrame], col: str) -> np.ndarray:
+    """frame[col] aligned to datetime64[D] `days` by frame["ds"] (NaN where absent, last row wins)."""
+    if frame is None or frame.empty:
+        return np.full(len(days), np.nan)
+    keys = np.asarray(frame["ds"].to_numpy(), dtype="datetime64[D]")
+    values = frame[col].to_numpy(dtype=float)
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    pos = np.searchsorted(keys, days, side="right") - 1
+    hit = (pos >= 0) & (keys[pos.clip(0)] == days)
+    return np.where(hit, values[pos.clip(0)], np.nan)
+
+
+def assemble_forecast_rows(fc: pd.DataFrame, venue_id: str,
+                           future_resos: Optional[pd.DataFrame] = None,
+                           forecast_weather: Optional[pd.DataFrame] = None,
+                           has_fb_split: bool = False,
+                           model_version: str = MODEL_VERSION) -> pd.DataFrame:
+    """
+    Build FORECAST_ROW_COLUMNS for one venue from a revenue-split forecast frame
+    with column ops only: reso covers and weather are joined by business date.
+    """
+    days = fc["ds"].to_numpy().astype("datetime64[D]")
+    nan = np.full(len(days), np.nan)
+    food = bev = nan
+    if has_fb_split:
+        food = pd.to_numeric(fc["food_revenue"], errors="coerce").to_numpy(dtype=float).round(2)
+        bev = pd.to_numeric(fc["bev_revenue"], errors="coerce").to_numpy(dtype=float).round(2)
+        bev = np.where(np.isnan(food), np.nan, bev)
+    reso = _join_on_date(days, future_resos, "reso_covers")
+
+    return pd.DataFrame({
+        "venue_id": venue_id,
+        "business_date": np.datetime_as_string(days, unit="D"),
+        "covers_predicted": fc["yhat"].to_numpy().astype(int),
+        "covers_lower": fc["yhat_lower"].to_numpy().astype(int),
+        "covers_upper": fc["yhat_upper"].to_numpy().astype(int),
+        "revenue_predicted": pd.to_numeric(fc["revenue"], errors="coerce").to_numpy(dtype=float).round(2),
+        "food_revenue_predicted": food,
+        "bev_revenue_predicted": bev,
+        "reso_covers": np.nan_to_num(reso, nan=0).astype(int),
+        "weather_high": _join_on_date(days, forecast_weather, "temp_high"),
+        "weather_precip": _join_on_date(days, forecast_weather, "precip_inch"),
+        "model_version": model_version,
+    }, columns=FORECAST_ROW_COLUMNS)
+
+
+def has_weather(rows: pd.DataFrame) -> pd.Series:
+    """Rows with forecast weather attached."""
+    return rows["weather_high"].notna() | rows["weather_precip"].notna()
+
+
+def confidence_levels(covers_pred: np.ndarray, covers_lower: np.ndarray,
+                      covers_upper: np.ndarray) -> np.ndarray:
+    """Confidence from interval width, in [0.5, 0.95] (0.5 for zero-cover days)."""
+    interval_width = covers_upper - covers_lower
+    return np.where(
+        covers_pred > 0,
+        np.clip(1 - (interval_width / np.maximum(covers_pred, 1) / 2), 0.5, 0.95),
+        0.5,
+    ).round(3)
+
+
+# demand_forecasts columns written by save_forecasts (and nowcast.py)
+FORECAST_RECORD_COLUMNS = [
+    "venue_id", "forecast_date", "business_date", "shift_type", "day_type",
+    "covers_predicted", "covers_lower", "covers_upper", "confidence_level",
+    "revenue_predicted", "food_revenue_predicted", "bev_revenue_predicted",
+    "reservation_covers_predicted", "walkin_covers_predicted",
+    "model_version", "model_accuracy", "weather_forecast", "events",
+]
+
+
+def forecast_records(forecasts: pd.DataFrame) -> pd.DataFrame:
+    """demand_forecasts rows for a FORECAST_ROW_COLUMNS frame, built column-wise."""
     today = str(datetime.now().date())
-    demand_records = []
-
-    for f in forecasts:
-        covers_pred = int(f.get("covers_predicted", 0))
-        covers_lower = int(f.get("covers_lower", 0))
-        covers_upper = int(f.get("covers_upper", 0))
-        reso_covers = f.get("reso_covers", 0) or 0
-        walkin_pred = max(0, covers_pred - reso_covers) if reso_covers else covers_pred
+    f = forecasts.reset_index(drop=True)
+
+    covers_pred = f["covers_predicted"].astype(int).to_numpy()
+    covers_lower = f["covers_lower"].astype(int).to_numpy()
+    covers_upper = f["covers_upper"].astype(int).to_numpy()
+    reso_covers = f["reso_covers"].fillna(0).astype(int).to_numpy()
+    walkin_pred = np.where(reso_covers > 0, np.maximum(0, covers_pred - reso_covers), covers_pred)
+
+    confidence = confidence_levels(covers_pred, covers_lower, covers_upper)
+
+    # Weather JSON is the only per-row Python work, done once at the DB boundary
+    weather_json = [
+        json.dumps({"high": None if pd.isna(h) else h, "precip": None if pd.isna(p) else p})
+        if attached else None
+        for attached, h, p in zip(has_weather(f), f["weather_high"], f["weather_precip"])
+    ]
+
+    out = pd.DataFrame({
+        "venue_id": f["venue_id"],
+        "forecast_date": today,
+        "business_date": f["business_date"],
+        "shift_type": "dinner",
+        "day_type": get_day_types(f["business_date"]),
+        "covers_predicted": covers_pred,
+        "covers_lower": covers_lower,
+        "covers_upper": covers_upper,
+        "confidence_level": confidence,
+        "revenue_predicted": f["revenue_predicted"],
+        "food_revenue_predicted": f["food_revenue_predicted"],
+        "bev_revenue_predicted": f["bev_revenue_predicted"],
+        "reservation_covers_predicted": np.where(reso_covers > 0, reso_covers, np.nan),
+        "walkin_covers_predicted": walkin_pred,
+        "model_version": f["model_version"].fillna(MODEL_VERSION),
+        "model_accuracy": np.nan,
+        "weather_forecast": weather_json,
+        "events": None,
+    }, columns=FORECAST_RECORD_COLUMNS)
+    out["reservation_covers_predicted"] = out["reservation_covers_predicted"].astype("Int64")
+    return out
+
+
+def latest_vintage_rest(supabase: Client, records: pd.DataFrame) -> pd.DataFrame:
+    """
+    forecast_store.latest_vintage over PostgREST (demand_forecasts_latest view,
+    paged by SUPABASE_PAGE_SIZE), for full saves without a Postgres connection.
+    """
+    columns = ROW_KEY + COVERS_COLUMNS + REVENUE_COLUMNS + ["model_version", "forecast_date"]
+    rows: List[Dict] = []
+    for offset in range(0, 10**7, SUPABASE_PAGE_SIZE):
+        page = supabase.table("demand_forecasts_latest") \
+            .select(", ".join(columns)) \
+            .in_("venue_id", sorted(records["venue_id"].unique().tolist())) \
+            .gte("business_date", records["business_date"].min()) \
+            .lte("business_date", records["business_date"].max()) \
+            .order("venue_id").order("business_date").order("shift_type") \
+            .range(offset, offset + SUPABASE_PAGE_SIZE - 1) \
+            .execute().data or []
+        rows.extend(page)
+        if len(page) < SUPABASE_PAGE_SIZE:
+            break
+    prev = pd.DataFrame(rows, columns=columns)
+    for col in COVERS_COLUMNS + REVENUE_COLUMNS:
+        prev[col] = pd.to_numeric(prev[col], errors="coerce")
+    return prev
+
+
+def publish_changes_rest(supabase: Client, written: pd.DataFrame, prev: pd.DataFrame,
+                         batch_size: int = 500) -> int:
+    """Append the diff of written rows vs prev to forecast_changes over PostgREST. Returns rows appended."""
+    changes = forecast_changes(written, prev)
+    columns = {c: changes[c].astype(object).where(changes[c].notna(), None).tolist() for c in changes.columns}
+    change_rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    for i in range(0, len(change_rows), batch_size):
+        supabase.table("forecast_changes").insert(change_rows[i:i + batch_size]).execute()
+    return len(change_rows)
+
+
+def save_forecasts(forecasts: pd.DataFrame, supabase: Client, save_mode: str = SAVE_MODE,
+                   conn=None, intraday_curves: Optional[pd.DataFrame] = None) -> int:
+    """
+    Save forecasts (FORECAST_ROW_COLUMNS frame) to demand_forecasts table.
+    save_mode="delta" writes only rows that moved since the latest stored
+    vintage, via COPY + merge (falls back to "full" without a Postgres DSN).
+    Both modes publish the rows that moved to forecast_changes; in full mode
+    a failed publish only logs an error, the forecasts stay saved.
+    conn: an open forecast DB connection to reuse (streaming mode saves once
+    per venue); without one a connection is opened and closed here.
+    intraday_curves: split every written row into demand_forecasts_hourly too.
+    Returns the number of rows written.
+    """
+    if forecasts is None or forecasts.empty:
+        return 0
 
-        # Confidence from interval width
-        interval_width = covers_upper - covers_lower
-        confidence = max(0.5, min(0.95, 1 - (interval_width / max(covers_pred, 1) / 2))) if covers_pred > 0 else 0.5
+    out = forecast_records(forecasts)
 
-        weather_json = None
-        if f.get("weather"):
-            weather_json = json.dumps(f["weather"]) if isinstance(f["weather"], dict) else f["weather"]
+    if save_mode == "delta":
+        own_conn = conn is None
+        if own_conn:
+            conn = get_forecast_db_conn()
+        if conn is None:
+            print("[WARN] DATABASE_URL / SUPABASE_DB_PASSWORD not set, saving every row via PostgREST")
+        else:
+            try:
+                written, total = save_delta(out, conn)
+                hourly = hourly_records(written, intraday_curves)
+                if not hourly.empty:
+                    copy_merge(conn, hourly, "demand_forecasts_hourly", HOURLY_CONFLICT_KEY)
+            finally:
+                if own_conn:
+                    conn.close()
+            print(f"[OK] Saved {len(written)} of {total} forecasts to demand_forecasts "
+                  f"({total - len(written)} unchanged within tolerance, COPY + merge)"
+                  + (f", {len(hourly)} hourly rows" if not hourly.empty else ""))
+            return len(written)
+
+    # Diff against the stored vintage before it is overwritten, for forecast_changes
+    try:
+        prev = latest_vintage_rest(supabase, out)
+    except Exception as e:
+        prev = None
+        print(f"[ERROR] Could not read the stored forecast vintage, forecast_changes will miss this save: {e}")
 
-        demand_records.append({
-            "venue_id": f["venue_id"],
-            "forecast_date": today,
-            "business_date": f["business_date"],
-            "shift_type": "dinner",
-            "day_type": get_day_type(str(f["business_date"])),
-            "covers_predicted": covers_pred,
-            "covers_lower": covers_lower,
-            "covers_upper": covers_upper,
-            "confidence_level": round(confidence, 3),
-            "revenue_predicted": f.get("revenue_predicted"),
-            "food_revenue_predicted": f.get("food_revenue_predicted"),
-            "bev_revenue_predicted": f.get("bev_revenue_predicted"),
-            "reservation_covers_predicted": reso_covers if reso_covers else None,
-            "walkin_covers_predicted": walkin_pred,
-            "model_version": MODEL_VERSION,
-            "model_accuracy": None,
-            "weather_forecast": weather_json,
-            "events": None,
-        })
+    # Native Python values with NaN -> None for JSON, built column-wise
+    batch_size = 500
+    columns = {c: out[c].astype(object).where(out[c].notna(), None).tolist() for c in out.columns}
+    demand_records = [dict(zip(columns, values)) for values in zip(*columns.values())]
 
     for i in range(0, len(demand_records), batch_size):
         batch = demand_records[i:i + batch_size]
@@ -1058,301 +1892,799 @@ def save_forecasts(forecasts: list, supabase: Client):
             on_conflict="venue_id,forecast_date,business_date,shift_type"
         ).execute()
 
-    print(f"[OK] Saved {len(demand_records)} forecasts to demand_forecasts")
-
+    hourly = hourly_records(out, intraday_curves)
+    if not hourly.empty:
+        columns = {c: hourly[c].astype(object).where(hourly[c].notna(), None).tolist() for c in hourly.columns}
+        hourly_rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        for i in range(0, len(hourly_rows), batch_size):
+            supabase.table("demand_forecasts_hourly").upsert(
+                hourly_rows[i:i + batch_size],
+                on_conflict="venue_id,forecast_date,business_date,hour"
+            ).execute()
+
+    published = None
+    if prev is not None:
+        try:
+            published = publish_changes_rest(supabase, out[changed_rows(out, prev)], prev)
+        except Exception as e:
+            print(f"[ERROR] forecast_changes not written for {len(demand_records)} saved forecasts "
+                  f"(daily_review will not see these moves): {e}")
 
-# ============================================================================
-# MAIN FORECASTER
-# ============================================================================
+    print(f"[OK] Saved {len(demand_records)} forecasts to demand_forecasts"
+          + (f", {len(hourly)} hourly rows" if not hourly.empty else "")
+          + (f", {published} forecast_changes" if published is not None else ""))
+    return len(demand_records)
 
-def run_forecaster(venue_id: Optional[str] = None, forecast_days: int = FORECAST_DAYS, dry_run: bool = False):
-    """Main forecaster with tier-based model routing."""
-    print("\n" + "=" * 70)
-    print(f"PROPHET FORECASTER v4 ({MODEL_VERSION})")
-    print(f"Tier-gated: A(80+d) B(45+d) C(30+d) D(<30d)")
-    print(f"Forecast horizon: {forecast_days} days")
-    print("=" * 70 + "\n")
 
-    supabase = get_supabase()
-    tipsee_conn = get_tipsee_conn()
+def save_reso_params(results: List[Dict], supabase: Client):
+    """
+    Upsert the reso betas and DOW average resos behind each saved venue's
+    adjustment into forecast_reso_params (one row per venue, latest run wins).
+    Venues without a reso adjustment (Tier C/D, global backend) get null
+    params, so nowcast.py never re-applies a stale one.
+    """
+    today = str(datetime.now().date())
+    rows = []
+    for r in results:
+        if r["status"] != "ok":
+            continue
+        params = r.get("reso_params")
+        rows.append({
+            "venue_id": r["venue_id"],
+            "forecast_date": today,
+            "model_version": MODEL_VERSION,
+            "reso_betas": {str(d): b for d, b in params["reso_betas"].items()} if params else None,
+            "dow_avg_resos": {str(d): a for d, a in params["dow_avg_resos"].items()} if params else None,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        })
+    if not rows:
+        return
+    try:
+        supabase.table("forecast_reso_params").upsert(rows, on_conflict="venue_id").execute()
+    except Exception as e:
+        print(f"[WARN] Could not save reso params for the nowcast: {e}")
 
-    venue_coords = get_venue_coords(supabase)
-    print(f"[INFO] Venues with coordinates: {len(venue_coords)}")
 
-    venue_closed_days = get_venue_closed_days(supabase)
-    print(f"[INFO] Venues with dark days: {len(venue_closed_days)}")
+# ============================================================================
+# MAIN FORECASTER
+# ============================================================================
 
-    venue_anomalies = get_venue_anomaly_dates(supabase)
-    total_anomaly_days = sum(len(v) for v in venue_anomalies.values())
-    print(f"[INFO] Venues with anomaly flags: {len(venue_anomalies)} ({total_anomaly_days} days total)")
+def _set_forecast_rows(result: Dict, horizon: pd.DataFrame):
+    """Emit horizon rows dated after today into a forecast_venue result."""
+    today_str = str(datetime.now().date())
+    rows = horizon[horizon["business_date"] > today_str].reset_index(drop=True)
+    result["forecasts"] = rows
+    result["weather_total"] = len(rows)
+    result["weather_attached"] = int(has_weather(rows).sum())
 
-    mappings = get_venue_mappings(supabase, venue_id)
-    print(f"[INFO] Venues to forecast: {len(mappings)}")
 
-    if not mappings:
-        print("[ERROR] No venue mappings found")
+def _print_preview(future_fc: pd.DataFrame, heading: str, has_fb_split: bool):
+    """Log the first 7 forecast days of a revenue-split forecast frame."""
+    if future_fc.empty:
         return
+    print(f"  {heading}")
+    for r in future_fc.head(7).to_dict("records"):
+        dow = r["ds"].strftime("%a")
+        rev = f"${r['revenue']:,.0f}" if pd.notna(r["revenue"]) else "?"
+        fb = ""
+        if has_fb_split and pd.notna(r.get("food_revenue")) and int(r['yhat']) > 0:
+            fb = f" (F${r['food_revenue']:,.0f}+B${r['bev_revenue']:,.0f})"
+        print(f"    {dow} {r['ds'].strftime('%m/%d')}: "
+              f"{int(r['yhat'])} covers ({int(r['yhat_lower'])}-{int(r['yhat_upper'])}) "
+              f"rev {rev}{fb}")
+
+
+def forecast_venue(
+    mapping: Dict,
+    tipsee_conn,
+    supabase: Client,
+    venue_coords: Dict[str, Dict],
+    venue_closed_days: Dict[str, List[int]],
+    venue_anomalies: Dict[str, set],
+    forecast_days: int = FORECAST_DAYS,
+    history: Optional[pd.DataFrame] = None,
+    future_resos: Optional[pd.DataFrame] = None,
+    weather_cache: Optional[WeatherCache] = None,
+    model_registry: Optional[ModelRegistry] = None,
+    forecast_memo: Optional[ForecastMemo] = None,
+    reso_cache: Optional[ResoElasticityCache] = None,
+    backend: str = FORECAST_BACKEND,
+    global_fc: Optional[pd.DataFrame] = None,
+    interval_mode: str = INTERVAL_MODE,
+    food_bev: Optional[Tuple[Dict[int, float], Dict[int, float]]] = None,
+) -> Dict:
+    """
+    Run the full pipeline for one venue:
+    history fetch -> clean -> fit_and_forecast -> revenue split.
+
+    history / future_resos may be prefetched by the bulk extractors; when
+    omitted they are queried from TipSee for this venue alone. weather_cache
+    serves Open-Meteo data from disk; model_registry reuses/warm-starts fits;
+    forecast_memo skips Prophet when the venue's inputs are unchanged;
+    reso_cache extends cached elasticity sums instead of re-learning betas.
+    backend is passed to model_router; venues it sends to the global backend
+    use global_fc (from forecast_global) instead of fitting their own model.
+    interval_mode picks fast (residual-quantile) or exact (sampled) Prophet intervals.
+    food_bev is the venue's (food, bev) per-cover split from
+    compute_food_bev_per_cover_bulk; omitted, it is queried for this venue alone.
+
+    Failures are isolated per venue: any exception is logged and the venue
+    is reported as skipped. Returns a result dict with status, tier,
+    forecast rows (FORECAST_ROW_COLUMNS frame), weather coverage counts and
+    per-stage timings (StageTimer.summary()).
+    """
+    vid = mapping["venue_id"]
+    location_uuid = mapping["tipsee_location_uuid"]
+    location_name = mapping["tipsee_location_name"]
+    venue_class = mapping.get("venue_class")
+    coords = venue_coords.get(vid)
+
+    closed_days = venue_closed_days.get(vid, [])
+    timer = StageTimer()
+
+    result = {
+        "venue_id": vid,
+        "status": "skipped",
+        "tier": None,
+        "forecasts": pd.DataFrame(columns=FORECAST_ROW_COLUMNS),
+        "weather_attached": 0,
+        "weather_total": 0,
+        "memo_hit": None,  # None = memo not applicable (disabled / Tier D)
+        "reso_params": None,  # {reso_betas, dow_avg_resos} for reso-tier Prophet venues
+        "timings": None,
+    }
+
+    print(f"\n{'-' * 50}")
+    print(f"[VENUE] {location_name}")
+    print(f"  venue_id: {vid}")
+    if venue_class:
+        print(f"  class: {venue_class}")
+    if coords:
+        print(f"  coords: {coords['lat']}, {coords['lon']} ({coords['tz']})")
+    if closed_days:
+        print(f"  dark days: {', '.join(DOW_NAMES[d] for d in closed_days)}")
 
-    weather_attached = 0
-    weather_total = 0
-    forecasts_to_save = []
-    venues_ok = 0
-    venues_skipped = 0
-    tier_counts = {"A": 0, "A-": 0, "B": 0, "B-": 0, "C": 0, "D": 0}
-
-    for mapping in mappings:
-        vid = mapping["venue_id"]
-        location_uuid = mapping["tipsee_location_uuid"]
-        location_name = mapping["tipsee_location_name"]
-        venue_class = mapping.get("venue_class")
-        coords = venue_coords.get(vid)
-
-        closed_days = venue_closed_days.get(vid, [])
-
-        print(f"\n{'-' * 50}")
-        print(f"[VENUE] {location_name}")
-        print(f"  venue_id: {vid}")
-        if venue_class:
-            print(f"  class: {venue_class}")
-        if coords:
-            print(f"  coords: {coords['lat']}, {coords['lon']} ({coords['tz']})")
+    try:
+        # Detect POS type and get historical data (unless bulk-prefetched)
+        if history is not None:
+            df = history
+        else:
+            with timer.stage("tipsee_history") as st:
+                pos_type = get_pos_type(tipsee_conn, location_uuid) if location_uuid else "upserve"
+                if pos_type == "simphony":
+                    print(f"  POS: Simphony")
+                    df = get_historical_data_simphony(tipsee_conn, location_uuid)
+                else:
+                    df = get_historical_data(tipsee_conn, location_uuid, location_name or "")
+                st["rows"] = len(df)
+        training_days_raw = len(df)
+        if training_days_raw == 0:
+            print(f"  [SKIP] No historical data found for location_uuid={location_uuid} or name={location_name}")
+            return result
+        print(f"  History: {training_days_raw} days ({df['ds'].min()} to {df['ds'].max()})")
+
+        # Filter closed weekdays from training data before tier routing
         if closed_days:
-            day_names = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
-            print(f"  dark days: {', '.join(day_names[d] for d in closed_days)}")
-
-        try:
-            # Detect POS type and get historical data
-            pos_type = get_pos_type(tipsee_conn, location_uuid) if location_uuid else "upserve"
-            if pos_type == "simphony":
-                print(f"  POS: Simphony")
-                df = get_historical_data_simphony(tipsee_conn, location_uuid)
-            else:
-                df = get_historical_data(tipsee_conn, location_uuid, location_name or "")
-            training_days_raw = len(df)
-            if training_days_raw == 0:
-                print(f"  [SKIP] No historical data found for location_uuid={location_uuid} or name={location_name}")
-                venues_skipped += 1
-                continue
-            print(f"  History: {training_days_raw} days ({df['ds'].min()} to {df['ds'].max()})")
-
-            # Filter closed weekdays from training data before tier routing
-            if closed_days:
-                df = filter_closed_days(df, closed_days)
-                if len(df) == 0:
-                    print(f"  [SKIP] No data remaining after dark-day filter")
-                    venues_skipped += 1
-                    continue
-
-            # Filter flagged anomaly days (buyouts, private events)
-            anomaly_dates = venue_anomalies.get(vid, set())
-            if anomaly_dates:
-                df = filter_anomaly_days(df, anomaly_dates)
-
-            # Route to appropriate model tier (using post-filter count)
-            training_days_effective = len(df)
+            df = filter_closed_days(df, closed_days)
+            if len(df) == 0:
+                print(f"  [SKIP] No data remaining after dark-day filter")
+                return result
+
+        # Filter flagged anomaly days (buyouts, private events)
+        anomaly_dates = venue_anomalies.get(vid, set())
+        if anomaly_dates:
+            df = filter_anomaly_days(df, anomaly_dates)
+
+        # Route to appropriate model tier (using post-filter count)
+        training_days_effective = len(df)
+        config = model_router(training_days_effective, venue_class, has_coords=coords is not None,
+                              backend=backend)
+        if config.backend == "global" and global_fc is None:
+            print("  [WARN] No global model forecast for this venue, using per-venue model")
             config = model_router(training_days_effective, venue_class, has_coords=coords is not None)
-            print(f"  -> {config}")
-            pp = config.prophet_params
-            print(f"  Prophet params: cps={pp['changepoint_prior_scale']}, "
-                  f"sps={pp['seasonality_prior_scale']}, "
-                  f"hps={pp['holidays_prior_scale']}, "
-                  f"mode={pp['seasonality_mode']}")
-            tier_counts[config.tier] = tier_counts.get(config.tier, 0) + 1
-
-            # --- Food/bev revenue split (all tiers) ---
-            food_per_cover, bev_per_cover = compute_food_bev_per_cover(supabase, vid)
-            has_fb_split = bool(food_per_cover and bev_per_cover)
-            if has_fb_split:
-                print(f"  Food/bev split by DOW: " + ", ".join(
-                    f"{['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][d]}="
-                    f"F${food_per_cover.get(d, 0):.0f}+B${bev_per_cover.get(d, 0):.0f}"
-                    for d in range(7) if food_per_cover.get(d, 0) + bev_per_cover.get(d, 0) > 0
+        print(f"  -> {config}")
+        pp = config.prophet_params
+        print(f"  Prophet params: cps={pp['changepoint_prior_scale']}, "
+              f"sps={pp['seasonality_prior_scale']}, "
+              f"hps={pp['holidays_prior_scale']}, "
+              f"mode={pp['seasonality_mode']}")
+        result["tier"] = config.tier
+
+        # --- Food/bev revenue split (all tiers) ---
+        if food_bev is None:
+            with timer.stage("food_bev"):
+                food_bev = compute_food_bev_per_cover(supabase, vid)
+        food_per_cover, bev_per_cover = food_bev
+        has_fb_split = bool(food_per_cover and bev_per_cover)
+        if has_fb_split:
+            print(f"  Food/bev split by DOW: " + ", ".join(
+                f"{['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][d]}="
+                f"F${food_per_cover.get(d, 0):.0f}+B${bev_per_cover.get(d, 0):.0f}"
+                for d in range(7) if food_per_cover.get(d, 0) + bev_per_cover.get(d, 0) > 0
+            ))
+        else:
+            print("  Food/bev split: no data (will use total revenue only)")
+
+        # --- GLOBAL: pooled multi-venue model (already scored by forecast_global) ---
+        if config.backend == "global":
+            with timer.stage("revenue", rows=len(global_fc)):
+                df_clean = clean_training_data(df)
+                fc_covers = zero_closed_day_forecasts(global_fc, closed_days)
+                fc_with_revenue = forecast_revenue(fc_covers, compute_avg_check_per_dow(df_clean),
+                                                   food_per_cover if has_fb_split else None,
+                                                   bev_per_cover if has_fb_split else None)
+            fcast_weather = None
+            if config.use_weather != "off" and coords:
+                with timer.stage("weather"):
+                    fcast_weather = get_weather_forecast(
+                        coords["lat"], coords["lon"], coords["tz"], min(forecast_days, 14),
+                        cache=weather_cache,
+                    )
+            if future_resos is None:
+                with timer.stage("tipsee_resos"):
+                    future_resos = get_future_reservations(tipsee_conn, location_uuid, forecast_days)
+
+            future_fc = fc_with_revenue[fc_with_revenue["ds"] > pd.Timestamp.today()]
+            with timer.stage("assemble", rows=len(future_fc)):
+                _set_forecast_rows(result, assemble_forecast_rows(
+                    future_fc, vid, future_resos, fcast_weather, has_fb_split,
+                    model_version=GLOBAL_MODEL_VERSION,
                 ))
-            else:
-                print("  Food/bev split: no data (will use total revenue only)")
+            _print_preview(future_fc, "Next 7 days (global model):", has_fb_split)
 
-            # --- TIER D: Naive fallback ---
-            if not config.use_prophet:
+            result["status"] = "ok"
+            return result
+
+        # --- TIER D: Naive fallback ---
+        if not config.use_prophet:
+            with timer.stage("naive_fit", rows=len(df)):
                 fc_covers = naive_dow_forecast(df, forecast_days)
                 fc_covers = zero_closed_day_forecasts(fc_covers, closed_days)
+            with timer.stage("revenue", rows=len(fc_covers)):
                 avg_checks = compute_avg_check_per_dow(df)
                 fc_with_revenue = forecast_revenue(fc_covers, avg_checks,
                                                    food_per_cover if has_fb_split else None,
                                                    bev_per_cover if has_fb_split else None)
 
-                future_fc = fc_with_revenue[fc_with_revenue["ds"] > pd.Timestamp.today()]
-                for _, row in future_fc.iterrows():
-                    bdate = str(row["business_date"])
-                    weather_total += 1
-                    rec = {
-                        "venue_id": vid,
-                        "business_date": bdate,
-                        "covers_predicted": int(row["yhat"]),
-                        "covers_lower": int(row["yhat_lower"]),
-                        "covers_upper": int(row["yhat_upper"]),
-                        "revenue_predicted": round(float(row["revenue"]), 2),
-                        "reso_covers": 0,
-                        "weather": None,
-                    }
-                    if has_fb_split and pd.notna(row.get("food_revenue")):
-                        rec["food_revenue_predicted"] = round(float(row["food_revenue"]), 2)
-                        rec["bev_revenue_predicted"] = round(float(row["bev_revenue"]), 2)
-                    forecasts_to_save.append(rec)
-
-                if not future_fc.empty:
-                    print(f"  Next 7 days (naive DOW avg):")
-                    for _, r in future_fc.head(7).iterrows():
-                        dow = r["ds"].strftime("%a")
-                        rev = f"${r['revenue']:,.0f}" if pd.notna(r["revenue"]) else "?"
-                        print(f"    {dow} {r['ds'].strftime('%m/%d')}: "
-                              f"{int(r['yhat'])} covers ({int(r['yhat_lower'])}-{int(r['yhat_upper'])}) "
-                              f"rev {rev}")
-
-                venues_ok += 1
-                continue
-
-            # --- TIERS A/B/C: Prophet-based ---
+            future_fc = fc_with_revenue[fc_with_revenue["ds"] > pd.Timestamp.today()]
+            with timer.stage("assemble", rows=len(future_fc)):
+                _set_forecast_rows(result, assemble_forecast_rows(future_fc, vid, has_fb_split=has_fb_split))
+            _print_preview(future_fc, "Next 7 days (naive DOW avg):", has_fb_split)
 
-            # Clean training data (Tiers A/B/C all get outlier removal)
-            df_clean = clean_training_data(df) if config.use_outlier_removal else df
+            result["status"] = "ok"
+            return result
 
-            # Learn reso elasticity (Tiers A/B only)
-            reso_betas = {}
-            if config.use_reso:
-                reso_betas = learn_reso_elasticity(df_clean)
-                active_betas = {k: v for k, v in reso_betas.items() if v > 0}
-                print(f"  Learned reso betas: {active_betas}")
+        # --- TIERS A/B/C: Prophet-based ---
 
-            # Get future reservations
-            future_resos = get_future_reservations(tipsee_conn, location_uuid, forecast_days)
-            print(f"  Future resos: {len(future_resos)} days with bookings")
+        # Clean training data (Tiers A/B/C all get outlier removal)
+        with timer.stage("clean", rows=len(df)):
+            df_clean = clean_training_data(df) if config.use_outlier_removal else df
 
-            # Get weather if tier needs it (A or B, not C)
-            hist_weather = None
-            fcast_weather = None
-            if config.use_weather != "off" and coords:
-                start_date = str(df_clean["ds"].min())
-                end_date = str((datetime.now() - timedelta(days=1)).date())
-                print(f"  Fetching weather ({start_date} to {end_date})...")
+        # Learn reso elasticity (Tiers A/B only)
+        reso_betas = {}
+        if config.use_reso:
+            with timer.stage("reso_elasticity", rows=len(df_clean)):
+                if reso_cache is not None:
+                    reso_betas = reso_cache.betas(vid, df, df_clean, {
+                        "closed_days": sorted(closed_days),
+                        "anomaly_dates": sorted(anomaly_dates),
+                    })
+                else:
+                    reso_betas = learn_reso_elasticity(df_clean)
+            active_betas = {k: v for k, v in reso_betas.items() if v > 0}
+            print(f"  Learned reso betas: {active_betas}")
+            # Persisted with the forecast so nowcast.py can re-apply the adjustment intraday
+            result["reso_params"] = {
+                "reso_betas": reso_betas,
+                "dow_avg_resos": {int(d): round(float(v), 3) for d, v in dow_avg_resos(df_clean).items()},
+            }
+
+        # Get future reservations (unless bulk-prefetched)
+        if future_resos is None:
+            with timer.stage("tipsee_resos"):
+                future_resos = get_future_reservations(tipsee_conn, location_uuid, forecast_days)
+        print(f"  Future resos: {len(future_resos)} days with bookings")
+
+        # Get weather if tier needs it (A or B, not C)
+        hist_weather = None
+        fcast_weather = None
+        if config.use_weather != "off" and coords:
+            start_date = str(df_clean["ds"].min())
+            end_date = str((datetime.now() - timedelta(days=1)).date())
+            print(f"  Fetching weather ({start_date} to {end_date})...")
+            with timer.stage("weather") as st:
                 hist_weather = get_historical_weather(
-                    coords["lat"], coords["lon"], coords["tz"], start_date, end_date
+                    coords["lat"], coords["lon"], coords["tz"], start_date, end_date,
+                    cache=weather_cache,
                 )
-                if hist_weather is not None:
-                    print(f"  Historical weather: {len(hist_weather)} days")
-
                 fcast_weather = get_weather_forecast(
-                    coords["lat"], coords["lon"], coords["tz"], min(forecast_days, 14)
+                    coords["lat"], coords["lon"], coords["tz"], min(forecast_days, 14),
+                    cache=weather_cache,
                 )
-                if fcast_weather is not None:
-                    print(f"  Forecast weather: {len(fcast_weather)} days")
-
-            print(f"  Weather mode: {config.use_weather}")
-
-            # Fit covers model
-            print("  Training covers model...")
-            fc_covers, training_days = fit_and_forecast(
-                df_clean, future_resos, reso_betas, config, forecast_days,
-                historical_weather=hist_weather,
-                forecast_weather=fcast_weather,
-            )
+                st["rows"] = sum(len(w) for w in (hist_weather, fcast_weather) if w is not None)
+            if hist_weather is not None:
+                print(f"  Historical weather: {len(hist_weather)} days")
+            if fcast_weather is not None:
+                print(f"  Forecast weather: {len(fcast_weather)} days")
+
+        print(f"  Weather mode: {config.use_weather}")
+
+        # Fingerprint everything the model sees; unchanged inputs -> reuse last forecast
+        fingerprint = None
+        if forecast_memo is not None:
+            used_hist_weather = hist_weather
+            if hist_weather is not None:
+                used_hist_weather = hist_weather[hist_weather["ds"].isin(pd.to_datetime(df_clean["ds"]))]
+            with timer.stage("memo_lookup"):
+                fingerprint = venue_fingerprint(
+                    {
+                        "training": df_clean,
+                        "future_resos": future_resos,
+                        "hist_weather": used_hist_weather,
+                        "fcast_weather": fcast_weather,
+                    },
+                    {
+                        "model_version": MODEL_VERSION,
+                        "row_columns": FORECAST_ROW_COLUMNS,
+                        "config": vars(config),
+                        "interval_mode": interval_mode,
+                        "forecast_days": forecast_days,
+                        "closed_days": sorted(closed_days),
+                        "anomaly_dates": sorted(anomaly_dates),
+                        "food_per_cover": food_per_cover,
+                        "bev_per_cover": bev_per_cover,
+                    },
+                )
+                memo = forecast_memo.get(vid, fingerprint)
+            if memo is not None:
+                horizon = pd.DataFrame(memo["records"], columns=FORECAST_ROW_COLUMNS)
+                _set_forecast_rows(result, horizon)
+                result["memo_hit"] = True
+                result["status"] = "ok"
+                print(f"  Inputs unchanged since {memo['computed_at']}: reusing stored forecast "
+                      f"({len(result['forecasts'])} days, Prophet skipped)")
+                return result
+            result["memo_hit"] = False
+
+        # First Prophet venue in this process pays the Prophet/cmdstan import here
+        if not is_loaded(config.backend):
+            with timer.stage(f"load_{config.backend}"):
+                load_backend(config.backend)
+
+        # Fit covers model
+        print("  Training covers model...")
+        fc_covers, training_days = fit_and_forecast(
+            df_clean, future_resos, reso_betas, config, forecast_days,
+            historical_weather=hist_weather,
+            forecast_weather=fcast_weather,
+            registry=model_registry,
+            venue_id=vid,
+            interval_mode=interval_mode,
+            timer=timer,
+        )
 
-            # Revenue = covers x avg check (with food/bev split)
+        # Revenue = covers x avg check (with food/bev split)
+        with timer.stage("revenue", rows=len(fc_covers)):
             avg_checks = compute_avg_check_per_dow(df_clean)
-            print(f"  Avg check by DOW: " + ", ".join(
-                f"{['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][d]}=${v:.0f}"
-                for d, v in sorted(avg_checks.items()) if v > 0
-            ))
             fc_with_revenue = forecast_revenue(fc_covers, avg_checks,
                                                food_per_cover if has_fb_split else None,
                                                bev_per_cover if has_fb_split else None)
 
             # Zero out closed weekdays in forecast output
             fc_with_revenue = zero_closed_day_forecasts(fc_with_revenue, closed_days)
+        print(f"  Avg check by DOW: " + ", ".join(
+            f"{['Mon','Tue','Wed','Thu','Fri','Sat','Sun'][d]}=${v:.0f}"
+            for d, v in sorted(avg_checks.items()) if v > 0
+        ))
+
+        # Collect forecasts for the whole horizon (memoized as-is), emit dates after today
+        train_end = pd.to_datetime(df_clean["ds"]).max()
+        horizon_fc = fc_with_revenue[fc_with_revenue["ds"] > train_end]
+        with timer.stage("assemble", rows=len(horizon_fc)):
+            horizon = assemble_forecast_rows(horizon_fc, vid, future_resos, fcast_weather, has_fb_split)
+            _set_forecast_rows(result, horizon)
+            if fingerprint is not None:
+                forecast_memo.put(vid, fingerprint, horizon.to_dict("records"))
+
+        # Preview
+        future_fc = fc_with_revenue[fc_with_revenue["ds"] > pd.Timestamp.today()]
+        _print_preview(future_fc, "Next 7 days forecast:", has_fb_split)
+
+        result["status"] = "ok"
+        return result
+
+    except Exception as e:
+        print(f"  [SKIP] {e}")
+        import traceback
+        traceback.print_exc(file=sys.stdout)
+        result["forecasts"] = pd.DataFrame(columns=FORECAST_ROW_COLUMNS)
+        return result
+
+    finally:
+        result["timings"] = timer.summary()
 
-            # Build reso lookup for metadata
-            reso_lookup = {}
-            if not future_resos.empty:
-                for _, r in future_resos.iterrows():
-                    key = str(r["ds"].date() if hasattr(r["ds"], "date") else r["ds"])
-                    reso_lookup[key] = int(r["reso_covers"])
-
-            # Build weather lookup for metadata
-            weather_lookup = {}
-            if fcast_weather is not None and not fcast_weather.empty:
-                for _, w in fcast_weather.iterrows():
-                    key = str(w["ds"].date() if hasattr(w["ds"], "date") else w["ds"])
-                    weather_lookup[key] = {
-                        "high": w["temp_high"],
-                        "precip": w["precip_inch"],
-                    }
-
-            # Collect forecasts
-            future_fc = fc_with_revenue[fc_with_revenue["ds"] > pd.Timestamp.today()]
-            for _, row in future_fc.iterrows():
-                bdate = str(row["business_date"])
-                weather_total += 1
-                if bdate in weather_lookup:
-                    weather_attached += 1
-
-                rec = {
-                    "venue_id": vid,
-                    "business_date": bdate,
-                    "covers_predicted": int(row["yhat"]),
-                    "covers_lower": int(row["yhat_lower"]),
-                    "covers_upper": int(row["yhat_upper"]),
-                    "revenue_predicted": round(float(row["revenue"]), 2),
-                    "reso_covers": reso_lookup.get(bdate, 0),
-                    "weather": weather_lookup.get(bdate),
-                }
-                if has_fb_split and pd.notna(row.get("food_revenue")):
-                    rec["food_revenue_predicted"] = round(float(row["food_revenue"]), 2)
-                    rec["bev_revenue_predicted"] = round(float(row["bev_revenue"]), 2)
-                forecasts_to_save.append(rec)
-
-            # Preview
-            if not future_fc.empty:
-                print(f"  Next 7 days forecast:")
-                for _, r in future_fc.head(7).iterrows():
-                    dow = r["ds"].strftime("%a")
-                    rev = f"${r['revenue']:,.0f}" if pd.notna(r["revenue"]) else "?"
-                    fb = ""
-                    if has_fb_split and pd.notna(r.get("food_revenue")) and int(r['yhat']) > 0:
-                        fb = f" (F${r['food_revenue']:,.0f}+B${r['bev_revenue']:,.0f})"
-                    print(f"    {dow} {r['ds'].strftime('%m/%d')}: "
-                          f"{int(r['yhat'])} covers ({int(r['yhat_lower'])}-{int(r['yhat_upper'])}) "
-                          f"rev {rev}{fb}")
-
-            venues_ok += 1
 
+def flush_venue_result(result: Dict, supabase: Client, save_mode: str = SAVE_MODE,
+                       dry_run: bool = False, conn=None,
+                       intraday_curves: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Streaming mode: save one venue's forecast rows as soon as it finishes,
+    then drop them from the result so only counts are kept for the run summary.
+    A failed save marks the venue "save_failed" instead of aborting the run.
+    Sets result["forecast_rows"] and result["rows_written"]; returns result.
+    """
+    rows = result["forecasts"]
+    result["forecast_rows"] = len(rows)
+    result["rows_written"] = 0
+    if result["status"] == "ok" and not rows.empty and not dry_run:
+        timer = StageTimer()
+        try:
+            with timer.stage("upsert", rows=len(rows)):
+                result["rows_written"] = save_forecasts(rows, supabase, save_mode, conn, intraday_curves)
+                save_reso_params([result], supabase)
         except Exception as e:
-            print(f"  [SKIP] {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"  [SKIP] Save failed, venue not written: {e}")
+            result["status"] = "save_failed"
+        if result.get("timings"):
+            result["timings"]["stages"].extend(timer.stages)
+    result["forecasts"] = pd.DataFrame(columns=FORECAST_ROW_COLUMNS)
+    # Prophet/Stan objects sit in reference cycles; free them before the next venue
+    gc.collect()
+    return result
+
+
+# ----------------------------------------------------------------------------
+# Process-pool workers: each worker process holds its own TipSee connection
+# and Supabase client, opened once by the pool initializer.
+# ----------------------------------------------------------------------------
+
+_worker_state: Dict = {}
+
+
+def _init_venue_worker():
+    """Pool initializer: open per-process DB connections."""
+    _worker_state["tipsee_conn"] = get_tipsee_conn()
+    _worker_state["supabase"] = get_supabase()
+
+
+def _forecast_venue_worker(mapping: Dict, shared: Dict, prefetched: Dict,
+                           stream: Optional[Dict] = None) -> Dict:
+    """
+    Run forecast_venue in a worker, capturing its log so the parent can print it in order.
+    stream ({save_mode, dry_run, intraday_curves, manifest}): save the venue from the worker
+    (flush_venue_result) and checkpoint it, so only counts travel back to the parent.
+    """
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        result = forecast_venue(
+            mapping, _worker_state["tipsee_conn"], _worker_state["supabase"],
+            **shared, **prefetched
+        )
+        if stream is not None:
+            if stream["save_mode"] == "delta" and "forecast_conn" not in _worker_state:
+                _worker_state["forecast_conn"] = get_forecast_db_conn()
+            flush_venue_result(result, _worker_state["supabase"], stream["save_mode"],
+                               stream["dry_run"], _worker_state.get("forecast_conn"),
+                               stream.get("intraday_curves"))
+            if stream.get("manifest"):
+                RunManifest(_worker_state["supabase"], *stream["manifest"]).checkpoint([result])
+    result["log"] = buf.getvalue()
+    return result
+
+
+def run_venues_parallel(mappings: List[Dict], shared: Dict, prefetched: Dict[str, Dict],
+                        workers: int, stream: Optional[Dict] = None) -> List[Dict]:
+    """
+    Fan venue pipelines out to a process pool.
+    prefetched holds each venue's bulk-loaded inputs, keyed by venue_id.
+    stream makes each worker save its venue as soon as it finishes.
+    Results are returned in mapping order; a crashed worker only skips its venue.
+    """
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_venue_worker) as pool:
+        futures = [pool.submit(_forecast_venue_worker, m, shared, prefetched[m["venue_id"]], stream)
+                   for m in mappings]
+        for mapping, future in zip(mappings, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "venue_id": mapping["venue_id"],
+                    "status": "skipped",
+                    "tier": None,
+                    "forecasts": pd.DataFrame(columns=FORECAST_ROW_COLUMNS),
+                    "weather_attached": 0,
+                    "weather_total": 0,
+                    "memo_hit": None,
+                    "reso_params": None,
+                    "timings": None,
+                    "log": f"\n{'-' * 50}\n[VENUE] {mapping['tipsee_location_name']}\n"
+                           f"  [SKIP] worker failed: {e}\n",
+                }
+            print(result.pop("log", ""), end="")
+            results.append(result)
+    return results
+
+
+def run_forecaster(venue_id: Optional[str] = None, forecast_days: int = FORECAST_DAYS,
+                   dry_run: bool = False, workers: int = 1, use_cache: bool = True,
+                   full_history: bool = False, force_refit: bool = False,
+                   backend: str = FORECAST_BACKEND, interval_mode: str = INTERVAL_MODE,
+                   report_path: Optional[str] = None, record_run: bool = False,
+                   save_mode: str = SAVE_MODE, stream: bool = STREAM,
+                   shard: Optional[Tuple[int, int]] = None, resume: Optional[str] = None):
+    """Main forecaster with tier-based model routing.
+
+    workers > 1 fans venues out to a process pool (one TipSee connection per worker).
+    use_cache serves history (HistoryStore) and weather (WeatherCache) from the local
+    cache and keeps fitted models in the ModelRegistry and reso elasticity sums in
+    the ResoElasticityCache; full_history forces a full
+    history re-pull; force_refit refits every model (still warm-started) and
+    bypasses the forecast memo. backend selects per-venue Prophet, the pooled
+    global model, or hybrid (see model_router). interval_mode selects fast
+    (horizon-only, residual-quantile) or exact (sampled) Prophet intervals.
+
+    Every run writes a JSON run report (per-stage and per-venue wall/CPU time,
+    peak RSS, rows) to report_path or FORECAST_CACHE_DIR/runs/; record_run also
+    stores it in forecast_runs. save_mode picks delta (changed rows, COPY +
+    merge) or full (every row via PostgREST) persistence.
+
+    stream saves each venue as soon as it finishes (flush_venue_result) and
+    keeps only counts, so peak memory does not grow with the venue count and
+    a late failure loses one venue, not the run. Serial streaming also drops
+    each venue's prefetched inputs once it has run.
+
+    shard (i, n) runs only the venues shards.py assigns to shard i of n; the
+    report records the assignment for `shards.py merge`.
+
+    Non-dry runs checkpoint each venue in a run manifest (run_manifest.py)
+    once its rows are saved. resume reopens the manifest of that run id (or
+    starts one under it) and runs only the venues not saved yet.
+    """
+    report = RunReport("forecast", params={
+        "model_version": MODEL_VERSION, "venue_id": venue_id, "forecast_days": forecast_days,
+        "dry_run": dry_run, "workers": workers, "use_cache": use_cache,
+        "full_history": full_history, "force_refit": force_refit,
+        "backend": backend, "interval_mode": interval_mode,
+        "prophet_params_version": TUNED_PARAMS_VERSION, "save_mode": save_mode,
+        "stream": stream, "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+    })
+    print("\n" + "=" * 70)
+    print(f"PROPHET FORECASTER v4 ({MODEL_VERSION})")
+    print(f"Tier-gated: A(80+d) B(45+d) C(30+d) D(<30d)")
+    print(f"Forecast horizon: {forecast_days} days")
+    if backend != "prophet":
+        print(f"Backend: {backend} ({GLOBAL_MODEL_VERSION})")
+    print(f"Prophet intervals: {interval_mode}")
+    if TUNED_PARAMS_VERSION is not None:
+        print(f"Prophet params: tuned v{TUNED_PARAMS_VERSION}")
+    if workers > 1:
+        print(f"Workers: {workers}")
+    if stream:
+        print("Streaming: each venue saved as it finishes")
+    print("=" * 70 + "\n")
+
+    supabase = get_supabase()
+
+    with report.stage("supabase_meta") as st:
+        venue_coords = get_venue_coords(supabase)
+        venue_closed_days = get_venue_closed_days(supabase)
+        venue_anomalies = get_venue_anomaly_dates(supabase)
+        mappings = get_venue_mappings(supabase, venue_id)
+        if shard:
+            mappings, shard_params = select_shard(mappings, shard, supabase, "forecast")
+            report.params.update(shard_params)
+        st["rows"] = len(mappings)
+    print(f"[INFO] Venues with coordinates: {len(venue_coords)}")
+    print(f"[INFO] Venues with dark days: {len(venue_closed_days)}")
+    total_anomaly_days = sum(len(v) for v in venue_anomalies.values())
+    print(f"[INFO] Venues with anomaly flags: {len(venue_anomalies)} ({total_anomaly_days} days total)")
+    print(f"[INFO] Venues to forecast: {len(mappings)}")
+
+    manifest, resumed = None, []
+    if dry_run:
+        if resume:
+            print("[WARN] --resume ignored for a dry run (dry runs keep no checkpoints)")
+    else:
+        with report.stage("manifest") as st:
+            manifest = RunManifest(supabase, resume or report.run_id, report.run_id)
+            try:
+                saved = manifest.open(report.params)
+            except ValueError:
+                raise
+            except Exception as e:
+                if resume:
+                    raise
+                # Checkpoints are a convenience for a fresh run; don't fail the forecast over them
+                print(f"[WARN] Run manifest unavailable, this run can't be resumed: {e}")
+                manifest, saved = None, set()
+            resumed = [m for m in mappings if m["venue_id"] in saved]
+            mappings = [m for m in mappings if m["venue_id"] not in saved]
+            if manifest is not None:
+                manifest.pending([m["venue_id"] for m in mappings])
+            st["rows"] = len(mappings)
+        report.params["manifest_run_id"] = manifest.run_id if manifest else None
+        for m in resumed:
+            report.add_venue(m["venue_id"], m["tipsee_location_name"], None, "resumed", None)
+        if resumed:
+            print(f"[INFO] Resume: {len(resumed)} venues already saved, {len(mappings)} to run")
+
+    if not mappings:
+        if shard or resumed:
+            # An empty shard / finished run still reports, so the merge sees every shard
+            print("[INFO] No venues left to run" if resumed else f"[INFO] Shard {shard[0]}/{shard[1]} has no venues")
+            report.finish(venues_ok=0, venues_skipped=0, venues_resumed=len(resumed), rows_written=0)
+            print(f"[INFO] Run report: {report.write(FORECAST_CACHE_DIR, report_path)}")
+            return
+        print("[ERROR] No venue mappings found")
+        return
+    if shard and backend != "prophet":
+        print(f"[WARN] Sharded run: the pooled model fits only this shard's {len(mappings)} venues")
+
+    weather_cache = WeatherCache(FORECAST_CACHE_DIR) if use_cache else None
+    shared = {
+        "venue_coords": venue_coords,
+        "venue_closed_days": venue_closed_days,
+        "venue_anomalies": venue_anomalies,
+        "forecast_days": forecast_days,
+        "weather_cache": weather_cache,
+        "model_registry": ModelRegistry(FORECAST_CACHE_DIR, force_refit=force_refit) if use_cache else None,
+        "forecast_memo": ForecastMemo(FORECAST_CACHE_DIR) if use_cache and not force_refit else None,
+        "reso_cache": ResoElasticityCache(FORECAST_CACHE_DIR) if use_cache else None,
+        "backend": backend,
+        "interval_mode": interval_mode,
+    }
+
+    # Bulk-load history + future resos for all venues (a handful of queries, not 3×N)
+    tipsee_conn = get_tipsee_conn()
+    try:
+        store = HistoryStore(FORECAST_CACHE_DIR) if use_cache else None
+        with report.stage("tipsee_history") as st:
+            venue_history = load_venue_history(tipsee_conn, mappings, store, full_refresh=full_history)
+            st["rows"] = sum(len(h) for h in venue_history.values())
+        with report.stage("tipsee_resos") as st:
+            venue_future_resos = get_future_reservations_bulk(tipsee_conn, mappings, forecast_days)
+            st["rows"] = sum(len(r) for r in venue_future_resos.values())
+        with report.stage("tipsee_intraday") as st:
+            intraday_curves = learn_intraday_curves(get_check_open_hours_bulk(tipsee_conn, mappings))
+            st["rows"] = len(intraday_curves)
+        print(f"[INFO] Intraday curves for {intraday_curves['venue_id'].nunique()}/{len(mappings)} venues")
+        with report.stage("food_bev") as st:
+            venue_food_bev = compute_food_bev_per_cover_bulk(supabase, [m["venue_id"] for m in mappings])
+            st["rows"] = sum(1 for fb in venue_food_bev.values() if fb[0])
+        prefetched = {
+            m["venue_id"]: {
+                "history": venue_history[m["venue_id"]],
+                "future_resos": venue_future_resos[m["venue_id"]],
+                "food_bev": venue_food_bev[m["venue_id"]],
+            }
+            for m in mappings
+        }
+        if weather_cache is not None:
+            with report.stage("weather_prefetch"):
+                prefetch_weather(mappings, venue_coords, venue_history, weather_cache, forecast_days)
+        if backend != "prophet":
+            with report.stage("global_model") as st:
+                global_fcs = forecast_global(mappings, venue_history, venue_future_resos, venue_coords,
+                                             venue_closed_days, venue_anomalies, forecast_days,
+                                             weather_cache, backend)
+                st["rows"] = sum(len(fc) for fc in global_fcs.values())
+            for vid, fc in global_fcs.items():
+                prefetched[vid]["global_fc"] = fc
+
+        stream_opts = None
+        if stream:
+            if save_mode == "delta" and not dry_run and not forecast_db_dsn():
+                print("[WARN] DATABASE_URL / SUPABASE_DB_PASSWORD not set, streaming saves via PostgREST")
+                save_mode = "full"
+            stream_opts = {"save_mode": save_mode, "dry_run": dry_run, "intraday_curves": intraday_curves,
+                           "manifest": (manifest.run_id, manifest.attempt_run_id) if manifest else None}
+            del venue_history, venue_future_resos  # prefetched holds the only references now
+
+        with report.stage("venues", rows=len(mappings)):
+            if workers > 1 and len(mappings) > 1:
+                results = run_venues_parallel(mappings, shared, prefetched, min(workers, len(mappings)),
+                                              stream_opts)
+            elif stream:
+                results = []
+                forecast_conn = get_forecast_db_conn() if save_mode == "delta" and not dry_run else None
+                try:
+                    for m in mappings:
+                        result = forecast_venue(m, tipsee_conn, supabase, **shared,
+                                                **prefetched.pop(m["venue_id"]))
+                        results.append(flush_venue_result(result, supabase, save_mode, dry_run,
+                                                          forecast_conn, intraday_curves))
+                        if manifest is not None:
+                            manifest.checkpoint(results[-1:])
+                finally:
+                    if forecast_conn is not None:
+                        forecast_conn.close()
+            else:
+                results = [
+                    forecast_venue(m, tipsee_conn, supabase, **shared, **prefetched[m["venue_id"]])
+                    for m in mappings
+                ]
+    finally:
+        tipsee_conn.close()
+
+    weather_attached = 0
+    weather_total = 0
+    forecasts_to_save = []
+    forecast_rows = 0
+    rows_written = 0
+    venues_ok = 0
+    venues_skipped = 0
+    memo_hits = 0
+    memo_misses = 0
+    tier_counts = {"A": 0, "A-": 0, "B": 0, "B-": 0, "C": 0, "D": 0}
+
+    for mapping, result in zip(mappings, results):
+        report.add_venue(result["venue_id"], mapping["tipsee_location_name"], result["tier"],
+                         result["status"], result.get("timings"))
+        if result["tier"]:
+            tier_counts[result["tier"]] = tier_counts.get(result["tier"], 0) + 1
+        if result["status"] != "ok":
             venues_skipped += 1
             continue
-
-    tipsee_conn.close()
+        venues_ok += 1
+        if result["memo_hit"] is True:
+            memo_hits += 1
+        elif result["memo_hit"] is False:
+            memo_misses += 1
+        weather_attached += result["weather_attached"]
+        weather_total += result["weather_total"]
+        forecast_rows += result.get("forecast_rows", len(result["forecasts"]))
+        rows_written += result.get("rows_written") or 0
+        if not result["forecasts"].empty:
+            forecasts_to_save.append(result["forecasts"])
 
     # Metrics
     if weather_total > 0:
         weather_pct = weather_attached / weather_total * 100
         print(f"\n[METRIC] Weather coverage: {weather_attached}/{weather_total} forecast rows ({weather_pct:.0f}%)")
 
-    if not dry_run and forecasts_to_save:
-        save_forecasts(forecasts_to_save, supabase)
+    forecasts_to_save = (pd.concat(forecasts_to_save, ignore_index=True) if forecasts_to_save
+                         else pd.DataFrame(columns=FORECAST_ROW_COLUMNS))
+    if not dry_run and not forecasts_to_save.empty:
+        with report.stage("upsert", rows=len(forecasts_to_save)):
+            rows_written = save_forecasts(forecasts_to_save, supabase, save_mode,
+                                          intraday_curves=intraday_curves)
+            save_reso_params(results, supabase)
+    if manifest is not None and not stream:
+        manifest.checkpoint(results)   # streamed venues were checkpointed as they saved
+
+    report.finish(
+        venues_ok=venues_ok, venues_skipped=venues_skipped, venues_resumed=len(resumed),
+        rows_written=rows_written,
+        memo_hits=memo_hits, memo_misses=memo_misses,
+        tiers={t: c for t, c in tier_counts.items() if c > 0},
+    )
 
     print("\n" + "=" * 70)
     print("SUMMARY")
-    print(f"  Model: {MODEL_VERSION}")
+    print(f"  Model: {MODEL_VERSION}" + (f" + {GLOBAL_MODEL_VERSION} ({backend})" if backend != "prophet" else ""))
     print(f"  Venues processed: {venues_ok}")
     print(f"  Venues skipped: {venues_skipped}")
-    print(f"  Total forecast days: {len(forecasts_to_save)}")
+    if resumed:
+        print(f"  Venues already saved (resumed {resume}): {len(resumed)}")
+    print(f"  Total forecast days: {forecast_rows}")
     tier_str = ", ".join(f"{t}={c}" for t, c in sorted(tier_counts.items()) if c > 0)
     print(f"  Tier distribution: {tier_str}")
+    if memo_hits or memo_misses:
+        print(f"  Forecast memo: {memo_hits} unchanged (reused), {memo_misses} recomputed")
     if weather_total > 0:
         print(f"  Weather attached: {weather_attached}/{weather_total} ({weather_attached/weather_total*100:.0f}%)")
+    if stream and not dry_run:
+        print(f"  Mode: streaming ({rows_written} rows saved venue by venue)")
     if dry_run:
         print("  Mode: DRY RUN (no data saved)")
+
+    report.print_summary()
+    print(f"\n[INFO] Run report: {report.write(FORECAST_CACHE_DIR, report_path)}")
+    if record_run and not dry_run:
+        report.record(supabase, MODEL_VERSION)
     print("=" * 70 + "\n")
 
 
@@ -1361,11 +2693,52 @@ def main():
     parser.add_argument("--venue-id", type=str, help="Single venue UUID")
     parser.add_argument("--days", type=int, default=FORECAST_DAYS, help="Forecast days")
     parser.add_argument("--dry-run", action="store_true", help="Don't save to DB")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("FORECAST_WORKERS", "1")),
+                        help="Parallel venue worker processes (default: 1 = serial)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the local history/weather caches and model registry")
+    parser.add_argument("--refit", action="store_true",
+                        help="Refit every model even within MODEL_REFIT_DAYS (warm-started)")
+    parser.add_argument("--full-history", action="store_true",
+                        help="Re-pull full history from TipSee and rebuild the cache")
+    parser.add_argument("--backend", choices=FORECAST_BACKENDS, default=FORECAST_BACKEND,
+                        help="prophet = per-venue (default), global = pooled model for all venues, "
+                             "hybrid = pooled for Tier C/D only")
+    parser.add_argument("--interval-mode", choices=INTERVAL_MODES, default=INTERVAL_MODE,
+                        help="fast = horizon-only predict with residual-quantile intervals (default), "
+                             "exact = Prophet's sampled intervals")
+    parser.add_argument("--save-mode", choices=SAVE_MODES, default=SAVE_MODE,
+                        help="delta = write only changed rows via COPY + merge (default), "
+                             "full = upsert every row via PostgREST")
+    parser.add_argument("--stream", action="store_true", default=STREAM,
+                        help="Save each venue as soon as it finishes and release its model/output "
+                             "(bounded memory; a late failure only loses that venue)")
+    parser.add_argument("--report", type=str, default=None,
+                        help="Write the JSON run report here (default: <cache>/runs/<run_id>.json)")
+    parser.add_argument("--record-run", action="store_true",
+                        default=os.getenv("FORECAST_RECORD_RUN", "").lower() in ("1", "true", "yes"),
+                        help="Also store the run report in the forecast_runs table")
+    parser.add_argument("--shard", type=str, default=os.getenv("FORECAST_SHARD"), metavar="I/N",
+                        help="Run only shard I of N (1-based), balanced by recorded per-venue "
+                             "runtime; combine the reports with shards.py merge")
+    parser.add_argument("--resume", type=str, default=os.getenv("FORECAST_RESUME"), metavar="RUN_ID",
+                        help="Skip the venues run RUN_ID already saved and retry the rest "
+                             "(starts a manifest under RUN_ID if there is none)")
 
     args = parser.parse_args()
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
 
     try:
-        run_forecaster(venue_id=args.venue_id, forecast_days=args.days, dry_run=args.dry_run)
+        run_forecaster(venue_id=args.venue_id, forecast_days=args.days, dry_run=args.dry_run,
+                       workers=max(1, args.workers), use_cache=not args.no_cache,
+                       full_history=args.full_history, force_refit=args.refit,
+                       backend=args.backend, interval_mode=args.interval_mode,
+                       report_path=args.report, record_run=args.record_run,
+                       save_mode=args.save_mode, stream=args.stream, shard=shard,
+                       resume=args.resume)
     except Exception as e:
         print(f"\n[ERROR] {e}")
         import traceback
@@ -0,0 +1,245 @@
+"""
+Pooled multi-venue ("global") covers model for the demand forecaster.
+
+One ridge regression is trained on the stacked daily history of every venue
+instead of one Prophet per venue. Covers are modelled relative to each
+venue's recent level, so DOW / holiday / season / weather / reso effects are
+shared across venues and a venue's own weekly shape is a venue x DOW offset
+that ridge shrinks toward the group. Short-history (Tier C/D) venues borrow
+strength from the rest of the group.
+
+Features (one row per venue-day):
+    categorical  venue, dow, venue x dow, month, holiday / holiday eve
+                 (holidays from the shared business calendar)
+    numeric      temp deviation from the venue median, precip,
+                 reso deviation from the venue's DOW average (0 = unknown)
+
+All venues' horizons are scored in one predict call. Intervals are the 80%
+empirical band of each venue's out-of-sample residuals from a one-window
+holdout refit (group residuals when a venue has too few), matching
+Prophet's interval_width=0.80.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import OneHotEncoder
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from business_calendar import get_calendar
+
+GLOBAL_RIDGE_ALPHA = float(os.getenv("GLOBAL_RIDGE_ALPHA", "3.0"))
+GLOBAL_LEVEL_DAYS = int(os.getenv("GLOBAL_LEVEL_DAYS", "28"))   # recent window defining a venue's level
+GLOBAL_MIN_RESIDUALS = 14                                        # per-venue residuals needed for own interval
+GLOBAL_INTERVAL = (0.10, 0.90)
+
+STACK_COLUMNS = ["venue_id", "ds", "covers", "reso_covers", "temp_high", "precip_inch"]
+_CATEGORICAL = ["venue_id", "dow", "venue_dow", "month", "holiday"]
+
+
+def stack_history(histories: Dict[str, pd.DataFrame],
+                  weather: Optional[Dict[str, Optional[pd.DataFrame]]] = None) -> pd.DataFrame:
+    """
+    Stack per-venue daily frames (ds, covers, reso_covers) into one long frame,
+    left-joining each venue's historical weather when given.
+    """
+    weather = weather or {}
+    frames = []
+    for vid, df in histories.items():
+        if df is None or df.empty:
+            continue
+        part = pd.DataFrame({
+            "venue_id": vid,
+            "ds": pd.to_datetime(df["ds"]).to_numpy(),
+            "covers": pd.to_numeric(df["covers"], errors="coerce").to_numpy(dtype=float),
+            "reso_covers": pd.to_numeric(df["reso_covers"], errors="coerce").to_numpy(dtype=float),
+        })
+        part = _attach_weather(part, weather.get(vid))
+        frames.append(part)
+    if not frames:
+        return pd.DataFrame(columns=STACK_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[STACK_COLUMNS]
+
+
+def future_frame(last_dates: Dict[str, pd.Timestamp], days: int,
+                 future_resos: Optional[Dict[str, pd.DataFrame]] = None,
+                 forecast_weather: Optional[Dict[str, Optional[pd.DataFrame]]] = None) -> pd.DataFrame:
+    """
+    Horizon rows for each venue: the `days` dates after its last history date,
+    with booked reso covers and forecast weather where known (NaN otherwise).
+    """
+    future_resos = future_resos or {}
+    forecast_weather = forecast_weather or {}
+    frames = []
+    for vid, last in last_dates.items():
+        if pd.isna(last):
+            continue
+        ds = pd.date_range(pd.Timestamp(last) + pd.Timedelta(days=1), periods=days, freq="D")
+        part = pd.DataFrame({"venue_id": vid, "ds": ds, "covers": np.nan})
+        resos = future_resos.get(vid)
+        if resos is not None and not resos.empty:
+            booked = (pd.DataFrame({"ds": pd.to_datetime(resos["ds"]),
+                                    "reso_covers": pd.to_numeric(resos["reso_covers"], errors="coerce")})
+                      .drop_duplicates(subset=["ds"], keep="last"))
+            part = part.merge(booked, on="ds", how="left")
+        else:
+            part["reso_covers"] = np.nan
+        frames.append(_attach_weather(part, forecast_weather.get(vid)))
+    if not frames:
+        return pd.DataFrame(columns=STACK_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[STACK_COLUMNS]
+
+
+def _attach_weather(part: pd.DataFrame, weather: Optional[pd.DataFrame]) -> pd.DataFrame:
+    if weather is None or weather.empty:
+        part["temp_high"] = np.nan
+        part["precip_inch"] = np.nan
+        return part
+    wx = weather[["ds", "temp_high", "precip_inch"]].copy()
+    wx["ds"] = pd.to_datetime(wx["ds"])
+    return part.merge(wx.drop_duplicates(subset=["ds"], keep="last"), on="ds", how="left")
+
+
+class GlobalModel:
+    """Ridge regression on stacked venue-days; covers relative to venue level."""
+
+    def __init__(self, alpha: float = GLOBAL_RIDGE_ALPHA, level_days: int = GLOBAL_LEVEL_DAYS):
+        self.alpha = alpha
+        self.level_days = level_days
+        self.encoder: Optional[OneHotEncoder] = None
+        self.model: Optional[Ridge] = None
+        self.venue_stats: Optional[pd.DataFrame] = None   # index venue_id: level, temp_median, q_low, q_high
+        self.dow_resos: Optional[pd.Series] = None        # (venue_id, dow) -> avg reso covers
+
+    @property
+    def venues(self):
+        return set(self.venue_stats.index) if self.venue_stats is not None else set()
+
+    @staticmethod
+    def _holiday_labels(ds: pd.Series) -> np.ndarray:
+        cal = get_calendar()
+        is_hol = cal.join(ds, ("holiday",))["holiday"].notna().to_numpy()
+        is_eve = cal.join(ds + pd.Timedelta(days=1), ("holiday",))["holiday"].notna().to_numpy()
+        return np.select([is_hol, is_eve], ["holiday", "eve"], "none")
+
+    def _design(self, frame: pd.DataFrame, fit: bool = False) -> sparse.csr_matrix:
+        stats = self.venue_stats.reindex(frame["venue_id"])
+        dow = frame["ds"].dt.dayofweek
+        cats = pd.DataFrame({
+            "venue_id": frame["venue_id"].to_numpy(),
+            "dow": dow.to_numpy(),
+            "venue_dow": (frame["venue_id"] + "|" + dow.astype(str)).to_numpy(),
+            "month": frame["ds"].dt.month.to_numpy(),
+            "holiday": self._holiday_labels(frame["ds"]),
+        })[_CATEGORICAL].astype(str)
+
+        temp_dev = ((frame["temp_high"].to_numpy(dtype=float) - stats["temp_median"].to_numpy()) / 10.0)
+        precip = np.clip(frame["precip_inch"].to_numpy(dtype=float), 0, 2)
+        avg_reso = self.dow_resos.reindex(pd.MultiIndex.from_arrays([frame["venue_id"], dow])).to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            reso_dev = np.where(avg_reso > 0, frame["reso_covers"].to_numpy(dtype=float) / avg_reso - 1, np.nan)
+        numeric = np.column_stack([
+            np.nan_to_num(temp_dev, nan=0.0),
+            np.nan_to_num(precip, nan=0.0),
+            np.nan_to_num(np.clip(reso_dev, -1, 3), nan=0.0),
+        ])
+
+        onehot = self.encoder.fit_transform(cats) if fit else self.encoder.transform(cats)
+        return sparse.hstack([onehot, sparse.csr_matrix(numeric)], format="csr")
+
+    def _fit_core(self, train: pd.DataFrame) -> pd.Series:
+        """Fit level stats + ridge; returns in-sample residuals (level units) by venue."""
+        train = train.dropna(subset=["covers"]).copy()
+        train["ds"] = pd.to_datetime(train["ds"])
+
+        last = train.groupby("venue_id")["ds"].transform("max")
+        recent = train[train["ds"] > last - pd.Timedelta(days=self.level_days)]
+        stats = pd.DataFrame({
+            "level": recent.groupby("venue_id")["covers"].mean(),
+            "temp_median": train.groupby("venue_id")["temp_high"].median(),
+        })
+        stats = stats[stats["level"] > 0]
+        train = train[train["venue_id"].isin(stats.index)]
+        if train.empty:
+            raise ValueError("No venue has recent covers to fit the global model")
+
+        self.venue_stats = stats
+        self.dow_resos = train.groupby(["venue_id", train["ds"].dt.dayofweek])["reso_covers"].mean()
+        self.encoder = OneHotEncoder(handle_unknown="ignore")
+
+        X = self._design(train, fit=True)
+        y = train["covers"].to_numpy() / stats["level"].reindex(train["venue_id"]).to_numpy()
+        self.model = Ridge(alpha=self.alpha)
+        self.model.fit(X, y)
+        return pd.Series(y - self.model.predict(X), index=train["venue_id"].to_numpy())
+
+    def _holdout_residuals(self, train: pd.DataFrame) -> pd.Series:
+        """
+        Out-of-sample residuals (level units): refit without each venue's last
+        level_days and score them. In-sample residuals understate horizon error
+        because they never see level drift or missing bookings.
+        """
+        ds = pd.to_datetime(train["ds"])
+        cutoff = ds.groupby(train["venue_id"]).transform("max") - pd.Timedelta(days=self.level_days)
+        inner = GlobalModel(self.alpha, self.level_days)
+        try:
+            inner._fit_core(train[ds <= cutoff])
+        except ValueError:
+            return pd.Series(dtype=float)
+        held = train[(ds > cutoff) & train["venue_id"].isin(inner.venues)].dropna(subset=["covers"])
+        if held.empty:
+            return pd.Series(dtype=float)
+        # Score without reso: history holds final reso counts, the horizon mostly partial/none
+        held = held.assign(ds=pd.to_datetime(held["ds"]), reso_covers=np.nan).reset_index(drop=True)
+        level = inner.venue_stats["level"].reindex(held["venue_id"]).to_numpy()
+        rel = inner.model.predict(inner._design(held))
+        return pd.Series(held["covers"].to_numpy() / level - rel, index=held["venue_id"].to_numpy())
+
+    def fit(self, train: pd.DataFrame, calibrate: bool = True) -> "GlobalModel":
+        """
+        Fit on a stack_history frame. Venues with no recent covers are dropped.
+        calibrate: derive interval bands from a one-window holdout refit
+        (falls back to in-sample residuals when there is nothing to hold out).
+        """
+        resid = self._fit_core(train)
+        if calibrate:
+            holdout = self._holdout_residuals(train)
+            if not holdout.empty:
+                resid = holdout
+
+        lo, hi = GLOBAL_INTERVAL
+        group_q = resid.quantile([lo, hi]).to_numpy()
+        by_venue = resid.groupby(level=0)
+        enough = by_venue.size().reindex(self.venue_stats.index).fillna(0) >= GLOBAL_MIN_RESIDUALS
+        self.venue_stats["q_low"] = by_venue.quantile(lo).reindex(self.venue_stats.index).where(enough, group_q[0])
+        self.venue_stats["q_high"] = by_venue.quantile(hi).reindex(self.venue_stats.index).where(enough, group_q[1])
+        return self
+
+    def predict(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every row of a future_frame in one call. Rows of venues the model
+        was not fitted on are dropped. Returns venue_id, ds, yhat, yhat_lower, yhat_upper.
+        """
+        frame = frame[frame["venue_id"].isin(self.venues)].reset_index(drop=True)
+        frame["ds"] = pd.to_datetime(frame["ds"])
+        if frame.empty:
+            return pd.DataFrame(columns=["venue_id", "ds", "yhat", "yhat_lower", "yhat_upper"])
+
+        stats = self.venue_stats.reindex(frame["venue_id"])
+        rel = self.model.predict(self._design(frame))
+        level = stats["level"].to_numpy()
+        out = pd.DataFrame({
+            "venue_id": frame["venue_id"],
+            "ds": frame["ds"],
+            "yhat": rel * level,
+            "yhat_lower": (rel + stats["q_low"].to_numpy()) * level,
+            "yhat_upper": (rel + stats["q_high"].to_numpy()) * level,
+        })
+        for col in ["yhat", "yhat_lower", "yhat_upper"]:
+            out[col] = out[col].clip(lower=0).round(0)
+        return out
@@ -0,0 +1,121 @@
+"""
+Incremental local history store for the demand forecaster.
+
+Caches the daily frame produced by get_historical_data
+(ds, covers, net_sales, reso_count, reso_covers) as one Parquet file per
+TipSee location, with a last-trading-day watermark and the date of the last
+pull per location in a JSON manifest. Runs only re-pull rows after the last
+pull minus a short re-sync window (late-posted checks, reservation status
+changes); everything older is read from disk. A closed or stale location
+keeps an old watermark but is still pulled through today, so it does not
+drag a months-long re-pull into every run.
+
+Layout:
+    <root>/history/<key>.parquet
+    <root>/history/manifest.json   {key: {watermark, pulled_through, location_uuid, location_name, rows, updated_at}}
+"""
+
+import os
+import json
+import hashlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+import pandas as pd
+
+HISTORY_RESYNC_DAYS = int(os.getenv("HISTORY_RESYNC_DAYS", "3"))
+
+
+class HistoryStore:
+    """Per-location Parquet cache of daily TipSee history with watermarks."""
+
+    def __init__(self, root: Path, resync_days: int = HISTORY_RESYNC_DAYS):
+        self.dir = Path(root) / "history"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.resync_days = resync_days
+        self._manifest_path = self.dir / "manifest.json"
+        self._manifest: Dict[str, Dict] = self._read_manifest()
+
+    @staticmethod
+    def location_key(location_uuid: Optional[str], location_name: Optional[str]) -> str:
+        """Stable file key for a TipSee location (uuid + name, since history matches either)."""
+        raw = f"{location_uuid or ''}|{location_name or ''}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        if not self._manifest_path.exists():
+            return {}
+        try:
+            return json.loads(self._manifest_path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"  [WARN] History cache manifest unreadable, starting cold: {e}")
+            return {}
+
+    def _write_manifest(self):
+        tmp = self._manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._manifest, indent=2, sort_keys=True))
+        os.replace(tmp, self._manifest_path)
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.parquet"
+
+    def watermark(self, key: str) -> Optional[date]:
+        """Last trading day stored for this location, or None if not cached."""
+        entry = self._manifest.get(key)
+        if not entry or not self._path(key).exists():
+            return None
+        return date.fromisoformat(entry["watermark"])
+
+    def pulled_through(self, key: str) -> Optional[date]:
+        """Date of the last pull for this location (older manifests: the watermark)."""
+        wm = self.watermark(key)
+        if wm is None:
+            return None
+        pulled = self._manifest[key].get("pulled_through")
+        return max(wm, date.fromisoformat(pulled)) if pulled else wm
+
+    def resync_start(self, key: str) -> Optional[date]:
+        """First day that must be re-pulled for this location (None = full history)."""
+        pulled = self.pulled_through(key)
+        return pulled - timedelta(days=self.resync_days) if pulled else None
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """Read the cached frame for a location, or None if not cached."""
+        if self.watermark(key) is None:
+            return None
+        return pd.read_parquet(self._path(key))
+
+    def upsert(self, key: str, fresh: pd.DataFrame, since: Optional[date] = None,
+               location_uuid: Optional[str] = None,
+               location_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Merge freshly pulled rows into the cache and return the full frame.
+
+        since: first day covered by `fresh`. Cached rows on or after it are
+        replaced (a day that fell below the covers threshold disappears);
+        None means `fresh` is the complete history.
+        """
+        cached = self.load(key) if since is not None else None
+        if cached is not None and not cached.empty:
+            kept = cached[cached["ds"] < since]
+            merged = pd.concat([kept, fresh], ignore_index=True) if not fresh.empty else kept
+        else:
+            merged = fresh
+        merged = merged.sort_values("ds").reset_index(drop=True)
+
+        if merged.empty:
+            return merged
+
+        tmp = self._path(key).with_suffix(".tmp")
+        merged.to_parquet(tmp, index=False)
+        os.replace(tmp, self._path(key))
+        self._manifest[key] = {
+            "watermark": str(merged["ds"].max()),
+            "pulled_through": str(date.today()),
+            "location_uuid": location_uuid,
+            "location_name": location_name,
+            "rows": len(merged),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._write_manifest()
+        return merged
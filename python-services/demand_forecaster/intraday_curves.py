@@ -0,0 +1,135 @@
+"""
+Intraday arrival curves: split daily covers forecasts into hours and shifts.
+
+Per venue x DOW the curve is the share of covers whose check opened in each
+clock hour, over the last INTRADAY_LOOKBACK_DAYS of TipSee checks (one
+grouped query for all venues, forecaster.get_check_open_hours_bulk). A DOW
+with fewer than INTRADAY_MIN_COVERS covers in the window falls back to the
+venue's all-DOW curve. Hours are business hours: the trading day runs from
+BUSINESS_DAY_START_HOUR to the same hour next morning, so a 1 AM check
+belongs to the previous night.
+
+hourly_records multiplies each daily demand_forecasts row (covers, interval,
+revenue) by its DOW curve with one merge; each hour carries the shift it
+falls in (SHIFT_HOURS), so shift totals are a group-by away
+(demand_forecast_shifts view). Rows are saved to demand_forecasts_hourly with
+the same forecast_date as the daily rows they split, so readers take the
+latest vintage per business_date exactly as they do for the daily forecast.
+resplit_hourly re-splits moved days by their stored hour shape (nowcast).
+
+Venues without check open times (Simphony) get no curve and no hourly rows.
+
+Layout:
+    curves:  DataFrame[venue_id, dow, hour, shift_type, share]   (shares sum to 1 per venue x DOW)
+    hourly:  DataFrame[HOURLY_RECORD_COLUMNS]
+"""
+
+import os
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+INTRADAY_LOOKBACK_DAYS = int(os.getenv("INTRADAY_LOOKBACK_DAYS", "120"))
+INTRADAY_MIN_COVERS = int(os.getenv("INTRADAY_MIN_COVERS", "300"))
+INTRADAY_MIN_SHARE = 0.005   # hours below 0.5% of the night are folded into the rest
+
+BUSINESS_DAY_START_HOUR = 5
+
+# Shift per clock hour (same names as demand_forecasts.shift_type)
+SHIFT_HOURS: Dict[str, List[int]] = {
+    "breakfast": list(range(5, 11)),
+    "lunch": list(range(11, 16)),
+    "dinner": list(range(16, 22)),
+    "late_night": [22, 23, 0, 1, 2, 3, 4],
+}
+HOUR_SHIFT = np.array([next(s for s, hours in SHIFT_HOURS.items() if h in hours) for h in range(24)])
+
+CHECK_HOUR_COLUMNS = ["venue_id", "dow", "hour", "covers"]
+CURVE_COLUMNS = ["venue_id", "dow", "hour", "shift_type", "share"]
+HOURLY_RECORD_COLUMNS = [
+    "venue_id", "forecast_date", "business_date", "hour", "shift_type",
+    "covers_predicted", "covers_lower", "covers_upper", "revenue_predicted", "model_version",
+]
+HOURLY_CONFLICT_KEY = "venue_id, forecast_date, business_date, hour"
+
+
+def business_hour_order(hour: np.ndarray) -> np.ndarray:
+    """Position of a clock hour within the trading day (0 = BUSINESS_DAY_START_HOUR)."""
+    return (np.asarray(hour) - BUSINESS_DAY_START_HOUR) % 24
+
+
+def learn_intraday_curves(check_hours: pd.DataFrame,
+                          min_covers: int = INTRADAY_MIN_COVERS) -> pd.DataFrame:
+    """
+    Curves from CHECK_HOUR_COLUMNS covers (trading-day DOW x open hour), all
+    venues in one pass. DOWs under min_covers use the venue's all-DOW curve.
+    """
+    if check_hours.empty:
+        return pd.DataFrame(columns=CURVE_COLUMNS)
+    ch = check_hours.astype({"dow": int, "hour": int, "covers": float})
+    ch = ch.groupby(["venue_id", "dow", "hour"], as_index=False)["covers"].sum()
+
+    # Pooled all-DOW curve per venue, broadcast to the DOWs that need it
+    pooled = ch.groupby(["venue_id", "hour"], as_index=False)["covers"].sum()
+    dow_total = ch.groupby(["venue_id", "dow"])["covers"].transform("sum")
+    thin = ch.loc[dow_total < min_covers, ["venue_id", "dow"]].drop_duplicates()
+    missing = (pd.MultiIndex.from_product([ch["venue_id"].unique(), range(7)], names=["venue_id", "dow"])
+               .to_frame(index=False)
+               .merge(ch[["venue_id", "dow"]].drop_duplicates(), how="left", indicator=True))
+    fallback = pd.concat([thin, missing.loc[missing["_merge"] == "left_only", ["venue_id", "dow"]]])
+    curves = pd.concat([
+        ch[dow_total >= min_covers],
+        fallback.merge(pooled, on="venue_id"),
+    ], ignore_index=True)
+
+    total = curves.groupby(["venue_id", "dow"])["covers"].transform("sum")
+    curves = curves[(total > 0) & (curves["covers"] >= INTRADAY_MIN_SHARE * total)].copy()
+    curves["share"] = curves["covers"] / curves.groupby(["venue_id", "dow"])["covers"].transform("sum")
+    curves["shift_type"] = HOUR_SHIFT[curves["hour"].to_numpy()]
+    curves = curves.assign(_order=business_hour_order(curves["hour"]))
+    return (curves.sort_values(["venue_id", "dow", "_order"])[CURVE_COLUMNS]
+            .reset_index(drop=True))
+
+
+def _split(daily: pd.DataFrame, shares: pd.DataFrame, on: List[str]) -> pd.DataFrame:
+    """Multiply daily covers / interval / revenue by the matching hour shares."""
+    out = daily.merge(shares, on=on)
+    share = out["share"].to_numpy()
+    for col in ["covers_predicted", "covers_lower", "covers_upper"]:
+        out[col] = (pd.to_numeric(out[col], errors="coerce").to_numpy(dtype=float) * share).round(1)
+    out["revenue_predicted"] = (pd.to_numeric(out["revenue_predicted"], errors="coerce")
+                                .to_numpy(dtype=float) * share).round(2)
+    return out[HOURLY_RECORD_COLUMNS].reset_index(drop=True)
+
+
+def _daily(records: pd.DataFrame) -> pd.DataFrame:
+    return records[["venue_id", "forecast_date", "business_date", "covers_predicted",
+                    "covers_lower", "covers_upper", "revenue_predicted", "model_version"]]
+
+
+def hourly_records(records: pd.DataFrame, curves: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split daily demand_forecasts records (forecast_records layout) into hourly
+    rows by each venue's DOW curve. Venues without a curve are left out.
+    """
+    if records.empty or curves is None or curves.empty:
+        return pd.DataFrame(columns=HOURLY_RECORD_COLUMNS)
+    daily = _daily(records)
+    daily = daily.assign(dow=pd.to_datetime(daily["business_date"]).dt.dayofweek.to_numpy())
+    return _split(daily, curves, ["venue_id", "dow"])
+
+
+def resplit_hourly(records: pd.DataFrame, stored_hourly: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split daily records by the hour shape of the stored hourly rows for the same
+    venue / business_date (nowcast.py: covers move, the curve does not).
+    Days without stored hourly rows are left out.
+    """
+    if records.empty or stored_hourly.empty:
+        return pd.DataFrame(columns=HOURLY_RECORD_COLUMNS)
+    shares = stored_hourly[["venue_id", "business_date", "hour", "shift_type"]].copy()
+    covers = pd.to_numeric(stored_hourly["covers_predicted"], errors="coerce").fillna(0)
+    total = covers.groupby([stored_hourly["venue_id"], stored_hourly["business_date"]]).transform("sum")
+    shares["share"] = np.where(total > 0, covers / total.where(total > 0, 1), np.nan)
+    shares = shares.dropna(subset=["share"])
+    return _split(_daily(records), shares, ["venue_id", "business_date"])
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Backtest leaderboard: one versioned entry per backtest.py run, and a compare
+command that gates a candidate against a recorded baseline.
+
+An entry is keyed by the model version it scored: MODEL_VERSION plus the
+router config (tier thresholds, GLOBAL_MIN_DAYS, tuned params version and the
+per-class Prophet params), hashed to a short router fingerprint so a change
+to model_router thresholds is a new version even when MODEL_VERSION is not
+bumped. It carries V4's per-venue accuracy (the model the forecaster ships),
+Baseline / V3 / V4 summaries, V4 fit seconds per venue and the run's peak RSS.
+
+Entries are always written locally and, with backtest.py --record-run, to
+forecast_leaderboard. compare re-aggregates both entries over the venues they
+share (day-weighted), so a venue added or dropped between runs does not move
+the score, and refuses runs with different backtest settings (holdout vs
+rolling, days, cutoffs, interval mode, shard). A metric fails when the
+candidate is worse than the baseline by more than its REGRESSION_BUDGETS
+entry:
+
+    mape           MAPE up by more than N pp
+    within_10/20   share of days within 10% / 20% down by more than N pp
+    bias           |bias| up by more than N covers/day
+    coverage       80% interval coverage further from 80% by more than N pp
+    fit_seconds    mean V4 fit seconds per venue up by more than N %
+    peak_rss_mb    run peak RSS up by more than N %
+
+Runtime budgets assume both runs used the same runner type and worker count.
+
+Layout:
+    <cache>/leaderboard/<run_id>.json   {run_id, created_at, kind, model_version, router,
+                                         router_fingerprint, git_sha, params, summary,
+                                         fit_seconds_per_venue, peak_rss_mb, venues}
+    summary:  {model: {n, venues, mape, within_10, within_20, bias, coverage}}
+    venues:   {venue_id: {name, n, mape, within_10, within_20, bias, coverage, fit_s}}   (V4)
+
+Usage:
+    python leaderboard.py list                         # Entries, newest first
+    python leaderboard.py compare                      # Newest entry vs the newest earlier version
+    python leaderboard.py compare --candidate RUN_ID --baseline RUN_ID
+    python leaderboard.py compare --budget mape=1.0 --budget fit_seconds=50
+    python leaderboard.py list --remote                # Read forecast_leaderboard instead
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from forecaster import (
+    get_supabase,
+    FORECAST_CACHE_DIR,
+    MODEL_VERSION,
+    TIER_A_MIN,
+    TIER_B_MIN,
+    TIER_C_MIN,
+    GLOBAL_MIN_DAYS,
+    TUNED_PARAMS_VERSION,
+    TUNED_PROPHET_PARAMS,
+    VENUE_CLASS_PROPHET_PARAMS,
+    DEFAULT_PROPHET_PARAMS,
+)
+
+LEADERBOARD_MODEL = "v4"
+COVERAGE_TARGET = 80.0
+
+# Allowed regression per metric (see module docstring for units)
+REGRESSION_BUDGETS = {
+    "mape": float(os.getenv("BUDGET_MAPE_PP", "0.5")),
+    "within_10": float(os.getenv("BUDGET_WITHIN_10_PP", "1.0")),
+    "within_20": float(os.getenv("BUDGET_WITHIN_20_PP", "1.0")),
+    "bias": float(os.getenv("BUDGET_BIAS_COVERS", "2.0")),
+    "coverage": float(os.getenv("BUDGET_COVERAGE_PP", "3.0")),
+    "fit_seconds": float(os.getenv("BUDGET_FIT_SECONDS_PCT", "20")),
+    "peak_rss_mb": float(os.getenv("BUDGET_PEAK_RSS_PCT", "20")),
+}
+
+# Backtest settings that must match for two entries to be comparable
+COMPARABLE_PARAMS = ("holdout_days", "folds", "horizon", "interval_mode", "shard")
+
+
+def router_config() -> Dict:
+    """The model_router inputs that decide what a venue is fitted with."""
+    return {
+        "tier_min": {"A": TIER_A_MIN, "B": TIER_B_MIN, "C": TIER_C_MIN},
+        "global_min_days": GLOBAL_MIN_DAYS,
+        "prophet_params_version": TUNED_PARAMS_VERSION,
+        "prophet_params": {"default": DEFAULT_PROPHET_PARAMS, **VENUE_CLASS_PROPHET_PARAMS,
+                           **TUNED_PROPHET_PARAMS},
+    }
+
+
+def router_fingerprint(router: Dict) -> str:
+    return hashlib.sha256(json.dumps(router, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def version_label(entry: Dict) -> str:
+    return f"{entry['model_version']}@{entry['router_fingerprint']}"
+
+
+def build_entry(report: Dict, kind: str, params: Dict, summary: Dict[str, Dict],
+                venues: Dict[str, Dict]) -> Dict:
+    """
+    Leaderboard entry for a finished backtest run. report is RunReport.to_dict();
+    summary holds the aggregate metrics per model; venues holds V4's per-venue
+    metrics (compute_metrics layout) with name and fit_s added.
+    """
+    router = router_config()
+    fit = [v["fit_s"] for v in venues.values() if v.get("fit_s") is not None]
+    return {
+        "run_id": report["run_id"],
+        "created_at": report["finished_at"] or datetime.now().isoformat(timespec="seconds"),
+        "kind": kind,
+        "model_version": MODEL_VERSION,
+        "router": router,
+        "router_fingerprint": router_fingerprint(router),
+        "git_sha": os.getenv("GITHUB_SHA"),
+        "params": {k: params.get(k) for k in ("venue_id",) + COMPARABLE_PARAMS},
+        "summary": summary,
+        "fit_seconds_per_venue": round(sum(fit) / len(fit), 3) if fit else None,
+        "peak_rss_mb": report["peak_rss_mb"],
+        "venues": {
+            vid: {k: v.get(k) for k in ("name", "n", "mape", "within_10", "within_20",
+                                        "bias", "coverage", "fit_s")}
+            for vid, v in venues.items()
+        },
+    }
+
+
+def fit_seconds_by_venue(report: Dict, stage: str = LEADERBOARD_MODEL) -> Dict[str, float]:
+    """Wall seconds of each venue's `stage` stages in a run report (summed over cutoffs)."""
+    return {
+        v["venue_id"]: round(sum(s["wall_s"] for s in v["stages"] if s["stage"] == stage), 3)
+        for v in report["venues"] if any(s["stage"] == stage for s in v["stages"])
+    }
+
+
+# ============================================================================
+# STORAGE
+# ============================================================================
+
+def leaderboard_dir(root: Path = FORECAST_CACHE_DIR) -> Path:
+    return Path(root) / "leaderboard"
+
+
+def write_entry(entry: Dict, root: Path = FORECAST_CACHE_DIR) -> Path:
+    """Write <root>/leaderboard/<run_id>.json."""
+    path = leaderboard_dir(root) / f"{entry['run_id']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(entry, indent=2, default=str))
+    os.replace(tmp, path)
+    return path
+
+
+def record_entry(supabase, entry: Dict):
+    """Upsert the entry into forecast_leaderboard. Failures only warn."""
+    row = {
+        "run_id": entry["run_id"],
+        "created_at": entry["created_at"],
+        "kind": entry["kind"],
+        "model_version": entry["model_version"],
+        "router_fingerprint": entry["router_fingerprint"],
+        "git_sha": entry["git_sha"],
+        "mape": entry["summary"].get(LEADERBOARD_MODEL, {}).get("mape"),
+        "fit_seconds_per_venue": entry["fit_seconds_per_venue"],
+        "peak_rss_mb": entry["peak_rss_mb"],
+        "entry": entry,
+    }
+    try:
+        supabase.table("forecast_leaderboard").upsert(
+            json.loads(json.dumps(row, default=str)), on_conflict="run_id"
+        ).execute()
+        print(f"[INFO] Leaderboard entry {entry['run_id']} recorded in forecast_leaderboard")
+    except Exception as e:
+        print(f"[WARN] Could not record leaderboard entry: {e}")
+
+
+def load_entries(supabase=None, root: Path = FORECAST_CACHE_DIR) -> List[Dict]:
+    """Every entry, newest first: forecast_leaderboard with a client, else the local directory."""
+    if supabase is not None:
+        rows = (supabase.table("forecast_leaderboard").select("entry")
+                .order("created_at", desc=True).execute().data or [])
+        return [r["entry"] for r in rows]
+    entries = []
+    for path in leaderboard_dir(root).glob("*.json"):
+        try:
+            entries.append(json.loads(path.read_text()))
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Skipping unreadable leaderboard entry {path}: {e}")
+    return sorted(entries, key=lambda e: e["created_at"], reverse=True)
+
+
+# ============================================================================
+# COMPARE
+# ============================================================================
+
+def pick_pair(entries: List[Dict], candidate: Optional[str],
+              baseline: Optional[str]) -> Tuple[Dict, Dict]:
+    """
+    (candidate, baseline) by run id. Defaults: the newest entry, and the newest
+    earlier entry with the same backtest settings and a different version.
+    """
+    by_id = {e["run_id"]: e for e in entries}
+    for run_id in (candidate, baseline):
+        if run_id and run_id not in by_id:
+            raise ValueError(f"No leaderboard entry {run_id}")
+    if not entries:
+        raise ValueError("Leaderboard is empty; run backtest.py first")
+    cand = by_id[candidate] if candidate else entries[0]
+    if baseline:
+        return cand, by_id[baseline]
+    for e in entries:
+        if (e["created_at"] < cand["created_at"] and comparable(cand, e)
+                and version_label(e) != version_label(cand)):
+            return cand, e
+    raise ValueError(f"No earlier entry for another version with the same settings as {cand['run_id']}")
+
+
+def comparable(a: Dict, b: Dict) -> bool:
+    return a["kind"] == b["kind"] and all(a["params"].get(k) == b["params"].get(k)
+                                          for k in COMPARABLE_PARAMS)
+
+
+def venue_aggregate(venues: Dict[str, Dict], venue_ids: List[str]) -> Dict:
+    """Day-weighted accuracy and mean fit seconds over venue_ids (compute_metrics layout)."""
+    rows = [venues[v] for v in venue_ids if venues[v].get("mape") is not None and venues[v].get("n")]
+    total = sum(r["n"] for r in rows)
+
+    def weighted(key):
+        part = [r for r in rows if r.get(key) is not None]
+        n = sum(r["n"] for r in part)
+        return sum(r[key] * r["n"] for r in part) / n if n else None
+
+    fit = [venues[v]["fit_s"] for v in venue_ids if venues[v].get("fit_s") is not None]
+    return {
+        "n": total, "venues": len(rows),
+        "mape": weighted("mape"), "within_10": weighted("within_10"), "within_20": weighted("within_20"),
+        "bias": weighted("bias"), "coverage": weighted("coverage"),
+        "fit_seconds": sum(fit) / len(fit) if fit else None,
+    }
+
+
+def regression(metric: str, base: float, cand: float) -> float:
+    """How much worse the candidate is, in the metric's budget unit (negative = better)."""
+    if metric == "mape":
+        return cand - base
+    if metric in ("within_10", "within_20"):
+        return base - cand
+    if metric == "bias":
+        return abs(cand) - abs(base)
+    if metric == "coverage":
+        return abs(cand - COVERAGE_TARGET) - abs(base - COVERAGE_TARGET)
+    return (cand / base - 1) * 100 if base else 0.0   # fit_seconds, peak_rss_mb: percent
+
+
+def compare_entries(cand: Dict, base: Dict, budgets: Dict[str, float]) -> List[Dict]:
+    """One row per metric: baseline, candidate, regression, budget, passed."""
+    if not comparable(cand, base):
+        raise ValueError("Entries have different backtest settings: "
+                         f"{cand['kind']} {cand['params']} vs {base['kind']} {base['params']}")
+    shared = sorted(set(cand["venues"]) & set(base["venues"]))
+    if not shared:
+        raise ValueError("Entries share no venues")
+    c = venue_aggregate(cand["venues"], shared)
+    b = venue_aggregate(base["venues"], shared)
+    c["peak_rss_mb"], b["peak_rss_mb"] = cand["peak_rss_mb"], base["peak_rss_mb"]
+
+    rows = []
+    for metric, budget in budgets.items():
+        if b.get(metric) is None or c.get(metric) is None:
+            rows.append({"metric": metric, "baseline": b.get(metric), "candidate": c.get(metric),
+                         "regression": None, "budget": budget, "passed": True})
+            continue
+        worse = regression(metric, b[metric], c[metric])
+        rows.append({"metric": metric, "baseline": round(b[metric], 2), "candidate": round(c[metric], 2),
+                     "regression": round(worse, 2), "budget": budget, "passed": worse <= budget})
+    rows.append({"metric": "venues", "baseline": b["venues"], "candidate": c["venues"],
+                 "regression": None, "budget": None, "passed": True})
+    return rows
+
+
+def print_entries(entries: List[Dict], top: int):
+    print(f"\n  {'Run':<24} {'Kind':<8} {'Version':<32} {'V4 MAPE':>8} {'Cov':>6} "
+          f"{'Fit s/venue':>11} {'Peak RSS':>9}")
+    print(f"  {'-' * 104}")
+    for e in entries[:top]:
+        v4 = e["summary"].get(LEADERBOARD_MODEL) or {}
+        mape = f"{v4['mape']:.1f}%" if v4.get("mape") is not None else "N/A"
+        cov = f"{v4['coverage']:.1f}%" if v4.get("coverage") is not None else "N/A"
+        fit = f"{e['fit_seconds_per_venue']:.2f}" if e["fit_seconds_per_venue"] is not None else "N/A"
+        rss = f"{e['peak_rss_mb']:.0f}MB" if e["peak_rss_mb"] is not None else "N/A"
+        print(f"  {e['run_id']:<24} {e['kind']:<8} {version_label(e)[:32]:<32} {mape:>8} {cov:>6} "
+              f"{fit:>11} {rss:>9}")
+
+
+def print_comparison(cand: Dict, base: Dict, rows: List[Dict]):
+    print(f"\n  Baseline:  {base['run_id']} ({version_label(base)})")
+    print(f"  Candidate: {cand['run_id']} ({version_label(cand)})")
+    print(f"\n  {'Metric':<14} {'Baseline':>10} {'Candidate':>10} {'Worse by':>9} {'Budget':>8}  Result")
+    print(f"  {'-' * 62}")
+    for r in rows:
+        fmt = lambda v: "N/A" if v is None else f"{v}"
+        result = "" if r["budget"] is None else ("ok" if r["passed"] else "FAIL")
+        print(f"  {r['metric']:<14} {fmt(r['baseline']):>10} {fmt(r['candidate']):>10} "
+              f"{fmt(r['regression']) if r['budget'] is not None else '':>9} "
+              f"{fmt(r['budget']) if r['budget'] is not None else '':>8}  {result}")
+
+
+def parse_budgets(overrides: List[str]) -> Dict[str, float]:
+    budgets = dict(REGRESSION_BUDGETS)
+    for item in overrides or []:
+        metric, _, value = item.partition("=")
+        if metric not in budgets or not value:
+            raise ValueError(f"Bad --budget {item!r}; metrics: {', '.join(budgets)}")
+        budgets[metric] = float(value)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest leaderboard and regression gates")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_p = sub.add_parser("list", help="Show leaderboard entries, newest first")
+    list_p.add_argument("--top", type=int, default=20, help="Entries to show (default: 20)")
+    cmp_p = sub.add_parser("compare", help="Gate a candidate entry against a baseline entry")
+    cmp_p.add_argument("--candidate", type=str, default=None, help="Candidate run id (default: newest)")
+    cmp_p.add_argument("--baseline", type=str, default=None,
+                       help="Baseline run id (default: newest earlier entry of another version)")
+    cmp_p.add_argument("--budget", action="append", metavar="METRIC=N",
+                       help=f"Override a budget ({', '.join(REGRESSION_BUDGETS)})")
+    for p in (list_p, cmp_p):
+        p.add_argument("--remote", action="store_true", help="Read forecast_leaderboard instead of the local cache")
+    args = parser.parse_args()
+
+    entries = load_entries(get_supabase() if args.remote else None)
+    if args.command == "list":
+        print_entries(entries, args.top)
+        return
+
+    try:
+        budgets = parse_budgets(args.budget)
+        cand, base = pick_pair(entries, args.candidate, args.baseline)
+        rows = compare_entries(cand, base, budgets)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(2)
+    print_comparison(cand, base, rows)
+    failed = [r["metric"] for r in rows if not r["passed"]]
+    if failed:
+        print(f"\n[FAIL] Regression beyond budget: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n[OK] Candidate within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Lazy model-backend registry for the demand forecaster.
+
+Each covers model is a backend whose heavy libraries are imported the first
+time a venue routed to it needs them, not when forecaster.py is imported:
+
+    prophet   per-venue Prophet (Tiers A/B/C)         prophet (cmdstanpy), prophet.serialize
+    global    pooled ridge model (global_model.py)    sklearn, scipy
+    naive     DOW rolling average (Tier D)            nothing beyond pandas
+
+So --help, a Tier D-only run or a tool importing a forecaster helper never
+pays for Prophet/cmdstan. model_router sets ModelConfig.backend (defaulted
+per tier from TIER_BACKENDS); load_backend imports that backend's modules
+once per process and records how long it took.
+
+The TipSee / Supabase clients (psycopg2, supabase) and requests are imported
+by the functions that open them, for the same reason.
+"""
+
+import time
+import importlib
+from types import ModuleType
+from typing import Dict, List, Optional
+
+# Default backend per model_router tier (backend="global"/"hybrid" overrides it)
+TIER_BACKENDS = {
+    "A": "prophet", "A-": "prophet",
+    "B": "prophet", "B-": "prophet",
+    "C": "prophet",
+    "D": "naive",
+}
+
+# Modules each backend needs; the first one is what load_backend returns
+BACKEND_MODULES: Dict[str, List[str]] = {
+    "prophet": ["prophet", "prophet.serialize"],
+    "global": ["global_model"],
+    "naive": [],
+}
+
+_loaded: Dict[str, Optional[ModuleType]] = {}
+_load_seconds: Dict[str, float] = {}
+
+
+def is_loaded(name: str) -> bool:
+    return name in _loaded
+
+
+def load_backend(name: str) -> Optional[ModuleType]:
+    """Import a backend's modules (once per process) and return its primary module (None for naive)."""
+    if name in _loaded:
+        return _loaded[name]
+    if name not in BACKEND_MODULES:
+        raise ValueError(f"Unknown model backend: {name} (expected one of {sorted(BACKEND_MODULES)})")
+    t0 = time.perf_counter()
+    modules = [importlib.import_module(m) for m in BACKEND_MODULES[name]]
+    _load_seconds[name] = round(time.perf_counter() - t0, 4)
+    _loaded[name] = modules[0] if modules else None
+    return _loaded[name]
+
+
+def load_all():
+    """Import every backend up front (the old eager startup; used by benchmark.py)."""
+    for name in BACKEND_MODULES:
+        load_backend(name)
+
+
+def load_seconds() -> Dict[str, float]:
+    """{backend: first-import seconds} for the backends loaded in this process."""
+    return dict(_load_seconds)
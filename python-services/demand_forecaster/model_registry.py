@@ -0,0 +1,82 @@
+"""
+Persistent Prophet model registry for the demand forecaster.
+
+Stores each venue's last fitted Prophet model (prophet.serialize JSON) with
+its ModelConfig signature, tier and training-window metadata:
+
+    <root>/models/<venue_id>.json   {"meta": {...}, "model": "<prophet json>"}
+
+fit_and_forecast uses it two ways:
+  - Reuse: a model fitted less than MODEL_REFIT_DAYS ago with the same
+    signature is loaded and only re-predicted (reso adjustment is re-applied
+    on top, so new bookings still move the forecast).
+  - Warm start: otherwise the refit starts Stan's optimizer from the previous
+    parameters. Prophet drops any init whose shape no longer matches
+    (e.g. a new holiday entered the window), so this is always safe.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+
+from model_backends import load_backend
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+MODEL_REFIT_DAYS = int(os.getenv("MODEL_REFIT_DAYS", "1"))
+
+
+class ModelRegistry:
+    """Per-venue store of fitted Prophet models + metadata."""
+
+    def __init__(self, root: Path, refit_days: int = MODEL_REFIT_DAYS, force_refit: bool = False):
+        self.dir = Path(root) / "models"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.refit_days = refit_days
+        self.force_refit = force_refit
+
+    def _path(self, venue_id: str) -> Path:
+        return self.dir / f"{venue_id}.json"
+
+    def load(self, venue_id: str) -> Tuple[Optional[Prophet], Optional[Dict]]:
+        """Return (model, meta) for a venue, or (None, None) if absent/unreadable."""
+        path = self._path(venue_id)
+        if not path.exists():
+            return None, None
+        try:
+            payload = json.loads(path.read_text())
+            return load_backend("prophet").serialize.model_from_json(payload["model"]), payload["meta"]
+        except Exception as e:
+            print(f"  [WARN] Model registry entry unreadable, refitting: {e}")
+            return None, None
+
+    def save(self, venue_id: str, model: Prophet, meta: Dict):
+        payload = {"meta": meta, "model": load_backend("prophet").serialize.model_to_json(model)}
+        tmp = self._path(venue_id).with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, self._path(venue_id))
+
+    def is_reusable(self, meta: Optional[Dict], signature: Dict, train_end: date) -> bool:
+        """A stored model can be re-predicted without refitting if it is recent and compatible."""
+        if self.force_refit or not meta or meta.get("signature") != signature:
+            return False
+        fitted_on = date.fromisoformat(meta["fitted_on"])
+        model_end = date.fromisoformat(meta["train_end"])
+        return (datetime.now().date() - fitted_on).days < self.refit_days and model_end <= train_end
+
+    @staticmethod
+    def warm_start_params(model: Prophet) -> Dict:
+        """Stan init dict from a fitted model (MAP estimate: first row of each param)."""
+        init = {}
+        for pname in ["k", "m", "sigma_obs"]:
+            init[pname] = float(model.params[pname][0][0])
+        for pname in ["delta", "beta"]:
+            init[pname] = np.asarray(model.params[pname][0])
+        return init
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Intraday reservation nowcast on the stored demand forecast (no refit).
+
+Bookings for the next few days keep landing after the morning forecaster run.
+The nowcast re-applies the learned reservation adjustment to the stored
+forecast with the bookings as they stand now:
+
+    covers' = covers + reso_adjustment(resos now) - reso_adjustment(resos at save)
+
+using the per-venue DOW betas and DOW average resos that forecaster.py saved
+to forecast_reso_params. The "resos at save" are the stored rows'
+reservation_covers_predicted, and the nowcast updates that column, so a rerun
+only moves a row by the bookings taken since the last one.
+
+Per run: one Supabase read (mappings, closed days, reso params), one
+DISTINCT ON read of the latest stored vintage for the next NOWCAST_DAYS days,
+one TipSee query for future reservations, and one COPY + merge of the rows
+that moved, stamped forecast_date=today and model_version=NOWCAST_MODEL_VERSION.
+Their demand_forecasts_hourly rows are re-split with the stored hour shape,
+and the moves are published to forecast_changes like a forecaster save.
+Only rows from the Prophet forecast (or an earlier nowcast) of venues with
+saved params are touched; Tier C/D and pooled-model venues keep their forecast.
+
+Betas move slowly, so a delta-saved older vintage is an acceptable base for
+the adjustment. Tonight's arrived / seated / completed parties still count
+as bookings (NOWCAST_RESO_STATUSES).
+
+Usage:
+    python nowcast.py                   # Next 3 days, all venues
+    python nowcast.py --days 2          # Today and tomorrow
+    python nowcast.py --venue-id UUID   # Single venue
+    python nowcast.py --dry-run         # Print the moves, don't save
+    python nowcast.py --record-run      # Also store the run report in forecast_runs
+"""
+
+import os
+import sys
+import argparse
+from datetime import date, timedelta
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+from forecaster import (
+    get_tipsee_conn,
+    get_supabase,
+    get_venue_mappings,
+    get_venue_closed_days,
+    get_future_reservations_bulk,
+    reso_adjustment,
+    confidence_levels,
+    FORECAST_RECORD_COLUMNS,
+    FORECAST_CACHE_DIR,
+    MODEL_VERSION,
+)
+from forecast_store import copy_merge, get_forecast_db_conn, latest_hourly_rows, latest_rows, merge_with_changes
+from intraday_curves import HOURLY_CONFLICT_KEY, HOURLY_RECORD_COLUMNS, resplit_hourly
+from run_report import RunReport
+
+NOWCAST_DAYS = int(os.getenv("NOWCAST_DAYS", "3"))
+NOWCAST_MODEL_VERSION = f"{MODEL_VERSION}_nowcast"
+NOWCAST_RESO_STATUSES = ("CONFIRMED", "BOOKED", "ARRIVED", "SEATED", "COMPLETE")
+
+# Base rows the nowcast may adjust (pooled / naive forecasts carry no reso adjustment)
+ADJUSTABLE_VERSIONS = (MODEL_VERSION, NOWCAST_MODEL_VERSION)
+
+
+def get_reso_params(supabase, venue_id: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    {venue_id: {"reso_betas": {dow: beta}, "dow_avg_resos": pd.Series}} from
+    forecast_reso_params, for venues whose forecast has a reso adjustment.
+    """
+    query = supabase.table("forecast_reso_params").select("venue_id, reso_betas, dow_avg_resos")
+    if venue_id:
+        query = query.eq("venue_id", venue_id)
+    params = {}
+    for row in query.execute().data or []:
+        if not row.get("reso_betas") or not row.get("dow_avg_resos"):
+            continue
+        params[row["venue_id"]] = {
+            "reso_betas": {int(d): float(b) for d, b in row["reso_betas"].items()},
+            "dow_avg_resos": pd.Series({int(d): float(a) for d, a in row["dow_avg_resos"].items()}),
+        }
+    return params
+
+
+def nowcast_venue(rows: pd.DataFrame, future_resos: pd.DataFrame, params: Dict,
+                  closed_weekdays: list, today: str) -> pd.DataFrame:
+    """
+    Re-apply the reso adjustment to one venue's stored rows (FORECAST_RECORD_COLUMNS)
+    with the current bookings. Returns only the rows that moved, restamped.
+    """
+    ds = pd.to_datetime(rows["business_date"]).reset_index(drop=True)
+    rows = rows.reset_index(drop=True)
+    betas, avg = params["reso_betas"], params["dow_avg_resos"]
+
+    stored = pd.DataFrame({"ds": ds, "reso_covers": rows["reservation_covers_predicted"]}).dropna()
+    delta = (reso_adjustment(ds, future_resos, avg, betas)
+             - reso_adjustment(ds, stored, avg, betas))
+    delta = np.where(ds.dt.dayofweek.isin(closed_weekdays), 0.0, delta)
+
+    booked = (future_resos.assign(ds=pd.to_datetime(future_resos["ds"]))
+              .drop_duplicates(subset=["ds"], keep="last")
+              .set_index("ds")["reso_covers"])
+    reso_now = pd.to_numeric(ds.map(booked), errors="coerce").fillna(0).astype(int).to_numpy()
+    reso_now = np.where(ds.dt.dayofweek.isin(closed_weekdays), 0, reso_now)
+
+    covers_old = rows["covers_predicted"].to_numpy(dtype=float)
+    covers = np.clip(covers_old + delta, 0, None).round()
+    lower = np.clip(rows["covers_lower"].to_numpy(dtype=float) + delta, 0, None).round()
+    upper = np.clip(rows["covers_upper"].to_numpy(dtype=float) + delta, 0, None).round()
+
+    reso_old = rows["reservation_covers_predicted"].fillna(0).to_numpy(dtype=int)
+    moved = (covers != covers_old) | (reso_now != reso_old)
+    if not moved.any():
+        return rows.iloc[0:0]
+
+    out = rows.copy()
+    # Revenue follows covers at the stored per-cover split
+    scale = np.where(covers_old > 0, covers / np.maximum(covers_old, 1), 1.0)
+    for col in ["revenue_predicted", "food_revenue_predicted", "bev_revenue_predicted"]:
+        out[col] = (pd.to_numeric(out[col], errors="coerce").to_numpy(dtype=float) * scale).round(2)
+    out["covers_predicted"] = covers.astype(int)
+    out["covers_lower"] = lower.astype(int)
+    out["covers_upper"] = upper.astype(int)
+    out["confidence_level"] = confidence_levels(covers, lower, upper)
+    out["reservation_covers_predicted"] = pd.array(np.where(reso_now > 0, reso_now, np.nan), dtype="Int64")
+    out["walkin_covers_predicted"] = np.where(reso_now > 0, np.maximum(0, covers - reso_now), covers).astype(int)
+    out["forecast_date"] = today
+    out["model_version"] = NOWCAST_MODEL_VERSION
+    return out[moved].reset_index(drop=True)
+
+
+def run_nowcast(venue_id: Optional[str] = None, days: int = NOWCAST_DAYS, dry_run: bool = False,
+                report_path: Optional[str] = None, record_run: bool = False) -> int:
+    """Nowcast the next `days` business days; returns the number of rows written (or that would be)."""
+    report = RunReport("nowcast", params={
+        "model_version": NOWCAST_MODEL_VERSION, "venue_id": venue_id, "days": days, "dry_run": dry_run,
+    })
+    today = date.today()
+    start, end = str(today), str(today + timedelta(days=days - 1))
+    print(f"\nRESO NOWCAST ({NOWCAST_MODEL_VERSION}): {start} .. {end}")
+
+    conn = get_forecast_db_conn()
+    if conn is None:
+        print("[ERROR] DATABASE_URL / SUPABASE_DB_PASSWORD not set; the nowcast reads and merges over Postgres")
+        sys.exit(1)
+
+    supabase = get_supabase()
+    with report.stage("supabase_meta") as st:
+        mappings = get_venue_mappings(supabase, venue_id)
+        closed_days = get_venue_closed_days(supabase)
+        params = get_reso_params(supabase, venue_id)
+        mappings = [m for m in mappings if m["venue_id"] in params]
+        st["rows"] = len(mappings)
+    print(f"[INFO] Venues with reso params: {len(mappings)}")
+    if not mappings:
+        conn.close()
+        return 0
+
+    try:
+        with report.stage("base_forecasts") as st:
+            base = latest_rows(conn, [m["venue_id"] for m in mappings], start, end,
+                               FORECAST_RECORD_COLUMNS, today=start)
+            base = base[(base["shift_type"] == "dinner")
+                        & base["model_version"].isin(ADJUSTABLE_VERSIONS)]
+            st["rows"] = len(base)
+
+        with report.stage("tipsee_resos") as st:
+            tipsee = get_tipsee_conn()
+            try:
+                resos = get_future_reservations_bulk(tipsee, mappings, days=days,
+                                                     statuses=NOWCAST_RESO_STATUSES)
+            finally:
+                tipsee.close()
+            st["rows"] = sum(len(r) for r in resos.values())
+
+        with report.stage("adjust", rows=len(base)) as st:
+            by_venue = dict(tuple(base.groupby("venue_id")))
+            moved = [nowcast_venue(rows, resos[vid], params[vid], closed_days.get(vid, []), start)
+                     for vid, rows in by_venue.items()]
+            moved = [m for m in moved if not m.empty]
+            updates = (pd.concat(moved, ignore_index=True) if moved
+                       else pd.DataFrame(columns=FORECAST_RECORD_COLUMNS))
+            st["rows"] = len(updates)
+
+        for vid, rows in updates.groupby("venue_id"):
+            old = base[base["venue_id"] == vid].set_index("business_date")["covers_predicted"]
+            moves = ", ".join(f"{d} {int(old[d])}->{c}" for d, c in zip(rows["business_date"], rows["covers_predicted"]))
+            print(f"  {vid}: {moves}")
+
+        if not dry_run and not updates.empty:
+            with report.stage("upsert", rows=len(updates)):
+                merge_with_changes(conn, updates[FORECAST_RECORD_COLUMNS], base)
+                # Keep the hourly split in step: same hour shape, new day totals
+                stored = latest_hourly_rows(conn, sorted(updates["venue_id"].unique()), start, end,
+                                            HOURLY_RECORD_COLUMNS, today=start)
+                hourly = resplit_hourly(updates, stored)
+                if not hourly.empty:
+                    copy_merge(conn, hourly, "demand_forecasts_hourly", HOURLY_CONFLICT_KEY)
+    finally:
+        conn.close()
+
+    report.finish(venues_ok=len(by_venue), rows_written=0 if dry_run else len(updates))
+    print(f"\n[OK] Nowcast {'would move' if dry_run else 'moved'} {len(updates)} of {len(base)} "
+          f"stored rows across {updates['venue_id'].nunique()} venues")
+    report.print_summary()
+    print(f"\n[INFO] Run report: {report.write(FORECAST_CACHE_DIR, report_path)}")
+    if record_run and not dry_run:
+        report.record(supabase, NOWCAST_MODEL_VERSION)
+    return len(updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intraday reservation nowcast on the stored forecast")
+    parser.add_argument("--venue-id", type=str, help="Single venue UUID")
+    parser.add_argument("--days", type=int, default=NOWCAST_DAYS,
+                        help=f"Business days from today to nowcast (default: {NOWCAST_DAYS})")
+    parser.add_argument("--dry-run", action="store_true", help="Don't save to DB")
+    parser.add_argument("--report", type=str, default=None,
+                        help="Write the JSON run report here (default: <cache>/runs/<run_id>.json)")
+    parser.add_argument("--record-run", action="store_true",
+                        help="Also store the run report in the forecast_runs table")
+    args = parser.parse_args()
+
+    run_nowcast(venue_id=args.venue_id, days=args.days, dry_run=args.dry_run,
+                report_path=args.report, record_run=args.record_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Reservation elasticity from grouped sufficient statistics.
+
+Per venue x DOW the forecaster fits covers_ratio - 1 = beta * (resos_ratio - 1),
+ratios taken against that DOW's mean covers / resos, as a no-intercept ridge
+(alpha = RESO_RIDGE_ALPHA). With x = r / r_avg - 1 and y = c / c_avg - 1 the
+closed form beta = sum(xy) / (sum(x^2) + alpha) only needs five sums:
+
+    n, sum(c), sum(r), sum(r^2), sum(c*r)
+    sum(xy)  = sum(c*r) / (r_avg * c_avg) - n
+    sum(x^2) = sum(r^2) / r_avg^2 - n
+
+so every venue x DOW beta comes out of one grouped bincount, and the sums of
+new days can be added to cached ones. A DOW with fewer than RESO_MIN_DAYS
+days or a zero mean gets beta 0; betas are clamped to
+[RESO_BETA_MIN, RESO_BETA_MAX] and rounded to 3 places.
+
+ResoElasticityCache keeps each venue's sums over its settled history (days
+older than the history re-sync window, which HistoryStore never re-pulls)
+and only aggregates the days added since, the unsettled tail, and the days
+outlier removal drops from the training frame.
+
+Layout:
+    <root>/reso/<venue_id>.json   {key, settled, sums: [[n, c, r, rr, cr] x 7 DOWs], updated_at}
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from history_store import HISTORY_RESYNC_DAYS
+
+RESO_BETA_MIN = 0.0
+RESO_BETA_MAX = 1.5
+RESO_RIDGE_ALPHA = 1.0
+RESO_MIN_DAYS = 8
+
+SUM_COLUMNS = ["n", "c", "r", "rr", "cr"]
+
+
+def venue_dow_sums(histories: Dict[str, pd.DataFrame]) -> Tuple[List[str], np.ndarray]:
+    """
+    Sufficient statistics for every venue x DOW in one pass.
+    Returns (venue_ids, sums) with sums shaped (venues, 7, len(SUM_COLUMNS)).
+    Missing covers / reso covers count as 0, as in the per-DOW ridge fit.
+    """
+    vids = list(histories)
+    codes, covers, resos = [], [], []
+    for i, vid in enumerate(vids):
+        df = histories[vid]
+        if df is None or df.empty:
+            continue
+        codes.append(i * 7 + pd.to_datetime(df["ds"]).dt.dayofweek.to_numpy())
+        covers.append(pd.to_numeric(df["covers"], errors="coerce").fillna(0).to_numpy(dtype=float))
+        resos.append(pd.to_numeric(df["reso_covers"], errors="coerce").fillna(0).to_numpy(dtype=float))
+    sums = np.zeros((len(vids) * 7, len(SUM_COLUMNS)))
+    if codes:
+        code, c, r = np.concatenate(codes), np.concatenate(covers), np.concatenate(resos)
+        size = len(vids) * 7
+        for j, weights in enumerate([None, c, r, r * r, c * r]):
+            sums[:, j] = np.bincount(code, weights=weights, minlength=size)
+    return vids, sums.reshape(len(vids), 7, len(SUM_COLUMNS))
+
+
+def dow_sums(df: Optional[pd.DataFrame]) -> np.ndarray:
+    """(7, len(SUM_COLUMNS)) sums for one venue's frame."""
+    return venue_dow_sums({"": df})[1][0]
+
+
+def betas_from_sums(sums: np.ndarray, alpha: float = RESO_RIDGE_ALPHA) -> np.ndarray:
+    """Ridge closed form over sums (..., 7, 5) -> betas (..., 7), clamped, 0 where not learnable."""
+    n, c, r, rr, cr = (sums[..., j] for j in range(len(SUM_COLUMNS)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c_avg, r_avg = c / n, r / n
+        sxy = cr / (r_avg * c_avg) - n
+        sxx = rr / (r_avg * r_avg) - n
+        beta = sxy / (sxx + alpha)
+    ok = (n >= RESO_MIN_DAYS) & (c_avg > 0) & (r_avg > 0)
+    return np.where(ok, np.clip(np.nan_to_num(beta), RESO_BETA_MIN, RESO_BETA_MAX), 0.0)
+
+
+def _beta_dict(betas: np.ndarray) -> Dict[int, float]:
+    return {dow: round(float(betas[dow]), 3) for dow in range(7)}
+
+
+def learn_reso_elasticity_batch(histories: Dict[str, pd.DataFrame]) -> Dict[str, Dict[int, float]]:
+    """{venue_id: {dow: beta}} for every venue's training frame (ds, covers, reso_covers) at once."""
+    vids, sums = venue_dow_sums(histories)
+    betas = betas_from_sums(sums)
+    return {vid: _beta_dict(betas[i]) for i, vid in enumerate(vids)}
+
+
+class ResoElasticityCache:
+    """Per-venue elasticity sums over settled history, extended as new days arrive."""
+
+    def __init__(self, root: Path, settle_days: int = HISTORY_RESYNC_DAYS):
+        self.dir = Path(root) / "reso"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        # +1: the newest history day can trail the store's watermark (filtered days)
+        self.settle_days = settle_days + 1
+
+    def _path(self, venue_id: str) -> Path:
+        return self.dir / f"{venue_id}.json"
+
+    def _read(self, venue_id: str) -> Optional[Dict]:
+        path = self._path(venue_id)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, venue_id: str, entry: Dict):
+        tmp = self._path(venue_id).with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, self._path(venue_id))
+
+    def betas(self, venue_id: str, df: pd.DataFrame, df_clean: pd.DataFrame,
+              key: Optional[Dict] = None) -> Dict[int, float]:
+        """
+        Betas learned from df_clean, with df_clean a day-subset of df (the venue's
+        history after dark-day / anomaly filters, before outlier removal).
+        key: inputs that decide which past days count (e.g. dark days, anomaly
+        dates); a change rebuilds the venue's sums from scratch.
+        """
+        ds = pd.to_datetime(df["ds"])
+        if ds.empty:
+            return _beta_dict(np.zeros(7))
+        settled = ds.max().normalize() - pd.Timedelta(days=self.settle_days)
+        key_hash = hashlib.sha256(json.dumps(
+            {"start": str(ds.min().date()), **(key or {})}, sort_keys=True, default=str
+        ).encode()).hexdigest()
+
+        entry = self._read(venue_id)
+        if entry and entry.get("key") == key_hash and pd.Timestamp(entry["settled"]) <= settled:
+            prev = pd.Timestamp(entry["settled"])
+            stored = np.asarray(entry["sums"], dtype=float)
+        else:
+            prev, stored = None, np.zeros((7, len(SUM_COLUMNS)))
+
+        if prev is None or prev < settled:
+            added = (ds <= settled) if prev is None else ((ds > prev) & (ds <= settled))
+            stored = stored + dow_sums(df[added.to_numpy()])
+            self._write(venue_id, {
+                "key": key_hash,
+                "settled": str(settled.date()),
+                "sums": stored.tolist(),
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            })
+
+        clean_ds = pd.to_datetime(df_clean["ds"])
+        dropped = df[((ds <= settled) & ~ds.isin(clean_ds)).to_numpy()]
+        tail = df_clean[(clean_ds > settled).to_numpy()]
+        return _beta_dict(betas_from_sums(stored - dow_sums(dropped) + dow_sums(tail)))
@@ -3,6 +3,10 @@
 CLI Wrapper for Demand Forecaster
 Callable from automation cron jobs
 
+Answers from the fitted models in the local model registry through
+ForecastService (no refit); run forecaster.py first to fit/refresh them.
+For repeated queries keep `python forecast_service.py --http PORT` running.
+
 Usage:
   python run_forecast.py --venue-id <uuid> --days-ahead 14
 """
@@ -10,52 +14,45 @@ Usage:
 import argparse
 import json
 import sys
-from datetime import datetime, timedelta
-from forecaster import DemandForecaster
+from contextlib import redirect_stdout
+from forecast_service import ForecastService
 
 
-def run_forecast(venue_id: str, days_ahead: int = 14):
+def run_forecast(venue_id: str, days_ahead: int = 14, offline: bool = False):
     """
-    Run forecaster for specified venue and days ahead
+    Forecast the next days_ahead days for one venue and print them as JSON
 
     Args:
         venue_id: UUID of the venue
         days_ahead: Number of days to forecast (default: 14)
+        offline: Serve from the local history cache without TipSee
 
     Returns:
-        JSON string with results
+        Process exit code
     """
 
     try:
         print(f"Starting forecast for venue {venue_id}, {days_ahead} days ahead...", file=sys.stderr)
 
-        # Initialize forecaster
-        forecaster = DemandForecaster(venue_id)
-
-        # Train models
-        print("Training models...", file=sys.stderr)
-        accuracy = forecaster.train_models()
-        print(f"Model accuracy - Covers: {accuracy['covers_accuracy']:.2%}, Revenue: {accuracy['revenue_accuracy']:.2%}", file=sys.stderr)
+        # Logs go to stderr so stdout stays a single JSON document
+        with redirect_stdout(sys.stderr):
+            service = ForecastService(venue_id=venue_id, forecast_days=days_ahead, use_tipsee=not offline)
+            service.load()
+            rows = service.forecast(venue_id, days=days_ahead)
 
-        # Generate forecasts
         forecasts = []
-        for days in range(1, days_ahead + 1):
-            target_date = (datetime.now() + timedelta(days=days)).date()
-
-            # Generate forecast for each shift
-            for shift_type in ['lunch', 'dinner']:
-                try:
-                    forecast = forecaster.generate_forecast(target_date, shift_type=shift_type)
-                    forecasts.append({
-                        'date': str(target_date),
-                        'shift_type': shift_type,
-                        'covers': forecast['covers_predicted'],
-                        'revenue': forecast['revenue_predicted'],
-                        'confidence': forecast['confidence_level']
-                    })
-                    print(f"  ✓ {target_date} {shift_type}: {forecast['covers_predicted']} covers, ${forecast['revenue_predicted']:,.0f}", file=sys.stderr)
-                except Exception as e:
-                    print(f"  ✗ {target_date} {shift_type}: {str(e)}", file=sys.stderr)
+        for r in rows:
+            forecasts.append({
+                'date': r['business_date'],
+                'shift_type': 'dinner',
+                'covers': r['covers_predicted'],
+                'covers_lower': r['covers_lower'],
+                'covers_upper': r['covers_upper'],
+                'revenue': r['revenue_predicted'],
+                'confidence': r['confidence_level'],
+            })
+            revenue = f"${r['revenue_predicted']:,.0f}" if r['revenue_predicted'] is not None else "?"
+            print(f"  ✓ {r['business_date']} dinner: {r['covers_predicted']} covers, {revenue}", file=sys.stderr)
 
         # Return results as JSON
         result = {
@@ -63,7 +60,8 @@ def run_forecast(venue_id: str, days_ahead: int = 14):
             'venue_id': venue_id,
             'forecasts_generated': len(forecasts),
             'days_ahead': days_ahead,
-            'model_accuracy': accuracy,
+            'model_version': rows[0]['model_version'] if rows else None,
+            'tier': rows[0]['tier'] if rows else None,
             'forecasts': forecasts
         }
 
@@ -84,8 +82,9 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Generate demand forecasts')
     parser.add_argument('--venue-id', required=True, help='Venue UUID')
     parser.add_argument('--days-ahead', type=int, default=14, help='Number of days to forecast (default: 14)')
+    parser.add_argument('--offline', action='store_true', help='Use the local history cache without TipSee')
 
     args = parser.parse_args()
 
-    exit_code = run_forecast(args.venue_id, args.days_ahead)
+    exit_code = run_forecast(args.venue_id, args.days_ahead, args.offline)
     sys.exit(exit_code)
@@ -0,0 +1,103 @@
+"""
+Per-venue checkpoints for resumable forecaster runs.
+
+A non-dry forecaster run keeps a manifest under its run id: one
+forecast_run_manifests row with the run's params, and one
+forecast_run_venues row per venue that moves pending -> saved | failed.
+"saved" is written only once the venue's rows are persisted: right after
+its save in streaming mode (flush_venue_result, in the worker that ran it),
+after the bulk save otherwise. Pipeline skips and failed saves are "failed".
+
+forecaster.py --resume RUN_ID reopens the manifest, skips the saved venues
+and runs only failed / pending ones, checkpointing under the same run id (the
+attempt's own run report id goes in attempt_run_id). Resuming an id that has
+no manifest starts one under that id, so a scheduler can pass a stable id
+(e.g. the workflow run id) on every attempt. The params that shape the
+forecast (RESUME_PARAMS) must match the original run.
+
+The manifest lives in Supabase rather than the local cache so a retry on a
+fresh runner can read it. Checkpoint writes only warn on failure: a lost
+checkpoint means the venue is refitted on resume, never that it is skipped.
+
+Layout:
+    forecast_run_manifests  {run_id, model_version, params, created_at, updated_at}
+    forecast_run_venues     {run_id, venue_id, status, tier, rows_written, detail,
+                             attempt_run_id, updated_at}
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+VENUE_STATUSES = ("pending", "saved", "failed")
+
+# Params that must match between a run and its resumption
+RESUME_PARAMS = ("model_version", "venue_id", "forecast_days", "backend", "interval_mode", "shard")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class RunManifest:
+    """Checkpoints for one run id. Holds only the client and ids, so workers can rebuild it."""
+
+    def __init__(self, supabase, run_id: str, attempt_run_id: str):
+        self.supabase = supabase
+        self.run_id = run_id
+        self.attempt_run_id = attempt_run_id
+
+    def open(self, params: Dict) -> Set[str]:
+        """
+        Create the manifest, or reopen it and return the venue ids already saved.
+        Raises ValueError when RESUME_PARAMS differ from the original run's.
+        """
+        rows = (self.supabase.table("forecast_run_manifests").select("run_id, params, created_at")
+                .eq("run_id", self.run_id).execute().data or [])
+        if not rows:
+            self.supabase.table("forecast_run_manifests").insert({
+                "run_id": self.run_id, "model_version": params.get("model_version"),
+                "params": {k: params.get(k) for k in RESUME_PARAMS}, "created_at": _now(),
+                "updated_at": _now(),
+            }).execute()
+            return set()
+
+        original = rows[0]["params"] or {}
+        changed = [f"{k}: {original.get(k)!r} -> {params.get(k)!r}" for k in RESUME_PARAMS
+                   if original.get(k) != params.get(k)]
+        if changed:
+            raise ValueError(f"Run {self.run_id} was started with different params ({'; '.join(changed)})")
+        print(f"[INFO] Resuming run {self.run_id} (started {rows[0]['created_at']})")
+        saved = (self.supabase.table("forecast_run_venues").select("venue_id")
+                 .eq("run_id", self.run_id).eq("status", "saved").execute().data or [])
+        return {r["venue_id"] for r in saved}
+
+    def pending(self, venue_ids: List[str]):
+        """Mark the venues this attempt will run as pending."""
+        self._upsert([self._row(vid, "pending") for vid in venue_ids])
+
+    def checkpoint(self, results: List[Dict]):
+        """Record finished venue results (forecast_venue / flush_venue_result dicts)."""
+        self._upsert([
+            self._row(r["venue_id"], "saved" if r["status"] == "ok" else "failed",
+                      tier=r.get("tier"), rows_written=r.get("rows_written"),
+                      detail=None if r["status"] == "ok" else r["status"])
+            for r in results
+        ])
+
+    def _row(self, venue_id: str, status: str, tier: Optional[str] = None,
+             rows_written: Optional[int] = None, detail: Optional[str] = None) -> Dict:
+        return {
+            "run_id": self.run_id, "venue_id": venue_id, "status": status, "tier": tier,
+            "rows_written": rows_written, "detail": detail,
+            "attempt_run_id": self.attempt_run_id, "updated_at": _now(),
+        }
+
+    def _upsert(self, rows: List[Dict]):
+        if not rows:
+            return
+        try:
+            self.supabase.table("forecast_run_venues").upsert(rows, on_conflict="run_id,venue_id").execute()
+            self.supabase.table("forecast_run_manifests").update({"updated_at": _now()}) \
+                .eq("run_id", self.run_id).execute()
+        except Exception as e:
+            print(f"[WARN] Could not checkpoint {len(rows)} venues in run {self.run_id}: {e}")
@@ -0,0 +1,233 @@
+"""
+Per-stage timing and resource instrumentation for forecaster / backtest runs.
+
+StageTimer records wall time, CPU time, peak RSS and row counts for the named
+stages of one unit of work (a venue, or the run itself). It only holds plain
+dicts, so a venue's timings can be returned from a pool worker.
+
+CPU time includes reaped child processes (cmdstan for Prophet fits, pool
+workers once the pool closes). Peak RSS is the high-water mark at stage end
+of this process or its largest reaped child; it only ever grows, so the
+stage where it jumps is the one that allocated.
+
+RunReport collects run-level and per-venue timings, writes them as a JSON run
+report, optionally records a forecast_runs row, and prints the slowest venues
+and stages.
+
+Layout:
+    <root>/runs/<run_id>.json   {run_id, kind, started_at, finished_at, wall_s,
+                                 cpu_s, peak_rss_mb, params, counts,
+                                 stages: [...], venues: [...]}
+    stage:  {stage, wall_s, cpu_s, peak_rss_mb, rows}
+    venue:  {venue_id, name, tier, status, wall_s, cpu_s, peak_rss_mb, stages: [...]}
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is reported as None
+    resource = None
+
+RUN_REPORT_TOP = int(os.getenv("RUN_REPORT_TOP", "10"))
+
+
+def cpu_seconds() -> float:
+    """User + system CPU of this process and its reaped children."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak RSS (MB) of this process or its largest reaped child."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def new_run_id() -> str:
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+class StageTimer:
+    """Named stage timings for one unit of work."""
+
+    def __init__(self):
+        self.stages: List[Dict] = []
+        self._wall0 = time.perf_counter()
+        self._cpu0 = cpu_seconds()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        Time a block. Yields the stage record; set rec["rows"] inside the block
+        when the row count is only known afterwards. Recorded even if it raises.
+        """
+        rec = {"stage": name, "rows": rows}
+        wall0, cpu0 = time.perf_counter(), cpu_seconds()
+        try:
+            yield rec
+        finally:
+            rec["wall_s"] = round(time.perf_counter() - wall0, 4)
+            rec["cpu_s"] = round(cpu_seconds() - cpu0, 4)
+            rec["peak_rss_mb"] = peak_rss_mb()
+            self.stages.append(rec)
+
+    def summary(self) -> Dict:
+        """Totals since the timer was created plus the stage list."""
+        return {
+            "wall_s": round(time.perf_counter() - self._wall0, 4),
+            "cpu_s": round(cpu_seconds() - self._cpu0, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": list(self.stages),
+        }
+
+
+class RunReport:
+    """Run-level stages + per-venue timings for one forecaster or backtest run."""
+
+    def __init__(self, kind: str, params: Optional[Dict] = None, run_id: Optional[str] = None):
+        self.run_id = run_id or new_run_id()
+        self.kind = kind
+        self.params = params or {}
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.timer = StageTimer()
+        self.venues: List[Dict] = []
+        self.counts: Dict = {}
+
+    def stage(self, name: str, rows: Optional[int] = None):
+        return self.timer.stage(name, rows)
+
+    def add_venue(self, venue_id: str, name: Optional[str], tier: Optional[str],
+                  status: str, timings: Optional[Dict]):
+        """Record one venue from its StageTimer.summary() (None if it never ran)."""
+        timings = timings or {"wall_s": None, "cpu_s": None, "peak_rss_mb": None, "stages": []}
+        self.venues.append({
+            "venue_id": venue_id, "name": name, "tier": tier, "status": status, **timings,
+        })
+
+    def finish(self, **counts) -> Dict:
+        """Close the run and return the report dict."""
+        self.finished_at = datetime.now()
+        self.counts.update(counts)
+        return self.to_dict()
+
+    def to_dict(self) -> Dict:
+        totals = self.timer.summary()
+        return {
+            "run_id": self.run_id,
+            "kind": self.kind,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+            "wall_s": totals["wall_s"],
+            "cpu_s": totals["cpu_s"],
+            "peak_rss_mb": totals["peak_rss_mb"],
+            "params": self.params,
+            "counts": self.counts,
+            "stages": totals["stages"],
+            "venues": self.venues,
+        }
+
+    def write(self, root: Path, path: Optional[Path] = None) -> Path:
+        """Write the JSON report to path, or <root>/runs/<run_id>.json."""
+        if path is None:
+            path = Path(root) / "runs" / f"{self.run_id}.json"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2, default=str))
+        os.replace(tmp, path)
+        return path
+
+    def record(self, supabase, model_version: Optional[str] = None):
+        """Upsert the report into forecast_runs. Failures only warn."""
+        record_report(supabase, self.to_dict(), model_version)
+
+    def print_summary(self, top: int = RUN_REPORT_TOP):
+        """Run stages, venue stages summed by name, and the slowest venues."""
+        report = self.to_dict()
+        print(f"\nRUN TIMING ({self.run_id})")
+        rss = report["peak_rss_mb"]
+        print(f"  Wall {report['wall_s']:.1f}s, CPU {report['cpu_s']:.1f}s"
+              + (f", peak RSS {rss:.0f} MB" if rss is not None else ""))
+        # High-water mark after the first vs the last venue: flat means memory is bounded per venue
+        venue_rss = [v["peak_rss_mb"] for v in self.venues if v.get("peak_rss_mb") is not None]
+        if len(venue_rss) > 1:
+            print(f"  Peak RSS after first venue {venue_rss[0]:.0f} MB, after last venue "
+                  f"{venue_rss[-1]:.0f} MB ({len(venue_rss)} venues)")
+
+        _print_stage_table("Run stages", report["stages"])
+
+        venue_stages = [s for v in self.venues for s in v["stages"]]
+        _print_stage_table("Venue stages (summed across venues)", venue_stages)
+
+        timed = sorted((v for v in self.venues if v["wall_s"] is not None),
+                       key=lambda v: v["wall_s"], reverse=True)[:top]
+        if timed:
+            print(f"\n  Slowest venues")
+            print(f"  {'Venue':<30} {'Tier':>4} {'Status':>8} {'Wall':>8} {'CPU':>8}  Slowest stage")
+            for v in timed:
+                slowest = max(v["stages"], key=lambda s: s["wall_s"], default=None)
+                slow_str = f"{slowest['stage']} ({slowest['wall_s']:.1f}s)" if slowest else "-"
+                print(f"  {(v['name'] or v['venue_id'])[:30]:<30} {v['tier'] or '-':>4} {v['status']:>8} "
+                      f"{v['wall_s']:>7.1f}s {v['cpu_s']:>7.1f}s  {slow_str}")
+
+
+def record_report(supabase, report: Dict, model_version: Optional[str] = None):
+    """Upsert a report dict (RunReport.to_dict layout) into forecast_runs. Failures only warn."""
+    row = {
+        "run_id": report["run_id"],
+        "kind": report["kind"],
+        "model_version": model_version,
+        "started_at": report["started_at"],
+        "finished_at": report["finished_at"],
+        "wall_seconds": report["wall_s"],
+        "cpu_seconds": report["cpu_s"],
+        "peak_rss_mb": report["peak_rss_mb"],
+        "venues_ok": report["counts"].get("venues_ok"),
+        "venues_skipped": report["counts"].get("venues_skipped"),
+        "rows_written": report["counts"].get("rows_written"),
+        "params": report["params"],
+        "counts": report["counts"],
+        "stages": report["stages"],
+        "venues": report["venues"],
+    }
+    try:
+        supabase.table("forecast_runs").upsert(
+            json.loads(json.dumps(row, default=str)), on_conflict="run_id"
+        ).execute()
+        print(f"[INFO] Run {report['run_id']} recorded in forecast_runs")
+    except Exception as e:
+        print(f"[WARN] Could not record run in forecast_runs: {e}")
+
+
+def _print_stage_table(heading: str, stages: List[Dict]):
+    if not stages:
+        return
+    totals: Dict[str, Dict] = {}
+    for s in stages:
+        t = totals.setdefault(s["stage"], {"n": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "rss": None})
+        t["n"] += 1
+        t["wall_s"] += s["wall_s"]
+        t["cpu_s"] += s["cpu_s"]
+        t["rows"] += s.get("rows") or 0
+        if s.get("peak_rss_mb") is not None:
+            t["rss"] = max(t["rss"] or 0.0, s["peak_rss_mb"])
+    print(f"\n  {heading}")
+    print(f"  {'Stage':<22} {'Count':>6} {'Wall':>9} {'CPU':>9} {'Rows':>9} {'Peak RSS':>9}")
+    for name, t in sorted(totals.items(), key=lambda kv: kv[1]["wall_s"], reverse=True):
+        rss = f"{t['rss']:.0f}MB" if t["rss"] is not None else "-"
+        print(f"  {name:<22} {t['n']:>6} {t['wall_s']:>8.1f}s {t['cpu_s']:>8.1f}s "
+              f"{t['rows'] or '-':>9} {rss:>9}")
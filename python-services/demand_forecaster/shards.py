@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Venue sharding for forecaster.py / backtest.py runs split across machines.
+
+--shard i/n (1-based) keeps the venues assigned to shard i of n. Assignment
+is deterministic: venues are placed longest first (ties by venue_id) on the
+least-loaded shard, using each venue's wall time from the most recent
+recorded run of the same kind in forecast_runs that started before today
+(UTC). Runs recorded today are ignored so shards that start minutes apart
+still read the same weights. Venues without a recorded time count as the
+median known time; with no history at all every venue weighs the same.
+
+Assignments are sticky: each shard keeps a local cache (history, weather,
+models), so venues stay on the shard the last recorded merged run gave
+them (new venues go longest first onto the least-loaded shard). Only when
+that leaves the slowest shard more than SHARD_REBALANCE_TOLERANCE above a
+fresh placement is everything re-placed, and moved venues start cold.
+
+Each shard writes its own run report with the shard and its assigned venues
+in params. `python shards.py merge` checks that a set of shard reports covers
+every venue exactly once: all n shards present, assignments disjoint, every
+assigned venue reported by its shard, and (unless --no-db) the union equal
+to the active venue mappings. It writes one combined run report and exits 1
+on any gap or overlap.
+
+Pooled models (--backend global / hybrid) fit per shard, on that shard's
+venues only.
+
+Layout:
+    report params:  {..., "shard": "i/n", "shard_venues": [venue_id, ...],
+                     "shard_weights_from": [run_id, ...]}
+    merged report:  <cache>/runs/<run_id>.json, RunReport layout with
+                    params {"shard_runs": [run_id, ...], "shards": n,
+                            "shard_of": {venue_id: i}, ...}
+
+Usage:
+    python forecaster.py --shard 2/4
+    python backtest.py --rolling 4 --shard 1/2
+    python shards.py plan --shards 4                   # Print the assignment
+    python shards.py merge reports/*.json              # Check + combine shard reports
+    python shards.py merge reports/*.json --record-run # Also store the combined report
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from run_report import new_run_id, record_report
+
+SHARD_WEIGHT_RUNS = 20           # recorded runs scanned for per-venue wall times
+SHARD_REBALANCE_TOLERANCE = 0.15 # sticky slowest shard may exceed a fresh placement's by this much
+
+
+def parse_shard(spec: Optional[str]) -> Optional[Tuple[int, int]]:
+    """'i/n' -> (i, n) with 1 <= i <= n; None passes through."""
+    if spec is None:
+        return None
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard must be i/n, got {spec!r}")
+    if not 1 <= i <= n:
+        raise ValueError(f"--shard {spec}: i must be between 1 and n")
+    return i, n
+
+
+def venue_runtimes(supabase, kind: str) -> Tuple[Dict[str, float], List[str]]:
+    """
+    ({venue_id: wall_s}, run ids used) from the latest forecast_runs rows of
+    `kind` started before today (UTC); each venue takes its most recent time.
+    Failures only warn and return no weights.
+    """
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    try:
+        rows = (supabase.table("forecast_runs").select("run_id, venues")
+                .eq("kind", kind).lt("started_at", today)
+                .order("started_at", desc=True).order("run_id")
+                .limit(SHARD_WEIGHT_RUNS).execute().data or [])
+    except Exception as e:
+        print(f"[WARN] Could not read forecast_runs for shard weights: {e}")
+        return {}, []
+    runtimes, used = {}, []
+    for row in rows:
+        fresh = {v["venue_id"]: float(v["wall_s"]) for v in row.get("venues") or []
+                 if v.get("wall_s") is not None and v["venue_id"] not in runtimes}
+        if fresh:
+            runtimes.update(fresh)
+            used.append(row["run_id"])
+    return runtimes, used
+
+
+def previous_assignment(supabase, kind: str, n: int) -> Dict[str, int]:
+    """
+    {venue_id: shard} from the latest merged n-shard run of `kind` over all
+    venues (no --venue-id) started before today (UTC). Failures only warn and
+    return no assignment.
+    """
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    try:
+        rows = (supabase.table("forecast_runs").select("run_id, params")
+                .eq("kind", kind).lt("started_at", today)
+                .order("started_at", desc=True).order("run_id")
+                .limit(SHARD_WEIGHT_RUNS).execute().data or [])
+    except Exception as e:
+        print(f"[WARN] Could not read forecast_runs for the previous shard assignment: {e}")
+        return {}
+    for row in rows:
+        params = row.get("params") or {}
+        if params.get("shards") == n and params.get("shard_of") and not params.get("venue_id"):
+            return {vid: int(k) for vid, k in params["shard_of"].items()}
+    return {}
+
+
+def _place(venue_ids: List[str], weights: Dict[str, float], n: int,
+           shard_of: Dict[str, int]) -> Tuple[Dict[str, int], List[float]]:
+    """Add venue_ids longest-first onto the least-loaded shard, after the venues already in shard_of."""
+    loads = [0.0] * n
+    for vid, k in shard_of.items():
+        loads[k - 1] += weights[vid]
+    shard_of = dict(shard_of)
+    for vid in sorted(set(venue_ids), key=lambda v: (-weights[v], v)):
+        k = min(range(n), key=lambda s: (loads[s], s))
+        shard_of[vid] = k + 1
+        loads[k] += weights[vid]
+    return shard_of, loads
+
+
+def assign_shards(venue_ids: List[str], runtimes: Dict[str, float], n: int,
+                  previous: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    {venue_id: shard (1..n)}: venues keep their previous shard and new ones
+    go longest-first onto the least-loaded shard, unless that leaves the
+    slowest shard over SHARD_REBALANCE_TOLERANCE above placing every venue
+    afresh, in which case the fresh placement is used.
+    """
+    known = sorted(runtimes[v] for v in venue_ids if v in runtimes)
+    default = known[len(known) // 2] if known else 1.0
+    weights = {v: runtimes.get(v, default) for v in venue_ids}
+    fresh, fresh_loads = _place(venue_ids, weights, n, {})
+    kept = {v: previous[v] for v in set(venue_ids) if previous and 1 <= previous.get(v, 0) <= n}
+    if not kept:
+        return fresh
+    sticky, sticky_loads = _place([v for v in venue_ids if v not in kept], weights, n, kept)
+    if max(sticky_loads) <= max(fresh_loads) * (1 + SHARD_REBALANCE_TOLERANCE):
+        return sticky
+    return fresh
+
+
+def select_shard(mappings: List[Dict], shard: Tuple[int, int], supabase, kind: str) -> Tuple[List[Dict], Dict]:
+    """
+    The mappings assigned to shard (i, n), in their original order, plus the
+    params to add to the run report.
+    """
+    i, n = shard
+    runtimes, used = venue_runtimes(supabase, kind)
+    previous = previous_assignment(supabase, kind, n)
+    shard_of = assign_shards([m["venue_id"] for m in mappings], runtimes, n, previous)
+    mine = [m for m in mappings if shard_of[m["venue_id"]] == i]
+    moved = sum(vid in previous and previous[vid] != k for vid, k in shard_of.items())
+
+    loads = [0.0] * n
+    known = [v for v in shard_of if v in runtimes]
+    for vid, k in shard_of.items():
+        loads[k - 1] += runtimes.get(vid, 0.0)
+    print(f"[INFO] Shard {i}/{n}: {len(mine)}/{len(mappings)} venues "
+          f"(weights for {len(known)} from {len(used)} recorded runs; "
+          f"est. load {loads[i - 1]:.0f}s, max {max(loads):.0f}s; "
+          f"{moved} venues moved since the last run)")
+    return mine, {
+        "shard": f"{i}/{n}",
+        "shard_venues": sorted(m["venue_id"] for m in mine),
+        "shard_weights_from": used,
+    }
+
+
+# ============================================================================
+# MERGE
+# ============================================================================
+
+def check_coverage(reports: List[Dict], expected: Optional[List[str]] = None) -> List[str]:
+    """Problems with a set of shard reports (empty = every venue covered exactly once)."""
+    problems = []
+    specs = [r["params"].get("shard") for r in reports]
+    if None in specs:
+        return ["A report has no shard in params (not a --shard run)"]
+    ns = {int(s.split("/")[1]) for s in specs}
+    if len(ns) != 1:
+        return [f"Reports disagree on the shard count: {sorted(specs)}"]
+    n = ns.pop()
+    seen = [int(s.split("/")[0]) for s in specs]
+    missing = sorted(set(range(1, n + 1)) - set(seen))
+    dup = sorted({i for i in seen if seen.count(i) > 1})
+    if missing:
+        problems.append(f"Missing shard reports: {', '.join(f'{i}/{n}' for i in missing)}")
+    if dup:
+        problems.append(f"Duplicate shard reports: {', '.join(f'{i}/{n}' for i in dup)}")
+
+    assigned: Dict[str, List[str]] = {}
+    for r in reports:
+        for vid in r["params"].get("shard_venues", []):
+            assigned.setdefault(vid, []).append(r["params"]["shard"])
+        reported = {v["venue_id"] for v in r["venues"]}
+        unreported = sorted(set(r["params"].get("shard_venues", [])) - reported)
+        if unreported:
+            problems.append(f"Shard {r['params']['shard']} did not report {len(unreported)} assigned venues: "
+                            f"{', '.join(unreported)}")
+    overlap = {vid: shards for vid, shards in assigned.items() if len(shards) > 1}
+    for vid, shards in sorted(overlap.items()):
+        problems.append(f"Venue {vid} assigned to shards {', '.join(shards)}")
+    if expected is not None:
+        uncovered = sorted(set(expected) - set(assigned))
+        extra = sorted(set(assigned) - set(expected))
+        if uncovered:
+            problems.append(f"{len(uncovered)} venues in no shard: {', '.join(uncovered)}")
+        if extra:
+            problems.append(f"{len(extra)} shard venues not in the venue mappings: {', '.join(extra)}")
+    return problems
+
+
+def _sum_counts(reports: List[Dict]) -> Dict:
+    counts: Dict = {}
+    for r in reports:
+        for key, value in r["counts"].items():
+            if isinstance(value, dict):
+                sub = counts.setdefault(key, {})
+                for k, v in value.items():
+                    sub[k] = sub.get(k, 0) + v
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                counts[key] = counts.get(key, 0) + value
+    return counts
+
+
+def merge_reports(reports: List[Dict]) -> Dict:
+    """
+    One run report for the whole sharded run: wall time is the slowest shard
+    (the critical path), CPU and counts are summed, peak RSS is the largest.
+    """
+    rss = [r["peak_rss_mb"] for r in reports if r["peak_rss_mb"] is not None]
+    params = {k: v for k, v in reports[0]["params"].items()
+              if k not in ("shard", "shard_venues", "shard_weights_from")}
+    shard_of = {vid: int(r["params"]["shard"].split("/")[0])
+                for r in reports for vid in r["params"].get("shard_venues", [])}
+    return {
+        "run_id": new_run_id(),
+        "kind": reports[0]["kind"],
+        "started_at": min(r["started_at"] for r in reports),
+        "finished_at": max(r["finished_at"] or r["started_at"] for r in reports),
+        "wall_s": max(r["wall_s"] for r in reports),
+        "cpu_s": round(sum(r["cpu_s"] for r in reports), 4),
+        "peak_rss_mb": max(rss) if rss else None,
+        "params": {**params, "shards": len(reports),
+                   "shard_runs": [r["run_id"] for r in sorted(reports, key=lambda r: r["params"]["shard"])],
+                   "shard_of": dict(sorted(shard_of.items()))},
+        "counts": _sum_counts(reports),
+        "stages": [{**s, "stage": f"{s['stage']}[{r['params']['shard']}]"}
+                   for r in reports for s in r["stages"]],
+        "venues": [v for r in reports for v in r["venues"]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Venue shards for multi-machine runs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    plan_p = sub.add_parser("plan", help="Print the venue -> shard assignment")
+    plan_p.add_argument("--shards", type=int, required=True, help="Shard count")
+    plan_p.add_argument("--kind", type=str, default="forecast",
+                        help="forecast_runs kind to weight by (forecast, backtest, backtest_rolling)")
+    merge_p = sub.add_parser("merge", help="Check shard reports cover every venue once and combine them")
+    merge_p.add_argument("reports", nargs="+", help="Shard run report JSON files")
+    merge_p.add_argument("--no-db", action="store_true",
+                         help="Skip the check against the venue mappings (no Supabase)")
+    merge_p.add_argument("--venue-id", type=str, help="The run's --venue-id, if any")
+    merge_p.add_argument("--model-version", type=str, default=None,
+                         help="model_version for the forecast_runs row (default: MODEL_VERSION for forecast runs)")
+    merge_p.add_argument("--report", type=str, default=None,
+                         help="Write the combined report here (default: <cache>/runs/<run_id>.json)")
+    merge_p.add_argument("--record-run", action="store_true",
+                         help="Also store the combined report in the forecast_runs table")
+    args = parser.parse_args()
+
+    from forecaster import get_supabase, get_venue_mappings, FORECAST_CACHE_DIR, MODEL_VERSION
+
+    if args.command == "plan":
+        supabase = get_supabase()
+        mappings = get_venue_mappings(supabase)
+        runtimes, used = venue_runtimes(supabase, args.kind)
+        previous = previous_assignment(supabase, args.kind, args.shards)
+        shard_of = assign_shards([m["venue_id"] for m in mappings], runtimes, args.shards, previous)
+        print(f"[INFO] Weights from {len(used)} recorded {args.kind} runs")
+        for k in range(1, args.shards + 1):
+            venues = [m for m in mappings if shard_of[m["venue_id"]] == k]
+            load = sum(runtimes.get(m["venue_id"], 0.0) for m in venues)
+            print(f"\n  Shard {k}/{args.shards}: {len(venues)} venues, {load:.0f}s recorded")
+            for m in venues:
+                wall = runtimes.get(m["venue_id"])
+                print(f"    {m['tipsee_location_name'][:30]:<30} {f'{wall:.1f}s' if wall is not None else '-':>8}")
+        return
+
+    reports = [json.loads(Path(p).read_text()) for p in args.reports]
+    supabase = None if args.no_db else get_supabase()
+    expected = None
+    if supabase is not None:
+        expected = [m["venue_id"] for m in get_venue_mappings(supabase, args.venue_id)]
+    problems = check_coverage(reports, expected)
+    if problems:
+        for p in problems:
+            print(f"[ERROR] {p}")
+        sys.exit(1)
+
+    merged = merge_reports(reports)
+    path = Path(args.report) if args.report else FORECAST_CACHE_DIR / "runs" / f"{merged['run_id']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(merged, indent=2, default=str))
+    ok = sum(v["status"] == "ok" for v in merged["venues"])
+    print(f"[OK] {len(reports)} shards cover {len(merged['venues'])} venues exactly once "
+          f"({ok} ok), wall {merged['wall_s']:.0f}s (slowest shard), CPU {merged['cpu_s']:.0f}s")
+    print(f"[INFO] Combined run report: {path}")
+    if args.record_run and supabase is not None:
+        record_report(supabase, merged,
+                      args.model_version or (MODEL_VERSION if merged["kind"] == "forecast" else None))
+
+
+if __name__ == "__main__":
+    main()
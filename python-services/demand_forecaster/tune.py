@@ -0,0 +1,404 @@
+"""
+Hyperparameter search for the per-class Prophet priors.
+
+Builds rolling-origin folds per Prophet-tier venue once: the raw frame with
+its weather regressors is written to the fold cache, along with the days
+clean_training_data drops from each fold's training slice, and every
+candidate is scored against it. As in run_backtest, outlier removal sees only
+the training window and the holdout is scored against raw actuals. Candidates (changepoint / seasonality /
+holiday prior scale, seasonality mode) are fitted across a process pool,
+one task per (venue, candidate) covering all of that venue's folds.
+
+Each venue keeps the weather mode model_router gives it today, so only the
+priors change. Scores are day-weighted MAPE over every fold of every venue in
+a venue class; classes without their own entry in VENUE_CLASS_PROPHET_PARAMS
+are tuned together as "default". The class's current params are always a
+candidate, so the winner never scores worse than what runs now.
+
+The best params per class are written to prophet_params/v<N>.json (next
+version), which model_router loads through prophet_params_for. Review and
+commit the file to deploy it; PROPHET_PARAMS_FILE pins an older version.
+
+Layout:
+    <cache>/tuning/folds/<venue_id>.parquet   ds, y, weather columns (full span)
+    <cache>/tuning/folds/manifest.json        {venue_id: {fingerprint, venue_class,
+                                                weather_mode, cutoffs, horizon,
+                                                train_dropped: {cutoff: [days]}}}
+
+Usage:
+    python tune.py                          # random search, 40 candidates, 3 folds
+    python tune.py --search grid            # full grid (192 candidates)
+    python tune.py --workers 8 --folds 4 --horizon 28
+    python tune.py --dry-run                # report only, no config written
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from forecaster import (
+    get_tipsee_conn,
+    get_supabase,
+    get_venue_coords,
+    get_venue_mappings,
+    get_venue_closed_days,
+    get_venue_anomaly_dates,
+    filter_closed_days,
+    filter_anomaly_days,
+    load_venue_history,
+    get_historical_weather,
+    clean_training_data,
+    convert_weather_to_binary,
+    build_prophet_model,
+    _get_weather_columns,
+    model_router,
+    prophet_params_for,
+    VENUE_CLASS_PROPHET_PARAMS,
+    PROPHET_PARAMS_DIR,
+    TIER_C_MIN,
+    FORECAST_CACHE_DIR,
+)
+from forecast_memo import venue_fingerprint
+from history_store import HistoryStore
+from weather_cache import WeatherCache
+
+TUNE_GRID = {
+    "changepoint_prior_scale": [0.01, 0.03, 0.05, 0.08, 0.15, 0.3],
+    "seasonality_prior_scale": [1.0, 5.0, 10.0, 15.0],
+    "holidays_prior_scale": [1.0, 5.0, 10.0, 15.0],
+    "seasonality_mode": ["additive", "multiplicative"],
+}
+TUNE_FOLDS = int(os.getenv("TUNE_FOLDS", "3"))
+TUNE_HORIZON = int(os.getenv("TUNE_HORIZON", "28"))
+
+
+# ============================================================================
+# FOLDS
+# ============================================================================
+
+def class_key(venue_class: Optional[str]) -> str:
+    """Tuning bucket: the venue's class if it has its own params, else "default"."""
+    return venue_class if venue_class in VENUE_CLASS_PROPHET_PARAMS else "default"
+
+
+def fold_cutoffs(ds: pd.Series, folds: int, horizon: int) -> List[str]:
+    """
+    Rolling-origin cutoffs, newest first: each fold trains on ds <= cutoff and
+    scores the next `horizon` days. Folds whose training window would be
+    shorter than TIER_C_MIN days are dropped.
+    """
+    ds = pd.to_datetime(ds)
+    last = ds.max()
+    cutoffs = []
+    for k in range(folds):
+        cutoff = last - timedelta(days=horizon * (k + 1))
+        if (ds <= cutoff).sum() >= TIER_C_MIN:
+            cutoffs.append(str(cutoff.date()))
+    return cutoffs
+
+
+def prepare_frame(df: pd.DataFrame, weather_mode: str,
+                  hist_weather: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Prophet-ready (ds, y + weather regressors) frame over the venue's whole span."""
+    frame = df[["ds", "covers"]].rename(columns={"covers": "y"}).copy()
+    frame["ds"] = pd.to_datetime(frame["ds"])
+    frame["y"] = pd.to_numeric(frame["y"], errors="coerce").fillna(0)
+    if weather_mode == "off" or hist_weather is None or hist_weather.empty:
+        return frame
+    wx = convert_weather_to_binary(hist_weather) if weather_mode == "binary" else hist_weather
+    cols = _get_weather_columns(weather_mode)
+    frame = frame.merge(wx[["ds"] + cols], on="ds", how="left")
+    for col in cols:
+        frame[col] = frame[col].fillna(frame[col].median() if col == "temp_high" else 0)
+    return frame
+
+
+class FoldCache:
+    """Prepared per-venue tuning frames + fold cutoffs, rewritten only when inputs change."""
+
+    def __init__(self, root: Path):
+        self.dir = Path(root) / "tuning" / "folds"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.dir / "manifest.json"
+        self.manifest = json.loads(self.manifest_path.read_text()) if self.manifest_path.exists() else {}
+
+    def path(self, venue_id: str) -> Path:
+        return self.dir / f"{venue_id}.parquet"
+
+    def put(self, venue_id: str, frame: pd.DataFrame, entry: Dict) -> bool:
+        """Store a venue's frame; returns False if an identical one is already cached."""
+        fingerprint = venue_fingerprint({"frame": frame}, entry)
+        cached = self.manifest.get(venue_id)
+        if cached and cached["fingerprint"] == fingerprint and self.path(venue_id).exists():
+            return False
+        frame.to_parquet(self.path(venue_id), index=False)
+        self.manifest[venue_id] = {"fingerprint": fingerprint, **entry}
+        return True
+
+    def save_manifest(self):
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(tmp, self.manifest_path)
+
+
+def build_folds(mappings: List[Dict], venue_history: Dict[str, pd.DataFrame],
+                venue_coords: Dict[str, Dict], venue_closed_days: Dict[str, List[int]],
+                venue_anomalies: Dict[str, set], cache: FoldCache, folds: int, horizon: int,
+                weather_cache: Optional[WeatherCache] = None) -> Dict[str, Dict]:
+    """Write each Prophet-tier venue's tuning frame to the fold cache; returns its manifest entries."""
+    entries, written = {}, 0
+    for m in mappings:
+        vid = m["venue_id"]
+        df = venue_history.get(vid)
+        if df is None or df.empty:
+            continue
+        df = filter_closed_days(df, venue_closed_days.get(vid, []))
+        df = filter_anomaly_days(df, venue_anomalies.get(vid, set()))
+        coords = venue_coords.get(vid)
+        config = model_router(len(df), m.get("venue_class"), has_coords=coords is not None)
+        if not config.use_prophet:
+            continue
+        cutoffs = fold_cutoffs(df["ds"], folds, horizon)
+        if not cutoffs:
+            continue
+
+        # Clean each fold's training slice on its own, so outlier bounds never see the holdout
+        ds = pd.to_datetime(df["ds"])
+        train_dropped = {}
+        if config.use_outlier_removal:
+            for cutoff in cutoffs:
+                train = df[ds <= pd.Timestamp(cutoff)]
+                kept = pd.to_datetime(clean_training_data(train)["ds"])
+                dropped = pd.to_datetime(train["ds"])
+                train_dropped[cutoff] = [str(d.date()) for d in dropped[~dropped.isin(kept)]]
+
+        hist_weather = None
+        if config.use_weather != "off" and coords:
+            hist_weather = get_historical_weather(
+                coords["lat"], coords["lon"], coords["tz"],
+                str(ds.min().date()), str(ds.max().date()), cache=weather_cache,
+            )
+        weather_mode = config.use_weather if hist_weather is not None else "off"
+        entry = {
+            "name": m.get("tipsee_location_name"),
+            "venue_class": class_key(m.get("venue_class")),
+            "weather_mode": weather_mode,
+            "cutoffs": cutoffs,
+            "horizon": horizon,
+            "train_dropped": train_dropped,
+        }
+        written += cache.put(vid, prepare_frame(df, weather_mode, hist_weather), entry)
+        entries[vid] = cache.manifest[vid]
+    cache.save_manifest()
+    print(f"[INFO] Tuning folds: {len(entries)} venues, "
+          f"{sum(len(e['cutoffs']) for e in entries.values())} folds "
+          f"({written} rebuilt, {len(entries) - written} unchanged)")
+    return entries
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def candidate_params(search: str, n: int, seed: int, classes: List[str]) -> List[Dict]:
+    """Grid (all combinations) or a seeded random sample of it, plus every class's current params."""
+    keys = list(TUNE_GRID)
+    grid = [dict(zip(keys, values)) for values in itertools.product(*(TUNE_GRID[k] for k in keys))]
+    if search == "random" and n < len(grid):
+        grid = random.Random(seed).sample(grid, n)
+    candidates = []
+    for params in [dict(prophet_params_for(None if c == "default" else c)) for c in classes] + grid:
+        if params not in candidates:
+            candidates.append(params)
+    return candidates
+
+
+_worker_frames: Dict[str, pd.DataFrame] = {}
+
+
+def _score_candidate(task: Tuple) -> Tuple[str, int, float, int]:
+    """
+    Pool task: fit one candidate on every fold of one venue.
+    Returns (venue_id, candidate index, sum of APE %, scored days).
+    """
+    import logging
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    vid, path, entry, idx, params = task
+    frame = _worker_frames.get(vid)
+    if frame is None:
+        frame = _worker_frames[vid] = pd.read_parquet(path)
+
+    ape_sum, days = 0.0, 0
+    for cutoff_day in entry["cutoffs"]:
+        cutoff = pd.Timestamp(cutoff_day)
+        dropped = pd.to_datetime(entry.get("train_dropped", {}).get(cutoff_day, []))
+        train = frame[(frame["ds"] <= cutoff) & ~frame["ds"].isin(dropped)]
+        test = frame[(frame["ds"] > cutoff)
+                     & (frame["ds"] <= cutoff + pd.Timedelta(days=entry["horizon"]))]
+        test = test[test["y"] > 0]
+        if test.empty:
+            continue
+        model = build_prophet_model(weather_mode=entry["weather_mode"], prophet_params=params)
+        model.uncertainty_samples = 0  # point forecasts only
+        model.fit(train)
+        yhat = model.predict(test.drop(columns="y"))["yhat"].clip(lower=0).round(0).to_numpy()
+        ape_sum += float((np.abs(yhat - test["y"].to_numpy()) / test["y"].to_numpy() * 100).sum())
+        days += len(test)
+    return vid, idx, ape_sum, days
+
+
+def run_search(entries: Dict[str, Dict], cache: FoldCache, candidates: List[Dict],
+               workers: int) -> pd.DataFrame:
+    """Score every (venue, candidate) pair; returns venue_id, candidate, ape_sum, days."""
+    tasks = [(vid, str(cache.path(vid)), entry, idx, params)
+             for vid, entry in entries.items() for idx, params in enumerate(candidates)]
+    print(f"[INFO] Search: {len(candidates)} candidates x {len(entries)} venues = {len(tasks)} tasks, "
+          f"{workers} workers")
+    t0 = time.perf_counter()
+    rows = []
+    if workers > 1:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            # Tasks are venue-major, so a chunk touches at most two venues' frames
+            chunk = max(1, min(len(candidates), len(tasks) // (workers * 4) or 1))
+            for i, row in enumerate(pool.map(_score_candidate, tasks, chunksize=chunk), 1):
+                rows.append(row)
+                if i % max(1, len(tasks) // 10) == 0:
+                    print(f"  {i}/{len(tasks)} tasks ({time.perf_counter() - t0:.0f}s)")
+    else:
+        rows = [_score_candidate(t) for t in tasks]
+    print(f"[INFO] Search finished in {time.perf_counter() - t0:.1f}s")
+    return pd.DataFrame(rows, columns=["venue_id", "candidate", "ape_sum", "days"])
+
+
+def best_by_class(scores: pd.DataFrame, entries: Dict[str, Dict],
+                  candidates: List[Dict]) -> Dict[str, Dict]:
+    """Lowest day-weighted MAPE per class, with the class's current params' MAPE for comparison."""
+    scores = scores.assign(venue_class=scores["venue_id"].map(lambda v: entries[v]["venue_class"]))
+    by_class = scores.groupby(["venue_class", "candidate"])[["ape_sum", "days"]].sum()
+    by_class = by_class[by_class["days"] > 0]
+    by_class["mape"] = by_class["ape_sum"] / by_class["days"]
+
+    results = {}
+    for cls, part in by_class.groupby(level=0):
+        part = part.droplevel(0)
+        best = int(part["mape"].idxmin())
+        current = candidates.index(dict(prophet_params_for(None if cls == "default" else cls)))
+        results[cls] = {
+            "params": candidates[best],
+            "mape": round(float(part.loc[best, "mape"]), 2),
+            "current_mape": round(float(part.loc[current, "mape"]), 2) if current in part.index else None,
+            "venues": int(scores.loc[scores["venue_class"] == cls, "venue_id"].nunique()),
+            "days": int(part.loc[best, "days"]),
+        }
+    return results
+
+
+def write_config(results: Dict[str, Dict], search: Dict, out: Optional[str] = None) -> Path:
+    """Write results as the next prophet_params/v<N>.json (or to out)."""
+    versions = [int(f.stem[1:]) for f in PROPHET_PARAMS_DIR.glob("v*.json") if f.stem[1:].isdigit()]
+    version = max(versions, default=0) + 1
+    path = Path(out) if out else PROPHET_PARAMS_DIR / f"v{version}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "search": search,
+        "classes": results,
+    }, indent=2) + "\n")
+    return path
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def run_tuning(venue_id: Optional[str] = None, folds: int = TUNE_FOLDS, horizon: int = TUNE_HORIZON,
+               search: str = "random", candidates: int = 40, seed: int = 0, workers: int = 1,
+               use_cache: bool = True, dry_run: bool = False, out: Optional[str] = None):
+    """Build folds, search candidates across the pool, and write the best params per class."""
+    print("\n" + "=" * 70)
+    print(f"PROPHET PARAM SEARCH ({search}, {folds} folds x {horizon}d)")
+    print("=" * 70 + "\n")
+
+    supabase = get_supabase()
+    venue_coords = get_venue_coords(supabase)
+    venue_closed_days = get_venue_closed_days(supabase)
+    venue_anomalies = get_venue_anomaly_dates(supabase)
+    mappings = get_venue_mappings(supabase, venue_id)
+    print(f"[INFO] Venues: {len(mappings)}")
+
+    tipsee_conn = get_tipsee_conn()
+    try:
+        store = HistoryStore(FORECAST_CACHE_DIR) if use_cache else None
+        venue_history = load_venue_history(tipsee_conn, mappings, store)
+    finally:
+        tipsee_conn.close()
+
+    cache = FoldCache(FORECAST_CACHE_DIR)
+    entries = build_folds(mappings, venue_history, venue_coords, venue_closed_days, venue_anomalies,
+                          cache, folds, horizon, WeatherCache(FORECAST_CACHE_DIR) if use_cache else None)
+    if not entries:
+        print("[ERROR] No venue has enough history for a tuning fold")
+        return
+
+    classes = sorted({e["venue_class"] for e in entries.values()})
+    cands = candidate_params(search, candidates, seed, classes)
+    scores = run_search(entries, cache, cands, workers)
+    results = best_by_class(scores, entries, cands)
+
+    print(f"\n  {'Class':<18} {'Venues':>6} {'Current':>9} {'Best':>9}  Params")
+    print(f"  {'-' * 90}")
+    for cls, r in sorted(results.items()):
+        cur = f"{r['current_mape']:.1f}%" if r["current_mape"] is not None else "N/A"
+        p = r["params"]
+        print(f"  {cls:<18} {r['venues']:>6} {cur:>9} {r['mape']:>8.1f}%  "
+              f"cps={p['changepoint_prior_scale']} sps={p['seasonality_prior_scale']} "
+              f"hps={p['holidays_prior_scale']} {p['seasonality_mode']}")
+
+    if dry_run:
+        print("\n  Mode: DRY RUN (no config written)")
+    else:
+        path = write_config(results, {
+            "method": search, "candidates": len(cands), "seed": seed,
+            "folds": folds, "horizon": horizon, "venues": len(entries),
+        }, out)
+        print(f"\n[INFO] Wrote {path} (commit it to deploy; model_router loads the newest version)")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune per-class Prophet priors on rolling-origin folds")
+    parser.add_argument("--venue-id", type=str, help="Single venue UUID")
+    parser.add_argument("--folds", type=int, default=TUNE_FOLDS, help=f"Rolling-origin folds per venue (default: {TUNE_FOLDS})")
+    parser.add_argument("--horizon", type=int, default=TUNE_HORIZON, help=f"Days scored per fold (default: {TUNE_HORIZON})")
+    parser.add_argument("--search", choices=["grid", "random"], default="random",
+                        help="grid = every TUNE_GRID combination, random = --candidates sampled from it")
+    parser.add_argument("--candidates", type=int, default=40, help="Random-search sample size (default: 40)")
+    parser.add_argument("--seed", type=int, default=0, help="Random-search seed (default: 0)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Parallel fit processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the local history and weather caches")
+    parser.add_argument("--dry-run", action="store_true", help="Report the best params without writing a config")
+    parser.add_argument("--out", type=str, default=None, help="Write the config here instead of prophet_params/v<N>.json")
+    args = parser.parse_args()
+
+    run_tuning(venue_id=args.venue_id, folds=args.folds, horizon=args.horizon, search=args.search,
+               candidates=args.candidates, seed=args.seed, workers=max(1, args.workers),
+               use_cache=not args.no_cache, dry_run=args.dry_run, out=args.out)
+    sys.exit(0)
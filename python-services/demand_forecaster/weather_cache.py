@@ -0,0 +1,171 @@
+"""
+On-disk Open-Meteo weather cache for the demand forecaster.
+
+Daily weather rows (ds, temp_high, precip_inch) are stored per rounded
+coordinate + timezone, so venues at effectively the same location share one
+cache entry and one request. Archive rows are kept forever and only missing
+date gaps are requested. Archive days Open-Meteo has not published yet
+(null temperature) are stored as "pending" rows with a short TTL, so the tail
+of every window is requested once per coordinate per TTL (not once per venue
+or worker) and picked up as archive once published. Forecast rows expire
+after a TTL.
+
+Writes go through a unique temp file, so workers updating the same
+coordinate never share a half-written file (the last complete write wins).
+
+If a request fails, whatever the cache holds is returned, so runs work
+offline (and deterministically in tests) from a warm cache.
+
+Layout:
+    <root>/weather/<lat>_<lon>_<tz>.parquet   columns: ds, temp_high, precip_inch, source, fetched_at
+    source: archive | pending (unpublished archive days) | forecast
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+import pandas as pd
+
+WEATHER_COORD_PRECISION = int(os.getenv("WEATHER_COORD_PRECISION", "2"))  # 2dp ~ 1km
+WEATHER_FORECAST_TTL_HOURS = float(os.getenv("WEATHER_FORECAST_TTL_HOURS", "6"))
+WEATHER_PENDING_TTL_HOURS = float(os.getenv("WEATHER_PENDING_TTL_HOURS", "6"))
+
+WEATHER_COLUMNS = ["ds", "temp_high", "precip_inch"]
+_CACHE_COLUMNS = WEATHER_COLUMNS + ["source", "fetched_at"]
+
+# fetch(lat, lon, tz, start_date, end_date) / fetch(lat, lon, tz, days) -> raw frame or None
+ArchiveFetcher = Callable[[float, float, str, str, str], Optional[pd.DataFrame]]
+ForecastFetcher = Callable[[float, float, str, int], Optional[pd.DataFrame]]
+
+
+def _date_runs(dates: List[pd.Timestamp]) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Collapse sorted dates into contiguous (start, end) runs."""
+    runs = []
+    for d in dates:
+        if runs and d - runs[-1][1] == pd.Timedelta(days=1):
+            runs[-1] = (runs[-1][0], d)
+        else:
+            runs.append((d, d))
+    return runs
+
+
+class WeatherCache:
+    """Per-coordinate Parquet cache of Open-Meteo daily weather."""
+
+    def __init__(self, root: Path, precision: int = WEATHER_COORD_PRECISION,
+                 forecast_ttl_hours: float = WEATHER_FORECAST_TTL_HOURS,
+                 pending_ttl_hours: float = WEATHER_PENDING_TTL_HOURS):
+        self.dir = Path(root) / "weather"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.precision = precision
+        self.forecast_ttl = timedelta(hours=forecast_ttl_hours)
+        self.pending_ttl = timedelta(hours=pending_ttl_hours)
+        self.requests = 0
+        self.hits = 0
+
+    def key(self, lat: float, lon: float, tz: str) -> str:
+        """Cache key shared by all venues at the same rounded coordinates."""
+        p = self.precision
+        return f"{round(lat, p):.{p}f}_{round(lon, p):.{p}f}_{tz.replace('/', '-')}"
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.parquet"
+
+    def _read(self, key: str) -> pd.DataFrame:
+        path = self._path(key)
+        if not path.exists():
+            return pd.DataFrame(columns=_CACHE_COLUMNS)
+        df = pd.read_parquet(path)
+        df["ds"] = pd.to_datetime(df["ds"])
+        return df
+
+    def _write(self, key: str, df: pd.DataFrame):
+        with tempfile.NamedTemporaryFile(dir=self.dir, prefix=f"{key}.", suffix=".tmp", delete=False) as tmp:
+            df.sort_values(["source", "ds"]).reset_index(drop=True).to_parquet(tmp, index=False)
+        os.replace(tmp.name, self._path(key))
+
+    def _merge(self, cached: pd.DataFrame, fresh: pd.DataFrame, source: str) -> pd.DataFrame:
+        fresh = fresh[WEATHER_COLUMNS].copy()
+        fresh["ds"] = pd.to_datetime(fresh["ds"])
+        fresh["source"] = source
+        fresh["fetched_at"] = pd.Timestamp.now()
+        keep = cached[~((cached["source"] == source) & cached["ds"].isin(fresh["ds"]))]
+        return pd.concat([keep, fresh], ignore_index=True) if not keep.empty else fresh
+
+    def get_history(self, lat: float, lon: float, tz: str, start_date: str, end_date: str,
+                    fetch: ArchiveFetcher) -> Optional[pd.DataFrame]:
+        """
+        Archive weather for [start_date, end_date], requesting only uncached gaps
+        (pending days count as cached until their TTL runs out).
+        Returns raw rows (temp_high may be null for unpublished days) or None.
+        """
+        key = self.key(lat, lon, tz)
+        cached = self._read(key)
+        archive = cached[cached["source"] == "archive"]
+        pending = cached[(cached["source"] == "pending")
+                         & (pd.Timestamp.now() - cached["fetched_at"] < self.pending_ttl)]
+
+        wanted = pd.date_range(start_date, end_date, freq="D")
+        missing = sorted(set(wanted) - set(archive["ds"]) - set(pending["ds"]))
+        for run_start, run_end in _date_runs(missing):
+            self.requests += 1
+            fresh = fetch(lat, lon, tz, str(run_start.date()), str(run_end.date()))
+            if fresh is None or fresh.empty:
+                continue
+            complete = fresh[fresh["temp_high"].notna()]
+            unpublished = fresh[fresh["temp_high"].isna()]
+            if not complete.empty:
+                cached = self._merge(cached, complete, "archive")
+                published = cached["source"] == "archive"
+                cached = cached[~((cached["source"] == "pending")
+                                  & cached["ds"].isin(cached.loc[published, "ds"]))]
+            if not unpublished.empty:
+                cached = self._merge(cached, unpublished, "pending")
+            self._write(key, cached)
+        if not missing:
+            self.hits += 1
+
+        archive = cached[(cached["source"] == "archive") & cached["ds"].isin(wanted)]
+        pending = cached[(cached["source"] == "pending") & cached["ds"].isin(wanted)
+                         & ~cached["ds"].isin(archive["ds"])]
+        rows = pd.concat([archive[WEATHER_COLUMNS], pending[WEATHER_COLUMNS]], ignore_index=True)
+        if rows.empty:
+            return None
+        rows["ds"] = pd.to_datetime(rows["ds"])
+        return rows.sort_values("ds").reset_index(drop=True)
+
+    def get_forecast(self, lat: float, lon: float, tz: str, days: int,
+                     fetch: ForecastFetcher) -> Optional[pd.DataFrame]:
+        """
+        Forecast weather for the next `days` days. Served from cache while the
+        cached forecast is younger than the TTL and covers the horizon.
+        """
+        key = self.key(lat, lon, tz)
+        cached = self._read(key)
+        forecast = cached[cached["source"] == "forecast"]
+
+        today = pd.Timestamp(datetime.now().date())
+        wanted = pd.date_range(today, periods=min(days, 16), freq="D")
+        fresh_enough = (not forecast.empty
+                        and pd.Timestamp.now() - forecast["fetched_at"].min() < self.forecast_ttl
+                        and set(wanted) <= set(forecast["ds"]))
+        if fresh_enough:
+            self.hits += 1
+        else:
+            self.requests += 1
+            fresh = fetch(lat, lon, tz, days)
+            if fresh is not None and not fresh.empty:
+                cached = cached[cached["source"] != "forecast"]
+                cached = self._merge(cached, fresh, "forecast")
+                self._write(key, cached)
+                forecast = cached[cached["source"] == "forecast"]
+            elif not forecast.empty:
+                print(f"  [WARN] Weather forecast unavailable, using cached forecast "
+                      f"from {forecast['fetched_at'].min():%Y-%m-%d %H:%M}")
+
+        rows = forecast[forecast["ds"].isin(wanted)][WEATHER_COLUMNS]
+        if rows.empty:
+            return None
+        return rows.sort_values("ds").reset_index(drop=True)
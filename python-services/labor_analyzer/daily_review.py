@@ -93,6 +93,15 @@ class DailyForecastReview:
 
         print(f"📋 Found {len(shifts)} scheduled shifts to review\n")
 
+        # Forecast moves for the window, from the forecaster's forecast_changes feed
+        self.forecast_changes = self._load_forecast_changes(
+            min(s['business_date'] for s in shifts),
+            max(s['business_date'] for s in shifts),
+        )
+        self._schedule_generated_at: Dict[str, Optional[str]] = {}
+        print(f"📈 {sum(len(c) for c in self.forecast_changes.values())} forecast changes "
+              f"across {len(self.forecast_changes)} shifts\n")
+
         adjustments = []
 
         # Review each shift
@@ -135,12 +144,12 @@ class DailyForecastReview:
     def _get_upcoming_shifts(self, start: datetime, end: datetime) -> List[Dict]:
         """Get all scheduled shifts in the review window"""
         response = supabase.table('shift_assignments') \
-            .select(`
+            .select("""
                 *,
                 employee:employees(id, first_name, last_name),
                 position:positions(id, name, base_hourly_rate),
                 schedule:weekly_schedules(id, status)
-            `) \
+            """) \
             .eq('venue_id', self.venue_id) \
             .eq('status', 'scheduled') \
             .gte('scheduled_start', start.isoformat()) \
@@ -156,24 +165,22 @@ class DailyForecastReview:
         shift_start = datetime.fromisoformat(shift['scheduled_start'])
         hours_until_shift = (shift_start - now).total_seconds() / 3600
 
-        # Get latest forecast for this shift
-        latest_forecast = self._get_latest_forecast(
-            shift['business_date'],
-            shift['shift_type']
-        )
-
-        if not latest_forecast:
+        # Forecast moves since the schedule was generated (nothing moved -> nothing to review)
+        changes = self.forecast_changes.get((shift['business_date'], shift['shift_type']), [])
+        if not changes:
             return None
 
-        # Get original forecast (when schedule was created)
-        original_forecast = self._get_original_forecast(
-            shift['schedule_id'],
-            shift['business_date'],
-            shift['shift_type']
-        )
-
-        if not original_forecast:
+        generated_at = self._get_schedule_generated_at(shift['schedule_id'])
+        if not generated_at:
             return None
+        changes = [c for c in changes
+                   if datetime.fromisoformat(c['created_at']) > datetime.fromisoformat(generated_at)]
+        if not changes or changes[0]['covers_prev'] is None:
+            return None
+
+        # Original = the forecast the first later change replaced; latest = the last change
+        original_forecast = {'covers_predicted': changes[0]['covers_prev']}
+        latest_forecast = {'covers_predicted': changes[-1]['covers_new']}
 
         # Calculate variance
         covers_variance = latest_forecast['covers_predicted'] - original_forecast['covers_predicted']
@@ -193,45 +200,33 @@ class DailyForecastReview:
 
         return None
 
-    def _get_latest_forecast(self, business_date: str, shift_type: str) -> Optional[Dict]:
-        """Get most recent forecast for a shift"""
-        response = supabase.table('demand_forecasts') \
-            .select('*') \
+    def _load_forecast_changes(self, start_date: str, end_date: str) -> Dict[tuple, List[Dict]]:
+        """Forecast changes for the venue's shifts in [start_date, end_date], oldest first"""
+        response = supabase.table('forecast_changes') \
+            .select('business_date, shift_type, covers_prev, covers_new, covers_delta_pct, created_at') \
             .eq('venue_id', self.venue_id) \
-            .eq('business_date', business_date) \
-            .eq('shift_type', shift_type) \
-            .order('created_at', desc=True) \
-            .limit(1) \
-            .execute()
-
-        return response.data[0] if response.data else None
-
-    def _get_original_forecast(self, schedule_id: str, business_date: str, shift_type: str) -> Optional[Dict]:
-        """Get forecast that was used when creating the schedule"""
-        # Get schedule creation time
-        schedule_response = supabase.table('weekly_schedules') \
-            .select('generated_at') \
-            .eq('id', schedule_id) \
-            .single() \
-            .execute()
-
-        if not schedule_response.data:
-            return None
-
-        generated_at = schedule_response.data['generated_at']
-
-        # Get forecast closest to schedule generation time
-        response = supabase.table('demand_forecasts') \
-            .select('*') \
-            .eq('venue_id', self.venue_id) \
-            .eq('business_date', business_date) \
-            .eq('shift_type', shift_type) \
-            .lte('created_at', generated_at) \
-            .order('created_at', desc=True) \
-            .limit(1) \
+            .gte('business_date', start_date) \
+            .lte('business_date', end_date) \
+            .order('created_at') \
             .execute()
 
-        return response.data[0] if response.data else None
+        changes: Dict[tuple, List[Dict]] = {}
+        for row in response.data or []:
+            changes.setdefault((row['business_date'], row['shift_type']), []).append(row)
+        return changes
+
+    def _get_schedule_generated_at(self, schedule_id: str) -> Optional[str]:
+        """When the schedule was generated (the forecast it was built on), cached per schedule"""
+        if schedule_id not in self._schedule_generated_at:
+            schedule_response = supabase.table('weekly_schedules') \
+                .select('generated_at') \
+                .eq('id', schedule_id) \
+                .single() \
+                .execute()
+            self._schedule_generated_at[schedule_id] = (
+                schedule_response.data['generated_at'] if schedule_response.data else None
+            )
+        return self._schedule_generated_at[schedule_id]
 
     def _evaluate_cut(self, shift: Dict, forecast: Dict, hours_until: float, variance_pct: float) -> Optional[Dict]:
         """Evaluate if cutting this shift makes financial sense"""
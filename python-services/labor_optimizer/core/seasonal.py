@@ -1,11 +1,30 @@
 """
 Seasonal factors — look up multipliers from the seasonal_calendar table.
+
+Events are fetched once per process (global rows once, each venue's rows
+once) into the shared business calendar, so a multi-day forecast costs one
+query per venue instead of two per date.
 """
 
 from datetime import date, datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
+from business_calendar import SEASONAL_CALENDAR_SELECT, get_calendar
 from ..db import get_db
 
+_loaded_scopes: Set[Optional[str]] = set()   # None = global rows
+
+
+def _load_events(venue_id: str):
+    """Pull global and venue seasonal_calendar rows into the shared calendar (once each)."""
+    db = get_db()
+    cal = get_calendar()
+    if None not in _loaded_scopes:
+        cal.add_events(db.select("seasonal_calendar", SEASONAL_CALENDAR_SELECT, venue_id="is.null"))
+        _loaded_scopes.add(None)
+    if venue_id not in _loaded_scopes:
+        cal.add_events(db.select("seasonal_calendar", SEASONAL_CALENDAR_SELECT, venue_id=f"eq.{venue_id}"))
+        _loaded_scopes.add(venue_id)
+
 
 def get_seasonal_factor(
     venue_id: str,
@@ -24,42 +43,15 @@ def get_seasonal_factor(
             'hourly_multipliers': dict or None,
         }
     """
-    db = get_db()
-
     if isinstance(target_date, datetime):
         target_date = target_date.date()
 
-    date_str = target_date.isoformat()
-
-    # Query venue-specific events first
-    events = db.select(
-        "seasonal_calendar",
-        "event_name,covers_multiplier,hourly_multipliers,notes",
-        event_date=f"eq.{date_str}",
-        venue_id=f"eq.{venue_id}",
-    )
-
-    # Fall back to global events
-    if not events:
-        events = db.select(
-            "seasonal_calendar",
-            "event_name,covers_multiplier,hourly_multipliers,notes",
-            event_date=f"eq.{date_str}",
-            venue_id="is.null",
-        )
-
-    if events:
-        ev = events[0]
-        return {
-            "multiplier": float(ev.get("covers_multiplier", 1.0)),
-            "event_name": ev.get("event_name"),
-            "notes": ev.get("notes"),
-            "hourly_multipliers": ev.get("hourly_multipliers"),
-        }
+    _load_events(venue_id)
+    ev = get_calendar().event(venue_id, target_date)
 
     return {
-        "multiplier": 1.0,
-        "event_name": None,
-        "notes": None,
-        "hourly_multipliers": None,
+        "multiplier": ev["covers_multiplier"],
+        "event_name": ev["event_name"],
+        "notes": ev["notes"],
+        "hourly_multipliers": ev["hourly_multipliers"],
     }
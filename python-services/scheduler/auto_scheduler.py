@@ -18,6 +18,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import httpx
 from dotenv import load_dotenv
 
+from business_calendar import get_calendar
+
 load_dotenv()  # .env
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env.local'), override=True)
 
@@ -381,7 +383,7 @@ class AutoScheduler:
         self.staffing_patterns = []
         self.optimization_mode = 'fallback'
         self.hourly_forecast = {}   # {date_str: {hourly_servers: {...}, hourly_bartenders: {...}, covers, revenue}}
-        self.closed_weekdays = set()  # {0} = Monday closed
+        self.closed_weekdays = set()  # {0} = Monday closed (business_calendar closed days)
 
     # ── Data Loading ────────────────────────────────────────────────
 
@@ -619,17 +621,79 @@ class AutoScheduler:
         except Exception:
             pass
 
+    def _wave_positions(self) -> Tuple[Optional[Tuple[str, Dict]], Optional[Tuple[str, Dict]]]:
+        """Primary (id, position) for servers and bartenders, the wave-scheduled positions."""
+        server_pos = None   # (id, position_dict)
+        bartender_pos = None
+        for pid, p in self.positions.items():
+            pl = p['name'].lower()
+            if 'server' in pl and 'food' not in pl and not server_pos:
+                server_pos = (pid, p)
+            if 'bartender' in pl and not bartender_pos:
+                bartender_pos = (pid, p)
+        return server_pos, bartender_pos
+
+    def _load_demand_forecast_hourly(self, week_start: str, week_end: str):
+        """Load hourly server/bartender curves from the forecaster's demand_forecasts_hourly
+        (latest vintage per business date, via the demand_forecasts_hourly_latest view).
+
+        Each day's hourly covers (the daily forecast split by the venue's learned
+        arrival curve) become on-floor counts at the position's CPLH, capped at the
+        active headcount. Covers/revenue stay with demand_forecasts. Hours after
+        midnight are kept as 24+ so waves run past close in order.
+        """
+        try:
+            # Latest vintage per business date only: at most 7 x 24 rows, under the PostgREST row cap
+            rows = db.select(
+                'demand_forecasts_hourly_latest',
+                'business_date,hour,covers_predicted,revenue_predicted',
+                venue_id=f'eq.{self.venue_id}',
+                **{'and': f'(business_date.gte.{week_start},business_date.lte.{week_end})'},
+                order='business_date,hour',
+            )
+        except Exception as e:
+            print(f"[HOURLY] Could not load demand_forecasts_hourly_latest: {e}", flush=True)
+            return
+        if not rows:
+            return
+
+        headcount: Dict[str, int] = {}
+        for emp in self.employees:
+            headcount[emp.get('primary_position_id')] = headcount.get(emp.get('primary_position_id'), 0) + 1
+
+        curves = {}
+        for key, pos in zip(('hourly_servers', 'hourly_bartenders'), self._wave_positions()):
+            if pos:
+                pid, p = pos
+                curves[key] = (self._get_cplh_for_position(pid, p['name'], 'dinner'), headcount.get(pid, 0))
+
+        days: Dict[str, Dict] = {}
+        for r in rows:
+            day = days.setdefault(r['business_date'], {'covers': 0.0, 'revenue': 0.0})
+            covers = float(r.get('covers_predicted') or 0)
+            day['covers'] += covers
+            day['revenue'] += float(r.get('revenue_predicted') or 0)
+            hour = int(r['hour'])
+            hour = str(hour + 24 if hour < 5 else hour)
+            for key, (cplh, cap) in curves.items():
+                needed = math.ceil(covers / cplh) if cplh > 0 and covers >= 1 else 0
+                day.setdefault(key, {})[hour] = min(needed, cap) if cap else needed
+
+        for date_str, day in days.items():
+            day['covers'] = round(day['covers'])
+            day['revenue'] = round(day['revenue'], 2)
+            self.hourly_forecast[date_str] = day
+
+        print(f"[HOURLY] Loaded forecaster hourly curves for {len(days)} days", flush=True)
+
     def _load_hourly_forecast(self, forecast_path: Optional[str] = None):
-        """Load hourly staffing forecast from JSON file.
+        """Load hourly staffing forecast from a hand-made JSON file (--forecast).
 
-        Overrides demand_forecasts with more accurate per-day covers/revenue
+        Overrides demand_forecasts with the file's per-day covers/revenue
         and provides hour-by-hour server/bartender counts for wave scheduling.
+        Without a file the forecaster's hourly curves are used instead.
         """
-        if not forecast_path:
-            # Auto-detect: look for hourly_forecast.json next to this script
-            forecast_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hourly_forecast.json')
-
-        if not os.path.exists(forecast_path):
+        if not forecast_path or not os.path.exists(forecast_path):
             return
 
         try:
@@ -775,14 +839,7 @@ class AutoScheduler:
         requirements = []
 
         # Find primary server/bartender positions for wave scheduling
-        server_pos = None   # (id, position_dict)
-        bartender_pos = None
-        for pid, p in self.positions.items():
-            pl = p['name'].lower()
-            if 'server' in pl and 'food' not in pl and not server_pos:
-                server_pos = (pid, p)
-            if 'bartender' in pl and not bartender_pos:
-                bartender_pos = (pid, p)
+        server_pos, bartender_pos = self._wave_positions()
 
         hourly_processed = set()  # track (date, 'server'/'bartender') to avoid duplicates
 
@@ -791,7 +848,7 @@ class AutoScheduler:
             date_str = date.isoformat()
 
             # Skip closed days
-            if date.weekday() in self.closed_weekdays:
+            if get_calendar().is_closed(date, self.closed_weekdays):
                 print(f"  {date.strftime('%a')} {date_str}: CLOSED", flush=True)
                 continue
 
@@ -1263,7 +1320,8 @@ class AutoScheduler:
         self._fetch_optimization_settings()
         self._fetch_manager_feedback()
         self._fetch_staffing_patterns()
-        # Load hourly forecasts: prefer active covers DB, fall back to JSON file
+        # Load hourly forecasts: forecaster curves, overridden by active covers DB or an explicit JSON file
+        self._load_demand_forecast_hourly(week_start.isoformat(), week_end.isoformat())
         if getattr(self, '_use_active_covers', False):
             self._load_active_covers_forecast(week_start_date, getattr(self, '_active_covers_scenario', 'buffered'))
         self._load_hourly_forecast(getattr(self, '_forecast_path', None))
@@ -1508,7 +1566,8 @@ def main():
     parser.add_argument('--venue-id', required=True, help='Venue ID')
     parser.add_argument('--week-start', required=True, help='Week start date (YYYY-MM-DD)')
     parser.add_argument('--save', action='store_true', help='Save schedule to database')
-    parser.add_argument('--forecast', default=None, help='Path to hourly forecast JSON file')
+    parser.add_argument('--forecast', default=None,
+                        help='Path to an hourly forecast JSON file (overrides demand_forecasts_hourly)')
     parser.add_argument('--use-active-covers', action='store_true', help='Load forecasts from active covers DB (labor_optimizer)')
     parser.add_argument('--ac-scenario', default='buffered', choices=['lean', 'buffered', 'safe'], help='Active covers scenario')
 
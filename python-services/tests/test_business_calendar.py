@@ -0,0 +1,76 @@
+"""
+BusinessCalendar lookups outside the initial year range: the calendar
+rebuilds itself to cover them, and every lookup must index the rebuilt
+arrays.
+
+Run from python-services/:  python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from business_calendar import BusinessCalendar
+
+
+@pytest.fixture
+def cal():
+    return BusinessCalendar(2024, 2026)
+
+
+def test_dow_before_range(cal):
+    assert cal.dow("2020-01-04") == 5          # Saturday
+    assert cal.start_year == 2020
+
+
+def test_dow_after_range(cal):
+    assert cal.dow("2031-01-06") == 0          # Monday
+    assert cal.end_year == 2031
+
+
+def test_day_type_after_range(cal):
+    assert cal.day_type("2030-11-28") == "holiday"   # Thanksgiving
+    assert cal.holiday_name("2030-11-28") == "Thanksgiving"
+
+
+def test_holiday_before_range(cal):
+    assert cal.is_holiday("2015-07-04")
+    assert not cal.is_holiday("2015-07-05")
+
+
+def test_closed_mixed_range(cal):
+    dates = pd.to_datetime(["2015-06-01", "2026-01-05", "2026-01-06"])   # Mon, Mon, Tue
+    np.testing.assert_array_equal(cal.closed(dates, [0]), [True, True, False])
+
+
+def test_join_matches_pandas(cal):
+    ds = pd.Series(pd.date_range("2012-12-25", "2033-01-05", freq="37D"))
+    joined = cal.join(ds)
+    np.testing.assert_array_equal(joined["dow"].to_numpy(), ds.dt.dayofweek.to_numpy())
+
+
+def test_events_outside_range(cal):
+    cal.set_events([
+        {"venue_id": None, "event_date": "2030-01-05", "event_name": "Far future",
+         "covers_multiplier": 1.5},
+        {"venue_id": "v1", "event_date": "2019-03-02", "event_name": "Old", "covers_multiplier": 0.5},
+    ])
+    out = cal.events(None, ["2026-01-05", "2030-01-05"])
+    assert out["covers_multiplier"].tolist() == [1.0, 1.5]
+    assert out["event_name"].isna().tolist() == [True, False]
+    assert out["event_name"].iloc[1] == "Far future"
+    assert cal.event("v1", "2019-03-02")["covers_multiplier"] == 0.5
+
+
+def test_events_then_lookup_outside_range(cal):
+    cal.set_events([{"venue_id": None, "event_date": "2025-12-31", "event_name": "NYE",
+                     "covers_multiplier": 2.0}])
+    assert cal.event(None, "2025-12-31")["covers_multiplier"] == 2.0
+    # A lookup that grows the calendar after the event arrays were cached
+    out = cal.events(None, ["2010-01-01", "2025-12-31", "2035-01-01"])
+    assert out["covers_multiplier"].tolist() == [1.0, 2.0, 1.0]
@@ -0,0 +1,30 @@
+-- Forecast runs: one row per demand_forecaster / backtest run, written with
+-- --record-run. Holds run totals plus the per-stage and per-venue timings
+-- (wall, CPU, peak RSS, rows) from the JSON run report, so slow nightly runs
+-- can be traced to TipSee, weather, fit, predict or the upsert.
+
+CREATE TABLE IF NOT EXISTS forecast_runs (
+  run_id          TEXT PRIMARY KEY,                -- e.g. 20260301-043012-a1b2c3
+  kind            TEXT NOT NULL,                   -- 'forecast' | 'backtest'
+  model_version   TEXT,
+  started_at      TIMESTAMPTZ NOT NULL,
+  finished_at     TIMESTAMPTZ,
+  wall_seconds    NUMERIC(10,2),
+  cpu_seconds     NUMERIC(10,2),
+  peak_rss_mb     NUMERIC(10,1),
+  venues_ok       INTEGER,
+  venues_skipped  INTEGER,
+  rows_written    INTEGER,
+  params          JSONB NOT NULL DEFAULT '{}'::jsonb,   -- CLI options for the run
+  counts          JSONB NOT NULL DEFAULT '{}'::jsonb,   -- memo hits, tier distribution, ...
+  stages          JSONB NOT NULL DEFAULT '[]'::jsonb,   -- run-level [{stage, wall_s, cpu_s, peak_rss_mb, rows}]
+  venues          JSONB NOT NULL DEFAULT '[]'::jsonb,   -- [{venue_id, name, tier, status, wall_s, ..., stages}]
+  created_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_forecast_runs_kind_started ON forecast_runs(kind, started_at DESC);
+
+ALTER TABLE forecast_runs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "service_role_all" ON forecast_runs
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
@@ -0,0 +1,37 @@
+-- get_day_type() by rule instead of a hardcoded 2025-2026 holiday list, so
+-- forecasts past 2026 still get 'holiday'. Same rules as the Python
+-- business calendar (python-services/business_calendar.py):
+-- New Year's Day, MLK Day (3rd Mon Jan), Presidents' Day (3rd Mon Feb),
+-- Memorial Day (last Mon May), Jul 4, Labor Day (1st Mon Sep),
+-- Thanksgiving (4th Thu Nov) and the day after, Dec 25, Dec 31.
+-- No observed-date shifts.
+
+CREATE OR REPLACE FUNCTION get_day_type(d DATE)
+RETURNS day_type AS $$
+DECLARE
+  dow INTEGER := EXTRACT(DOW FROM d);     -- 0=Sun .. 6=Sat
+  m   INTEGER := EXTRACT(MONTH FROM d);
+  dom INTEGER := EXTRACT(DAY FROM d);
+  nth INTEGER := (EXTRACT(DAY FROM d)::INTEGER - 1) / 7 + 1;  -- nth weekday of the month
+BEGIN
+  IF (m = 1 AND dom = 1)
+     OR (m = 1 AND dow = 1 AND nth = 3)
+     OR (m = 2 AND dow = 1 AND nth = 3)
+     OR (m = 5 AND dow = 1 AND dom > 24)
+     OR (m = 7 AND dom = 4)
+     OR (m = 9 AND dow = 1 AND nth = 1)
+     OR (m = 11 AND dow = 4 AND nth = 4)
+     OR (m = 11 AND dow = 5 AND dom BETWEEN 23 AND 29)
+     OR (m = 12 AND dom IN (25, 31))
+  THEN
+    RETURN 'holiday'::day_type;
+  END IF;
+
+  CASE dow
+    WHEN 0 THEN RETURN 'sunday'::day_type;
+    WHEN 5 THEN RETURN 'friday'::day_type;
+    WHEN 6 THEN RETURN 'saturday'::day_type;
+    ELSE RETURN 'weekday'::day_type;
+  END CASE;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
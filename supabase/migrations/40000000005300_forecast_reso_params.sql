@@ -0,0 +1,19 @@
+-- Forecast reso params: the learned reservation elasticity behind each venue's
+-- latest demand forecast (per-DOW betas and DOW average reso covers), written
+-- by demand_forecaster/forecaster.py on save. nowcast.py re-applies the reso
+-- adjustment to the stored forecast as bookings arrive, without refitting.
+-- Null params mean the venue's forecast carries no reso adjustment.
+
+CREATE TABLE IF NOT EXISTS forecast_reso_params (
+  venue_id        UUID PRIMARY KEY REFERENCES venues(id) ON DELETE CASCADE,
+  forecast_date   DATE NOT NULL,                   -- run that learned the params
+  model_version   TEXT NOT NULL,
+  reso_betas      JSONB,                           -- {"0": beta_mon, ..., "6": beta_sun}
+  dow_avg_resos   JSONB,                           -- {"0": avg_reso_covers_mon, ...}
+  updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+ALTER TABLE forecast_reso_params ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "service_role_all" ON forecast_reso_params
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
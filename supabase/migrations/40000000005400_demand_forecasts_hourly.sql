@@ -0,0 +1,50 @@
+-- Hourly demand forecasts: each daily demand_forecasts row split by the
+-- venue's intraday arrival curve (share of covers per check open hour, per
+-- DOW, learned from TipSee checks by demand_forecaster/intraday_curves.py).
+-- Written alongside the daily rows with the same forecast_date, so readers
+-- take the latest vintage per business_date as for demand_forecasts.
+-- hour is the clock hour; 0-4 belong to the previous night's trading day.
+
+CREATE TABLE IF NOT EXISTS demand_forecasts_hourly (
+  venue_id           UUID NOT NULL REFERENCES venues(id) ON DELETE CASCADE,
+  forecast_date      DATE NOT NULL,
+  business_date      DATE NOT NULL,
+  hour               SMALLINT NOT NULL CHECK (hour BETWEEN 0 AND 23),
+  shift_type         TEXT NOT NULL,               -- breakfast | lunch | dinner | late_night
+  covers_predicted   NUMERIC(8,1) NOT NULL,
+  covers_lower       NUMERIC(8,1),
+  covers_upper       NUMERIC(8,1),
+  revenue_predicted  NUMERIC(12,2),
+  model_version      TEXT NOT NULL,
+  created_at         TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (venue_id, forecast_date, business_date, hour)
+);
+
+CREATE INDEX IF NOT EXISTS idx_demand_forecasts_hourly_business
+  ON demand_forecasts_hourly(venue_id, business_date, forecast_date DESC);
+
+ALTER TABLE demand_forecasts_hourly ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "service_role_all" ON demand_forecasts_hourly
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
+
+-- Shift-level totals of the latest hourly vintage per venue / business_date
+CREATE OR REPLACE VIEW demand_forecast_shifts AS
+WITH latest AS (
+  SELECT DISTINCT ON (venue_id, business_date) venue_id, business_date, forecast_date
+  FROM demand_forecasts_hourly
+  ORDER BY venue_id, business_date, forecast_date DESC
+)
+SELECT
+  h.venue_id,
+  h.business_date,
+  h.shift_type,
+  h.forecast_date,
+  h.model_version,
+  SUM(h.covers_predicted)   AS covers_predicted,
+  SUM(h.covers_lower)       AS covers_lower,
+  SUM(h.covers_upper)       AS covers_upper,
+  SUM(h.revenue_predicted)  AS revenue_predicted
+FROM demand_forecasts_hourly h
+JOIN latest l USING (venue_id, business_date, forecast_date)
+GROUP BY h.venue_id, h.business_date, h.shift_type, h.forecast_date, h.model_version;
@@ -0,0 +1,34 @@
+-- Forecast changes: append-only diff feed of demand_forecasts. Every row the
+-- demand forecaster (delta save) or the intraday nowcast writes is compared
+-- with the vintage it replaces, and one row per venue / business_date / shift
+-- is appended here. Downstream reviews (labor_analyzer/daily_review.py) and
+-- schedule repair read the changes since they last looked (created_at)
+-- instead of scanning every forecast vintage.
+
+CREATE TABLE IF NOT EXISTS forecast_changes (
+  id                  BIGSERIAL PRIMARY KEY,
+  venue_id            UUID NOT NULL REFERENCES venues(id) ON DELETE CASCADE,
+  forecast_date       DATE NOT NULL,               -- vintage written
+  business_date       DATE NOT NULL,
+  shift_type          TEXT NOT NULL,
+  change_type         TEXT NOT NULL,               -- 'new' | 'moved' | 'version'
+  prev_forecast_date  DATE,                        -- vintage replaced (NULL when new)
+  covers_prev         INTEGER,
+  covers_new          INTEGER NOT NULL,
+  covers_delta        INTEGER,
+  covers_delta_pct    NUMERIC(8,1),
+  revenue_prev        NUMERIC(12,2),
+  revenue_new         NUMERIC(12,2),
+  model_version_prev  TEXT,
+  model_version       TEXT NOT NULL,
+  created_at          TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_forecast_changes_venue_business
+  ON forecast_changes(venue_id, business_date, created_at);
+CREATE INDEX IF NOT EXISTS idx_forecast_changes_created ON forecast_changes(created_at);
+
+ALTER TABLE forecast_changes ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "service_role_all" ON forecast_changes
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
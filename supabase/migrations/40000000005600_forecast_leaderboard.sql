@@ -0,0 +1,27 @@
+-- Forecast leaderboard: one row per demand_forecaster backtest run, written
+-- with backtest.py --record-run. Keyed by the model version it scored
+-- (model_version + router_fingerprint, a hash of the model_router thresholds
+-- and Prophet params), so leaderboard.py compare can gate a candidate's
+-- accuracy, fit time and peak memory against the previous version.
+
+CREATE TABLE IF NOT EXISTS forecast_leaderboard (
+  run_id                 TEXT PRIMARY KEY,        -- same id as the forecast_runs row
+  created_at             TIMESTAMPTZ NOT NULL,
+  kind                   TEXT NOT NULL,           -- 'holdout' | 'rolling'
+  model_version          TEXT NOT NULL,
+  router_fingerprint     TEXT NOT NULL,
+  git_sha                TEXT,
+  mape                   NUMERIC(6,1),            -- V4, all venues
+  fit_seconds_per_venue  NUMERIC(10,3),           -- V4 fit + predict, mean per venue
+  peak_rss_mb            NUMERIC(10,1),
+  entry                  JSONB NOT NULL           -- full entry: summary per model, per-venue V4 metrics
+);
+
+CREATE INDEX IF NOT EXISTS idx_forecast_leaderboard_created ON forecast_leaderboard(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_forecast_leaderboard_version
+  ON forecast_leaderboard(model_version, router_fingerprint, created_at DESC);
+
+ALTER TABLE forecast_leaderboard ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "service_role_all" ON forecast_leaderboard
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
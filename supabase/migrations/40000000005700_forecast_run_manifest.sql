@@ -0,0 +1,34 @@
+-- Forecast run manifests: per-venue checkpoints of a demand_forecaster run,
+-- so a run killed part-way (TipSee timeout, runner kill) can be resumed with
+-- forecaster.py --resume RUN_ID. A venue is 'saved' only once its forecast
+-- rows are persisted; a resume skips those and retries 'failed' / 'pending'.
+
+CREATE TABLE IF NOT EXISTS forecast_run_manifests (
+  run_id         TEXT PRIMARY KEY,                 -- first attempt's run id, or the --resume id
+  model_version  TEXT,
+  params         JSONB NOT NULL DEFAULT '{}'::jsonb,   -- params a resume must match
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS forecast_run_venues (
+  run_id          TEXT NOT NULL REFERENCES forecast_run_manifests(run_id) ON DELETE CASCADE,
+  venue_id        UUID NOT NULL REFERENCES venues(id) ON DELETE CASCADE,
+  status          TEXT NOT NULL CHECK (status IN ('pending', 'saved', 'failed')),
+  tier            TEXT,
+  rows_written    INTEGER,
+  detail          TEXT,                             -- why it failed: 'skipped' | 'save_failed'
+  attempt_run_id  TEXT NOT NULL,                    -- run report id of the attempt that wrote it
+  updated_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (run_id, venue_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_forecast_run_venues_status ON forecast_run_venues(run_id, status);
+
+ALTER TABLE forecast_run_manifests ENABLE ROW LEVEL SECURITY;
+ALTER TABLE forecast_run_venues ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "service_role_all" ON forecast_run_manifests
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
+CREATE POLICY "service_role_all" ON forecast_run_venues
+  FOR ALL USING (auth.role() = 'service_role') WITH CHECK (auth.role() = 'service_role');
@@ -0,0 +1,14 @@
+-- Latest demand_forecasts vintage per venue / business_date / shift.
+-- The demand forecaster's delta save writes only the rows that moved since
+-- the previous vintage, so today's forecast_date no longer holds the whole
+-- horizon: an unchanged day keeps serving the earlier vintage it matches.
+-- Readers that want "the current forecast" for a date range select this view
+-- by business_date instead of filtering demand_forecasts by forecast_date.
+
+CREATE OR REPLACE VIEW demand_forecasts_latest AS
+SELECT DISTINCT ON (venue_id, business_date, shift_type)
+  *
+FROM demand_forecasts
+ORDER BY venue_id, business_date, shift_type, forecast_date DESC;
+
+GRANT SELECT ON demand_forecasts_latest TO authenticated;
@@ -0,0 +1,15 @@
+-- Hourly rows of the latest demand_forecasts_hourly vintage per venue /
+-- business_date (same rule as demand_forecast_shifts). Lets PostgREST readers
+-- such as the auto-scheduler fetch one vintage per day instead of every
+-- vintage x hour and deduping client-side, which the 1000-row response cap
+-- would silently truncate.
+
+CREATE OR REPLACE VIEW demand_forecasts_hourly_latest AS
+WITH latest AS (
+  SELECT DISTINCT ON (venue_id, business_date) venue_id, business_date, forecast_date
+  FROM demand_forecasts_hourly
+  ORDER BY venue_id, business_date, forecast_date DESC
+)
+SELECT h.*
+FROM demand_forecasts_hourly h
+JOIN latest l USING (venue_id, business_date, forecast_date);